@@ -3,12 +3,13 @@ import json
 import os
 import sys
 from dataclasses import asdict
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
 
 from app.layer_4.services.metadata_service import run_extraction, initialize
 from app.layer_4.services.fairness_service import run_fairness_assessment
+from app.layer_4.services.batch_service import BatchCheckpoint, iter_batch_extraction, read_repo_urls
 
 def _print_json(data: Any) -> None:
     """Print JSON-safe data to stdout."""
@@ -24,6 +25,7 @@ def _extract_command(args: argparse.Namespace) -> None:
         access_token=args.token,
         with_enrichment=args.with_enrichment,
         schema_class=args.schema_class,
+        fields=args.fields.split(",") if args.fields else None,
     )
 
     result = {
@@ -83,13 +85,21 @@ def _collect_property_results(
     }
 
 def _extract_property_command(args: argparse.Namespace) -> None:
-    jsonld_document, enriched = run_extraction(
-        repo_url=args.url,
-        schema_name=args.schema,
-        access_token=args.token,
-        with_enrichment=True,
-        schema_class=args.schema_class,
-    )
+    initialize()
+    jsonld_key, _ = _normalize_property_key(args.property)
+    try:
+        # only the plugins extracting this property run
+        jsonld_document, enriched = run_extraction(
+            repo_url=args.url,
+            schema_name=args.schema,
+            access_token=args.token,
+            with_enrichment=True,
+            schema_class=args.schema_class,
+            fields=[jsonld_key],
+        )
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
 
     result = _collect_property_results(
         schema=args.schema,
@@ -138,6 +148,60 @@ def _fairness_command(args: argparse.Namespace) -> None:
     }
     _print_json(result)
 
+def _token_from_env(repo_url: Optional[str]) -> Optional[str]:
+    """Picks the env token matching the repo's platform, so GitLab URLs get GITLAB_TOKEN."""
+    if "gitlab" in (repo_url or "").lower():
+        return os.environ.get("GITLAB_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    return os.environ.get("GITHUB_TOKEN") or os.environ.get("GITLAB_TOKEN")
+
+def _batch_command(args: argparse.Namespace) -> None:
+    """
+    Extract many repositories on a worker pool; print one JSON line per repo as it finishes.
+    """
+    if args.input in (None, "-"):
+        repo_urls = read_repo_urls(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            repo_urls = read_repo_urls(f)
+
+    checkpoint = BatchCheckpoint(args.checkpoint) if args.checkpoint else None
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    try:
+        for record in iter_batch_extraction(
+            repo_urls,
+            schema_name=args.schema,
+            schema_class=args.schema_class,
+            with_enrichment=args.with_enrichment,
+            workers=args.workers,
+            use_processes=args.processes,
+            access_token_for=(lambda _url: args.token) if args.token else _token_from_env,
+            checkpoint=checkpoint,
+        ):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            if record["status"] != "success":
+                failed += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if failed:
+        print(f"{failed} repositories failed.", file=sys.stderr)
+        sys.exit(2)
+
+def _plugin_manifest_command(args: argparse.Namespace) -> None:
+    """
+    Regenerate the plugin manifest of each package (build step; run after adding or changing a plugin).
+    """
+    from importlib import import_module
+
+    from app.layer_2.extraction_plugin_manager import ExtractionPluginManager
+
+    for package_name in args.packages:
+        path = ExtractionPluginManager().write_manifest(import_module(package_name))
+        print(f"wrote {path}", file=sys.stderr)
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog="comet-rs",
@@ -172,6 +236,10 @@ def main() -> None:
         action="store_true",
         help="Include per-property enrichment (source, confidence, category) when available.",
     )
+    extract_parser.add_argument(
+        "--fields",
+        help="Comma-separated schema properties to extract (e.g. license,name); only their plugins run. Default: all.",
+    )
     extract_parser.set_defaults(func=_extract_command)
 
     # comet-rs extract_property {GIT_URL} {PROPERTY_NAME} [--schema SCHEMA]
@@ -222,15 +290,81 @@ def main() -> None:
     )
     fairness_parser.set_defaults(func=_fairness_command)
 
+    # comet-rs batch [FILE] [--workers N] [--processes] [--output FILE] [--checkpoint FILE]
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help=(
+            "Extract metadata for many repositories (one URL per line, from a file or stdin) "
+            "and stream one JSON line per repository."
+        ),
+    )
+    batch_parser.add_argument(
+        "input",
+        nargs="?",
+        help="File with one repository URL per line ('-' or omitted: stdin). '#' starts a comment.",
+    )
+    batch_parser.add_argument(
+        "--schema",
+        default="masmp",
+        help="Schema to use (default: masmp).",
+    )
+    batch_parser.add_argument(
+        "--schema-class",
+        default="SoftwareApplication",
+        help="Schema class to use (default: SoftwareApplication).",
+    )
+    batch_parser.add_argument(
+        "--token",
+        help="Token used for every repository (default: GITHUB_TOKEN / GITLAB_TOKEN by platform).",
+    )
+    batch_parser.add_argument(
+        "--with-enrichment",
+        action="store_true",
+        help="Include per-property enrichment (source, confidence, category) when available.",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Repositories extracted concurrently (default: 4).",
+    )
+    batch_parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Use a process pool instead of threads (each worker loads schemas/plugins once).",
+    )
+    batch_parser.add_argument(
+        "--output",
+        help="Append JSON lines to this file instead of printing them to stdout.",
+    )
+    batch_parser.add_argument(
+        "--checkpoint",
+        help=(
+            "File recording successfully extracted URLs; rerunning with the same file "
+            "resumes after a crash and retries failed repositories."
+        ),
+    )
+    batch_parser.set_defaults(func=_batch_command)
+
+    # comet-rs plugin_manifest [PACKAGE ...]
+    manifest_parser = subparsers.add_parser(
+        "plugin_manifest",
+        help="Regenerate the manifest plugins are registered from (run after adding or changing a plugin).",
+    )
+    manifest_parser.add_argument(
+        "packages",
+        nargs="*",
+        default=["app.layer_3.plugins"],
+        help="Plugin packages to write a manifest for (default: app.layer_3.plugins).",
+    )
+    manifest_parser.set_defaults(func=_plugin_manifest_command)
+
     args = parser.parse_args()
 
     # Use env token if --token not provided; pick by repo URL so GitLab URLs get GITLAB_TOKEN
-    if getattr(args, "token", None) is None:
-        repo_url = (getattr(args, "url", None) or "").lower()
-        if "gitlab" in repo_url:
-            args.token = os.environ.get("GITLAB_TOKEN") or os.environ.get("GITHUB_TOKEN")
-        else:
-            args.token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GITLAB_TOKEN")
+    # (batch resolves it per repository)
+    if getattr(args, "token", None) is None and args.command != "batch":
+        args.token = _token_from_env(getattr(args, "url", None))
 
     try:
         args.func(args)
@@ -10,6 +10,8 @@ class Settings(BaseSettings):
 
     # Scehma settings
     comet_schemas_path: str
+    # directory for compiled schema snapshots, reused while the YAML files are unchanged (disabled when unset)
+    schema_cache_dir: Optional[str] = None
     
     # API settings
     api_title: str = "Metadata Extractor API"
@@ -22,6 +24,55 @@ class Settings(BaseSettings):
     cors_allow_methods: list[str] = ["*"]
     cors_allow_headers: list[str] = ["*"]
     
+    # HTTP cache settings (persistent platform API response cache; disabled when unset)
+    http_cache_path: Optional[str] = None
+    http_cache_max_entries: int = 50_000
+    http_cache_max_bytes: int = 512 * 1024 * 1024
+    # Whole-extraction result cache keyed by repository HEAD commit (disabled when unset)
+    result_cache_path: Optional[str] = None
+    result_cache_max_entries: int = 10_000
+    # Repository file contents keyed by git blob SHA, shared across repositories: SQLite file, or in memory when unset
+    blob_cache_path: Optional[str] = None
+    # total size of cached file contents; 0 disables the blob cache
+    blob_cache_max_bytes: int = 64 * 1024 * 1024
+    # keep-alive connections kept open per API host
+    http_pool_maxsize: int = 20
+    # Rate limiting: pace requests once a host's remaining budget drops below this fraction of its limit,
+    # and fail instead of waiting longer than this many seconds for a reset
+    rate_limit_pace_below: float = 0.2
+    rate_limit_max_wait_seconds: float = 900.0
+    # Shared token pools (JSON lists) used for requests without a user token, rotated by remaining budget
+    github_tokens: list[str] = []
+    gitlab_tokens: list[str] = []
+    codeberg_tokens: list[str] = []
+
+    # Extraction pipeline: threads used to run one priority group of plugins concurrently
+    pipeline_max_workers: int = 8
+    # threads shared by all extractions started from async endpoints
+    async_executor_threads: int = 256
+
+    # Repository traversal: default list_contents depth and page budget of bulk tree listings
+    repository_tree_depth: int = 2
+    repository_tree_max_pages: int = 10
+    # opt-in: files larger than this (bytes) are skipped: not downloaded when the tree reports the size, never decoded; unset or 0: no limit
+    repository_file_max_bytes: Optional[int] = None
+    # serve trees/files from a local snapshot instead of the content APIs: "archive", "clone" or unset
+    repository_snapshot_mode: Optional[str] = None
+    # directory with local mirrors (<owner>/<name>.git) cloned from in "clone" mode
+    repository_mirror_dir: Optional[str] = None
+    # archives larger than this (bytes), downloaded or uncompressed, are not used as snapshots; 0: no limit
+    repository_snapshot_max_bytes: int = 256 * 1024 * 1024
+
+    # License matching: results memoized per license text; optionally load the scancode index at startup
+    license_match_cache_size: int = 1024
+    license_index_prewarm: bool = False
+
+    # Batch extraction API: concurrent extractions across all jobs, URLs per job, unfinished jobs, retention
+    batch_max_concurrency: int = 16
+    batch_max_urls: int = 10_000
+    batch_max_jobs: int = 100
+    batch_job_ttl_seconds: int = 3600
+
     # LLM settings (optional)
     llm_api_key: Optional[str] = None
     llm_model: str = "llama-3.1-70b-versatile"
@@ -1,34 +1,55 @@
+import threading
+from contextvars import ContextVar
 from dataclasses import dataclass
 from typing import Any, Generic, TypeVar
 
 T = TypeVar("T")
 
+# name of the extraction step currently running on this thread (set by the pipeline runners)
+collecting_step: ContextVar[str | None] = ContextVar("collecting_step", default=None)
+
 @dataclass
 class MetadataProperty(Generic[T]):
     source: str
     property_name: str
     property_value: T
     confidence: float = 1.0
+    # extraction step that collected the value (None outside a pipeline run)
+    step: str | None = None
 
 class MetadataCollector:
+    """Collects candidate values per property URI.
+
+    Safe to share between extraction steps running on different threads.
+    """
     data : dict[str, list[MetadataProperty]]
 
     def __init__(self):
         self.data = {}
+        self._lock = threading.Lock()
     
     def collect(self, source: str, property_name: str, property_value: Any, confidence:float=1.0):
-        if not property_name in self.data:
-            self.data[property_name] = []
-        all_records = self.data[property_name]
-        all_records.append(MetadataProperty(source, property_name, property_value, confidence))
-        self.data[property_name] = all_records
+        with self._lock:
+            if not property_name in self.data:
+                self.data[property_name] = []
+            all_records = self.data[property_name]
+            all_records.append(MetadataProperty(source, property_name, property_value, confidence, collecting_step.get()))
+            self.data[property_name] = all_records
     
+    def add(self, record: MetadataProperty):
+        """Adds a record collected earlier, keeping its source, confidence and step."""
+        with self._lock:
+            self.data.setdefault(record.property_name, []).append(record)
+
     def get(self, property_name: str) -> dict[str, Any] | Any:
-        all_records = self.data.get(property_name, dict())
-        return all_records
+        """Returns a snapshot of the records collected for `property_name`; later collects do not change it."""
+        with self._lock:
+            all_records = self.data.get(property_name)
+            return list(all_records) if all_records is not None else dict()
     
     def get_most_confident(self, uri: str) -> MetadataProperty[Any]:
-        all = self.data.get(uri, [])
+        with self._lock:
+            all = list(self.data.get(uri, []))
         values = sorted(all, key=lambda x : x.confidence, reverse=True)
         try:
             return values[0]
@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from app.layer_1.schemas.base_schema import BaseSchema
+
+
+def _frozen(mapping: Mapping) -> Mapping:
+    return MappingProxyType(dict(mapping))
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledSchema(BaseSchema):
+    """Property metadata of one schema class, computed once when the schema is loaded.
+
+    Every lookup is a tuple or dict access; the schema source (e.g. a LinkML
+    `SchemaView`) is not needed after compilation.
+    """
+    schema_name: str
+    class_name: str
+    # class properties in schema order
+    properties: tuple[str, ...]
+    # property -> expanded URI, for every property of the schema
+    uris: Mapping[str, str]
+    # property -> categories (None when the property declares none)
+    categories: Mapping[str, tuple[str, ...] | None]
+    prefixes: Mapping[str, str]
+    context: Mapping[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        object.__setattr__(self, "properties", tuple(self.properties))
+        object.__setattr__(self, "uris", _frozen(self.uris))
+        object.__setattr__(
+            self,
+            "categories",
+            _frozen({name: tuple(value) if value is not None else None for name, value in self.categories.items()}),
+        )
+        object.__setattr__(self, "prefixes", _frozen(self.prefixes))
+        object.__setattr__(self, "context", _frozen(self.context))
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-safe form, read back by `from_dict`."""
+        return {
+            "schema_name": self.schema_name,
+            "class_name": self.class_name,
+            "properties": list(self.properties),
+            "uris": dict(self.uris),
+            "categories": {name: list(value) if value is not None else None for name, value in self.categories.items()},
+            "prefixes": dict(self.prefixes),
+            "context": dict(self.context),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CompiledSchema":
+        return cls(**data)
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_class_name(self) -> str:
+        return self.class_name
+
+    def get_property_list(self) -> list[str]:
+        return list(self.properties)
+
+    def get_categories_of(self, property_name: str) -> list[str] | None:
+        categories = self.categories.get(property_name)
+        return list(categories) if categories is not None else None
+
+    def get_prefixes(self) -> dict[str, str]:
+        return dict(self.prefixes)
+
+    def get_uri(self, property_name: str) -> str:
+        return self.uris[property_name]
+
+    def build_context(self) -> dict[str, Any]:
+        # a copy: the caller embeds it in a document it may modify
+        return dict(self.context)
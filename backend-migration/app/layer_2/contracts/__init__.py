@@ -1,5 +1,6 @@
-from app.layer_2.contracts.step import ExtractionContext, ExtractionState, ExtractionStep
-from app.layer_2.contracts.pipeline import ExtractionPipeline, PipelineRunner
+from app.layer_2.contracts.step import ExtractionContext, ExtractionState, ExtractionStep, canonical_platform
+from app.layer_2.contracts.pipeline import ExtractionPipeline, PipelineRunner, AsyncPipelineRunner
 from app.layer_2.contracts.composer import PipelineComposer
+from app.layer_2.contracts.result_cache import ResultCache
 
-__all__ = ["ExtractionContext", "ExtractionState", "ExtractionStep", "ExtractionPipeline", "PipelineRunner", "PipelineComposer"]
\ No newline at end of file
+__all__ = ["ExtractionContext", "ExtractionState", "ExtractionStep", "canonical_platform", "ExtractionPipeline", "PipelineRunner", "AsyncPipelineRunner", "PipelineComposer", "ResultCache"]
\ No newline at end of file
@@ -7,4 +7,7 @@ class ExtractionPipeline:
     steps: tuple[ExtractionStep, ...]
 
 class PipelineRunner(Protocol):
-    def run(self, pipeline: ExtractionPipeline, context: ExtractionContext, state: ExtractionState) -> ExtractionState: ...
\ No newline at end of file
+    def run(self, pipeline: ExtractionPipeline, context: ExtractionContext, state: ExtractionState) -> ExtractionState: ...
+
+class AsyncPipelineRunner(PipelineRunner, Protocol):
+    async def run_async(self, pipeline: ExtractionPipeline, context: ExtractionContext, state: ExtractionState) -> ExtractionState: ...
\ No newline at end of file
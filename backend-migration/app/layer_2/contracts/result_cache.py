@@ -0,0 +1,16 @@
+from typing import Optional, Protocol
+from app.layer_2.contracts.step import ExtractionContext, ExtractionState
+from app.layer_2.contracts.pipeline import ExtractionPipeline
+
+class ResultCache(Protocol):
+    def load(self, context: ExtractionContext, state: ExtractionState) -> Optional[dict]:
+        """Returns the stored JSON-LD document (restoring the collected metadata into `state`), or None."""
+        ...
+
+    def restore_unchanged(self, context: ExtractionContext, state: ExtractionState, pipeline: ExtractionPipeline) -> ExtractionPipeline:
+        """After a `load` miss: restores the output of steps whose inputs are unchanged since the last stored revision and returns the steps left to run."""
+        ...
+
+    def save(self, context: ExtractionContext, state: ExtractionState, jsonld_document: dict) -> None:
+        """Stores the JSON-LD document and the metadata collected in `state`."""
+        ...
@@ -1,11 +1,28 @@
 """Common step contracts for modular Layer 3 extraction pipelines."""
 
 from dataclasses import dataclass, field
-from typing import Any, Optional, Protocol
+from traceback import print_exc
+from typing import AbstractSet, Any, Callable, Optional, Protocol
+from urllib.parse import urlsplit
 from abc import ABC, abstractmethod
 from app.layer_1.schemas.base_schema import BaseSchema
 from app.layer_1.metadata_collector.metadata_collector import MetadataCollector
 
+def canonical_platform(repo_url: str) -> Optional[str]:
+    """
+    Platform identity of a repository URL: its lower-case host without
+    "www.", e.g. "github.com", "gitlab.com" or a self-hosted instance's host.
+
+    A scheme-less URL ("github.com/owner/repo") is read as a host plus path.
+    Returns None when the URL has no host.
+    """
+    url = repo_url.strip()
+    if "//" not in url:
+        url = "//" + url
+    host = urlsplit(url).hostname
+    return host.removeprefix("www.") if host else None
+
+
 @dataclass(frozen=True)
 class ExtractionContext:
     """
@@ -18,8 +35,11 @@ class ExtractionContext:
     repo_url: str
     domain: str
     schema: BaseSchema
+    # platform identity of repo_url, see `canonical_platform`
     platform: Optional[str] = None
     access_token: Optional[str] = None
+    # schema property names to extract; None extracts every property of the schema
+    fields: Optional[AbstractSet[str]] = None
 
 
 @dataclass
@@ -33,6 +53,21 @@ class ExtractionState:
     """
     metadata_collector: MetadataCollector 
     data: dict[str, Any] = field(default_factory=dict)
+    # run by `close` once the extraction is finished (temporary files, snapshots, ...)
+    cleanups: list[Callable[[], None]] = field(default_factory=list, repr=False)
+
+    def add_cleanup(self, cleanup: Callable[[], None]) -> None:
+        """Registers `cleanup` to release a resource held for the rest of this extraction."""
+        self.cleanups.append(cleanup)
+
+    def close(self) -> None:
+        """Runs the registered cleanups, newest first; a failing cleanup does not stop the others."""
+        while self.cleanups:
+            cleanup = self.cleanups.pop()
+            try:
+                cleanup()
+            except Exception:
+                print_exc()
 
 
 class ExtractionStep(ABC):
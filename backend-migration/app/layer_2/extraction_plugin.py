@@ -14,4 +14,4 @@ class ExtractionPlugin(BasePlugin, ExtractionStep, ABC):
         ...
 
     def applicable(self, context : ExtractionContext):
-        return any([platform in context.platform for platform in self.platforms])
\ No newline at end of file
+        return context.platform in self.platforms
@@ -5,31 +5,75 @@ from app.layer_2.contracts import ExtractionContext, ExtractionState
 SchemaPropery = str
 
 class ExtractionPluginManager(PluginManager):
+    """Plugins indexed by the schema property (URI) they extract and the platform they run on.
+
+    Selecting the plugins for a property is a lookup of
+    (`context.platform`, URI); only plugins overriding `applicable` are
+    asked whether they apply.
+    """
 
     def __init__(self):
         super().__init__()
         self.metadata_providers : dict[SchemaPropery, set[str]] = {}
+        # platform -> property -> plugins declaring that platform
+        self.platform_providers : dict[str, dict[SchemaPropery, set[str]]] = {}
+        # property -> plugins overriding `applicable`, asked on every selection
+        self.custom_providers : dict[SchemaPropery, set[str]] = {}
+        # platforms named by registered plugins, and whether any plugin decides applicability itself
+        self.platforms : set[str] = set()
+        self.custom_applicability = False
 
-    def _on_plugin_registration(self, plugin_class):
+    def _manifest_entry(self, plugin_class) -> dict:
+        entry = super()._manifest_entry(plugin_class)
         if issubclass(plugin_class, ExtractionPlugin):
-            for property in plugin_class.extracts:
-                helper = self.metadata_providers.get(property, set())
-                helper.add(plugin_class.name)
-                self.metadata_providers[property] = helper
-                self.object_registry[plugin_class.name] = self._instantiate_plugin(plugin_class)
-        print("registered", plugin_class)
+            platforms = getattr(plugin_class, "platforms", ())
+            entry.update(
+                extracts=sorted(plugin_class.extracts),
+                platforms=sorted(platforms) if isinstance(platforms, (set, frozenset, list, tuple)) else [],
+                priority_level=plugin_class.priority_level,
+                custom_applicability=plugin_class.applicable is not ExtractionPlugin.applicable,
+            )
+        return entry
+
+    def _on_plugin_registration(self, plugin_class):
+        self._on_entry_registration(self._manifest_entry(plugin_class))
+
+    def _on_entry_registration(self, entry: dict):
+        if "extracts" not in entry:
+            return
+        name = entry["name"]
+        for property in entry["extracts"]:
+            self.metadata_providers.setdefault(property, set()).add(name)
+            if entry["custom_applicability"]:
+                self.custom_providers.setdefault(property, set()).add(name)
+            else:
+                for platform in entry["platforms"]:
+                    self.platform_providers.setdefault(platform, {}).setdefault(property, set()).add(name)
+        self.platforms.update(entry["platforms"])
+        if entry["custom_applicability"]:
+            self.custom_applicability = True
 
     def select(self, schema_property: SchemaPropery, context: ExtractionContext) -> set[ExtractionPlugin]:
-        result = set()
         uri = context.schema.get_uri(schema_property)
-        for pluginName in self.metadata_providers.get(uri, {}):
-            instance = self.get(pluginName)
+        # plugins are only imported once selected (see `PluginManager.get`)
+        result = {self.get(name) for name in self.platform_providers.get(context.platform, {}).get(uri, ())}
+        for name in self.custom_providers.get(uri, ()):
+            instance = self.get(name)
             if instance.applicable(context):
                 result.add(instance)
         if len(result) < 1:
             raise Warning(f"missing plugin to extract '{uri}'!")
         return result
 
+    def plan_key(self, context: ExtractionContext) -> frozenset[str] | None:
+        """What plugin selection depends on besides the schema: the platform of `context`, if any plugin runs on it.
+
+        None when a plugin overrides `applicable`, i.e. selection may depend on anything in the context.
+        """
+        if self.custom_applicability:
+            return None
+        return frozenset({context.platform}) & self.platforms
+
     def extract(self, schema_property: SchemaPropery, context: ExtractionContext, state: ExtractionState) -> ExtractionState:
         for plugin in self.select(schema_property, context):
-            plugin.extract(context, state)
\ No newline at end of file
+            plugin.extract(context, state)
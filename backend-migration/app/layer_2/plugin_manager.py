@@ -1,10 +1,59 @@
+import hashlib
 import importlib
 import inspect
+import json
+import os
 import pkgutil
+import threading
 import traceback
+from pathlib import Path
 from app.layer_2.base_plugin import BasePlugin
 
+# file next to a plugin package's __init__.py describing its plugins (see `write_manifest`)
+MANIFEST_FILE = "plugin_manifest.json"
+# bump when the manifest layout changes
+MANIFEST_FORMAT_VERSION = 2
+
+
+def _module_path(package, module_name: str) -> Path | None:
+    """Source file of `module_name` inside `package`, found without importing it."""
+    relative = module_name[len(package.__name__):].lstrip(".")
+    parts = relative.split(".") if relative else []
+    for root in package.__path__:
+        base = Path(root).joinpath(*parts)
+        candidates = [base.with_suffix(".py"), base / "__init__.py"] if parts else [base / "__init__.py"]
+        for path in candidates:
+            if path.is_file():
+                return path
+    return None
+
+
+def package_fingerprint(package, modules) -> str:
+    """Hash of the module layout of `package` and the contents of `modules`; a manifest is only used while it matches.
+
+    `modules` are the ones defining the plugin classes (and their bases) the
+    manifest describes, so edits to other modules, e.g. shared clients, do
+    not make it stale; adding or removing a module does.
+    """
+    digest = hashlib.sha256()
+    for root in package.__path__:
+        for path in sorted(Path(root).rglob("*.py")):
+            digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+    for module_name in sorted(modules):
+        path = _module_path(package, module_name)
+        digest.update(module_name.encode("utf-8") + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest() if path is not None else b"\0")
+    return digest.hexdigest()
+
+
 class PluginManager:
+    """Registry of the plugins found in a package.
+
+    `discover` either imports every module of the package, or — when the
+    package ships a current manifest (see `write_manifest`) — only reads
+    the manifest; plugin modules are then imported and plugins instantiated
+    the first time `get` asks for them.
+    """
 
     PLUGIN_BASE_CLASS = BasePlugin
 
@@ -12,12 +61,26 @@ class PluginManager:
         self.object_registry: dict[str, BasePlugin] = {}
         self.class_registry: dict[str, any] = {}
         self.registered_aliases : dict[str, set[str]] = {}
+        # plugins known from a manifest: name -> manifest entry (module, qualname, version, ...)
+        self.manifest_entries: dict[str, dict] = {}
+        # bumped whenever the registry changes, so anything derived from it can be rebuilt
+        self.generation = 0
+        self._import_lock = threading.RLock()
 
     def discover(self, package):
         """
-        Walk every module in the given package,
-        import it, then look for self.PLUGIN_BASE_CLASS subclasses
+        Register the plugins of `package`: from its manifest when that is
+        current, otherwise by walking every module in the package, importing
+        it and looking for self.PLUGIN_BASE_CLASS subclasses
         """
+        manifest = self.read_manifest(package)
+        if manifest is not None:
+            for entry in manifest["plugins"]:
+                self._register_entry(entry)
+            return
+        self._import_all(package)
+
+    def _import_all(self, package):
         for finder, module_name, ispkg in pkgutil.walk_packages(
             path=package.__path__,
             prefix=package.__name__ + ".",
@@ -50,6 +113,83 @@ class PluginManager:
             
             self._register(obj)
         
+    def read_manifest(self, package) -> dict | None:
+        """Returns the package's manifest if it exists and matches the package's sources."""
+        path = Path(package.__path__[0]) / MANIFEST_FILE
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable plugin manifest {path}: {e}")
+            return None
+        if (
+            manifest.get("format") != MANIFEST_FORMAT_VERSION
+            or manifest.get("fingerprint") != package_fingerprint(package, manifest.get("modules", ()))
+        ):
+            print(f"Plugin manifest {path} is out of date, importing all plugin modules (regenerate it with `comet-rs plugin_manifest {package.__name__}`)")
+            return None
+        return manifest
+
+    def write_manifest(self, package) -> Path:
+        """Imports every module of `package` and writes the manifest describing its plugins."""
+        self._import_all(package)
+        plugin_classes = [plugin_class for _, plugin_class in sorted(self.class_registry.items())]
+        modules = sorted({
+            base.__module__
+            for plugin_class in plugin_classes
+            for base in plugin_class.__mro__
+            if base.__module__ == package.__name__ or base.__module__.startswith(package.__name__ + ".")
+        })
+        manifest = {
+            "format": MANIFEST_FORMAT_VERSION,
+            "fingerprint": package_fingerprint(package, modules),
+            "modules": modules,
+            "plugins": [self._manifest_entry(plugin_class) for plugin_class in plugin_classes],
+        }
+        path = Path(package.__path__[0]) / MANIFEST_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, path)
+        return path
+
+    def _manifest_entry(self, plugin_class) -> dict:
+        """What the manifest records about one plugin class; subclasses add what they index by."""
+        return {
+            "name": plugin_class.name,
+            "module": plugin_class.__module__,
+            "qualname": plugin_class.__qualname__,
+            "version": plugin_class.version,
+            "aliases": sorted(plugin_class.aliases),
+        }
+
+    def _register_entry(self, entry: dict):
+        """Registers a plugin known from the manifest without importing it."""
+        if entry["name"] in self.class_registry or entry["name"] in self.manifest_entries:
+            return
+        self.manifest_entries[entry["name"]] = entry
+        for alias in entry["aliases"]:
+            self.registered_aliases[alias] = entry["name"]
+        self._on_entry_registration(entry)
+        self.generation += 1
+
+    def _on_entry_registration(self, entry: dict):
+        pass
+
+    def _import_entry(self, name: str):
+        """Imports the class of a manifest-only plugin; its registration is already accounted for."""
+        with self._import_lock:
+            if name not in self.class_registry:
+                entry = self.manifest_entries[name]
+                plugin_class = importlib.import_module(entry["module"])
+                for attribute in entry["qualname"].split("."):
+                    plugin_class = getattr(plugin_class, attribute)
+                self.class_registry[name] = plugin_class
+            return self.class_registry[name]
+
     def _instantiate_plugin(self, plugin_class):
         instance = plugin_class()
         instance.set_plugin_manager(self)
@@ -60,24 +200,39 @@ class PluginManager:
         print(f"Registered plugin: '{plugin_class.name}' v{plugin_class.version}")
 
     def _register(self, plugin_class):
+        if plugin_class.name in self.manifest_entries:
+            # already known from the manifest
+            self.class_registry.setdefault(plugin_class.name, plugin_class)
+            return
         if plugin_class.name not in self.class_registry:
             self.class_registry[plugin_class.name] = plugin_class
             for alias in plugin_class.aliases:
                 self.registered_aliases[alias] = plugin_class.name
             self._on_plugin_registration(plugin_class)
+            self.generation += 1
 
     def get(self, name_or_key: str) -> BasePlugin | None:
         if name_or_key in self.registered_aliases:
             return self.get(self.registered_aliases[name_or_key])
         if name_or_key in self.object_registry:
             return self.object_registry[name_or_key]
-        if name_or_key in self.class_registry:
-            instance = self._instantiate_plugin(self.class_registry[name_or_key])
-            self.object_registry[name_or_key] = instance
-            return instance
+        if name_or_key in self.class_registry or name_or_key in self.manifest_entries:
+            with self._import_lock:
+                if name_or_key not in self.object_registry:
+                    plugin_class = self.class_registry.get(name_or_key) or self._import_entry(name_or_key)
+                    self.object_registry[name_or_key] = self._instantiate_plugin(plugin_class)
+            return self.object_registry[name_or_key]
         return None
 
+    def fingerprint(self) -> str:
+        """Hash of every registered plugin's name and version; changes whenever the plugin set does."""
+        versions = {name: entry["version"] for name, entry in self.manifest_entries.items()}
+        versions.update({name: plugin_class.version for name, plugin_class in self.class_registry.items()})
+        plugins = sorted(f"{name}@{version}" for name, version in versions.items())
+        return hashlib.sha256("\n".join(plugins).encode("utf-8")).hexdigest()[:16]
+
     def unload_all(self):
         for plugin in self.object_registry.values():
             plugin.on_unload()
         self.object_registry.clear()
+        self.generation += 1
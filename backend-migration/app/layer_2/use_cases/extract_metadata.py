@@ -2,9 +2,12 @@
 Layer 2 — Application / use cases (`app.layer_2`).
 Orchestration: compose and run extraction pipeline, then build JSON-LD.
 """
+import asyncio
+import contextvars
+import functools
 from dataclasses import dataclass
-from typing import Protocol, Optional, Dict, Any, Callable
-from app.layer_2.contracts import ExtractionContext, ExtractionState, ExtractionPipeline, PipelineRunner, PipelineComposer
+from typing import AbstractSet, Protocol, Optional, Dict, Any, Callable
+from app.layer_2.contracts import ExtractionContext, ExtractionState, ExtractionPipeline, PipelineRunner, PipelineComposer, ResultCache, canonical_platform
 from app.layer_1.schemas.base_schema import BaseSchema
 from app.layer_1.metadata_collector.metadata_collector import MetadataCollector
 
@@ -50,6 +53,7 @@ class ExtractMetadataUseCase:
         pipeline_composer: Optional[PipelineComposer] = None,
         pipeline_runner: Optional[PipelineRunner] = None,
         extraction_metadata_collector: Optional[MetadataCollector] = None,
+        result_cache: Optional[ResultCache] = None,
     ):
         """
         Initialize the use case with all required tools.
@@ -59,11 +63,13 @@ class ExtractMetadataUseCase:
             pipeline_composer: Selects the extraction pipeline profile
             pipeline_runner: Runs the composed extraction pipeline
             extraction_metadata_collector: Optional collector for source/confidence per property (for UI)
+            result_cache: Optional store of finished extractions, consulted before running the pipeline
         """
         self.jsonld_builder = jsonld_builder
         self.pipeline_composer = pipeline_composer
         self.pipeline_runner = pipeline_runner
         self.extraction_metadata_collector = extraction_metadata_collector
+        self.result_cache = result_cache
     
     def execute(
         self,
@@ -71,6 +77,7 @@ class ExtractMetadataUseCase:
         schema: BaseSchema,
         access_token: Optional[str] = None,
         progress_callback: Optional[Callable[[str, str], None]] = None,
+        fields: Optional[AbstractSet[str]] = None,
     ) -> ExtractMetadataResult:
         """
         Execute metadata extraction for one repository.
@@ -83,12 +90,86 @@ class ExtractMetadataUseCase:
             schema: Schema to use (maSMP or CODEMETA)
             access_token: Optional access token for private repositories
             progress_callback: Optional callback(step_id, status) for streaming progress
+            fields: Optional schema property names to extract; only the plugins
+                extracting them run and the document only contains them
 
         Returns:
             ExtractMetadataResult with jsonld_document and extraction_metadata (for UI enrichment)
         """
-        collector = self.extraction_metadata_collector
-        platform = repo_url
+        context, state = self._prepare(repo_url, schema, access_token, progress_callback, fields)
+        close_state = state.close
+        try:
+            cached = self._load_cached(context, state, progress_callback)
+            if cached is not None:
+                return cached
+
+            pipeline = self.pipeline_composer.compose(context)
+            if self.result_cache is not None:
+                pipeline = self.result_cache.restore_unchanged(context, state, pipeline)
+
+            state = self.pipeline_runner.run(pipeline, context, state)
+
+            return self._finish(context, state, schema, progress_callback)
+        finally:
+            close_state()
+
+    async def execute_async(
+        self,
+        repo_url: str,
+        schema: BaseSchema,
+        access_token: Optional[str] = None,
+        progress_callback: Optional[Callable[[str, str], None]] = None,
+        fields: Optional[AbstractSet[str]] = None,
+    ) -> ExtractMetadataResult:
+        """
+        Async variant of `execute` that never blocks the calling event loop.
+
+        Uses the runner's `run_async` when it provides one; otherwise the
+        synchronous `run` is moved to a worker thread. Composing the pipeline
+        and the result cache work are blocking too and run on the runner's
+        `executor` (the one its steps run on) when it has one.
+        """
+        context, state = self._prepare(repo_url, schema, access_token, progress_callback, fields)
+        close_state = state.close
+        try:
+            if self.result_cache is not None:
+                cached = await self._in_executor(self._load_cached, context, state, progress_callback)
+                if cached is not None:
+                    return cached
+
+            pipeline = await self._in_executor(self.pipeline_composer.compose, context)
+            if self.result_cache is not None:
+                pipeline = await self._in_executor(self.result_cache.restore_unchanged, context, state, pipeline)
+
+            run_async = getattr(self.pipeline_runner, "run_async", None)
+            if run_async is not None:
+                state = await run_async(pipeline, context, state)
+            else:
+                state = await self._in_executor(self.pipeline_runner.run, pipeline, context, state)
+
+            if self.result_cache is not None:
+                return await self._in_executor(self._finish, context, state, schema, progress_callback)
+            return self._finish(context, state, schema, progress_callback)
+        finally:
+            # snapshots and other temporary files of this run are removed off the event loop
+            await self._in_executor(close_state)
+
+    async def _in_executor(self, function: Callable, *args):
+        """Awaits blocking `function(*args)` on the runner's executor (the loop's default one if it has none)."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, function, *args)
+        return await loop.run_in_executor(getattr(self.pipeline_runner, "executor", None), call)
+
+    def _prepare(
+        self,
+        repo_url: str,
+        schema: BaseSchema,
+        access_token: Optional[str],
+        progress_callback: Optional[Callable[[str, str], None]],
+        fields: Optional[AbstractSet[str]] = None,
+    ) -> tuple[ExtractionContext, ExtractionState]:
+        """Builds the context and initial state for one run and reports the pipeline start."""
+        platform = canonical_platform(repo_url) if repo_url else None
         if not platform:
             raise ValueError("Unsupported repository platform. Supported: GitHub, GitLab")
 
@@ -106,12 +187,37 @@ class ExtractMetadataUseCase:
             schema=schema,
             platform=platform,
             access_token=access_token,
+            fields=frozenset(fields) if fields else None,
         )
+        return context, state
 
-        pipeline = self.pipeline_composer.compose(context)
-        
-        metadata = self.pipeline_runner.run(pipeline, context, state).metadata_collector
+    def _load_cached(
+        self,
+        context: ExtractionContext,
+        state: ExtractionState,
+        progress_callback: Optional[Callable[[str, str], None]],
+    ) -> Optional[ExtractMetadataResult]:
+        """Returns the stored result for this repository revision, if the result cache has one."""
+        if self.result_cache is None:
+            return None
+        jsonld_document = self.result_cache.load(context, state)
+        if jsonld_document is None:
+            return None
+        if progress_callback:
+            progress_callback("pipeline", "completed")
+            progress_callback("jsonld_build", "started")
+            progress_callback("jsonld_build", "completed")
+        return ExtractMetadataResult(jsonld_document=jsonld_document, extraction_metadata={})
 
+    def _finish(
+        self,
+        context: ExtractionContext,
+        state: ExtractionState,
+        schema: BaseSchema,
+        progress_callback: Optional[Callable[[str, str], None]],
+    ) -> ExtractMetadataResult:
+        """Builds the JSON-LD document from the collected metadata and stores it in the result cache."""
+        metadata = state.metadata_collector
         if progress_callback:
             progress_callback("pipeline", "completed")
 
@@ -120,9 +226,17 @@ class ExtractMetadataUseCase:
             progress_callback("jsonld_build", "started")
         
         jsonld_document = self.jsonld_builder.build_jsonld(metadata, schema)
+        if context.fields:
+            jsonld_document = {
+                key: value for key, value in jsonld_document.items()
+                if key.startswith("@") or key in context.fields
+            }
         if progress_callback:
             progress_callback("jsonld_build", "completed")
 
+        if self.result_cache is not None:
+            self.result_cache.save(context, state, jsonld_document)
+
         # extraction_metadata = collector.get_all() if collector else {}
         extraction_metadata = {}
 
@@ -1,3 +1,5 @@
+import threading
+
 from app.layer_1.schemas.masmp.export_fields import MASMP_SOFTWARE_APPLICATION_EXPORT_KEYS, MASMP_SOFTWARE_SOURCE_CODE_EXPORT_KEYS
 from app.layer_1.schemas.codemeta.export_fields import CODEMETA_SOFTWARE_SOURCE_CODE_EXPORT_KEYS
 from app.layer_2.extraction_plugin import ExtractionPlugin
@@ -7,9 +9,20 @@ from app.layer_3.composers.pipeline_composer import PipelineComposer, Extraction
 import app.layer_3.plugins
 
 class PluginPipelineComposer(PipelineComposer):
+    """Composes the plugins extracting the schema's (or the requested) properties.
+
+    A plan only depends on the schema, the requested fields and the platform
+    the repository is on, so it is built once per such key and reused until
+    the plugin registry changes (`PluginManager.generation`).
+    """
 
     plugin_manager : ExtractionPluginManager = None
 
+    def __init__(self):
+        self._plans: dict[tuple, tuple[ExtractionPlugin, ...]] = {}
+        self._plans_generation = None
+        self._plans_lock = threading.Lock()
+
     def get_plugin_manager(self):
         if not self.plugin_manager:
             self.plugin_manager = ExtractionPluginManager()
@@ -17,11 +30,39 @@ class PluginPipelineComposer(PipelineComposer):
         return self.plugin_manager
 
     def compose(self, context : ExtractionContext):
+        plugin_manager = self.get_plugin_manager()
+        generation = getattr(plugin_manager, "generation", None)
+        platforms = plugin_manager.plan_key(context) if generation is not None else None
+        if platforms is None:
+            return ExtractionPipeline(steps=list(self._build_plan(context)))
 
-        export_keys = context.schema.get_property_list()
+        key = (
+            context.schema.get_schema_name(),
+            context.schema.get_class_name(),
+            context.fields,
+            platforms,
+        )
+        with self._plans_lock:
+            if self._plans_generation != generation:
+                self._plans.clear()
+                self._plans_generation = generation
+            plan = self._plans.get(key)
+        if plan is None:
+            plan = self._build_plan(context)
+            with self._plans_lock:
+                if self._plans_generation == generation:
+                    self._plans[key] = plan
+        return ExtractionPipeline(steps=list(plan))
+
+    def _build_plan(self, context : ExtractionContext) -> tuple[ExtractionPlugin, ...]:
+        # only the plugins extracting the requested fields run
+        if context.fields:
+            export_keys = [key for key in context.schema.get_property_list() if key in context.fields]
+        else:
+            export_keys = context.schema.get_property_list()
 
         priority_groups : dict[int, set[ExtractionPlugin]] = dict()
-        
+
         for key in export_keys:
             try:
                 candidate_plugins = self.get_plugin_manager().select(key, context)
@@ -34,5 +75,5 @@ class PluginPipelineComposer(PipelineComposer):
         pipeline_steps = []
         for priority_level in sorted(priority_groups.keys(), reverse=True):
             pipeline_steps.extend(priority_groups[priority_level])
-        
-        return ExtractionPipeline(steps=pipeline_steps)
\ No newline at end of file
+
+        return tuple(pipeline_steps)
@@ -1,6 +1,6 @@
 import re
-import base64
 import requests
+from urllib.parse import quote
 
 from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
 from app.layer_3.plugins.shared.git_platform_client import (
@@ -12,9 +12,11 @@ from app.layer_3.plugins.shared.git_platform_client import (
 
 
 class CodebergRepositoryItem(RepositoryItem):
+    """Entry of the contents API or of the git trees API (which has no name / html_url)."""
+
     @property
     def name(self) -> str:
-        return self._raw["name"]
+        return self._raw.get("name") or self._raw["path"].rpartition("/")[2]
 
     @property
     def path(self) -> str:
@@ -22,22 +24,13 @@ class CodebergRepositoryItem(RepositoryItem):
 
     @property
     def is_dir(self) -> bool:
-        return self._raw["type"] == "dir"
+        return self._raw["type"] in ("dir", "tree")
 
-    def get_html_url(self, _client) -> str | None:
-        return self._raw.get("html_url")
+    def get_html_url(self, client) -> str | None:
+        return self._raw.get("html_url") or client.get_entry_html_url(self.path, self.is_dir)
 
 class CodebergRepositoryFile(CodebergRepositoryItem, RepositoryFile):
-    def get_content(self) -> str | None:
-        raw_content = self._raw.get("content")
-        if raw_content is None:
-            return None
-        if self._raw.get("encoding") == "base64":
-            try:
-                return base64.b64decode(raw_content).decode("utf-8")
-            except (ValueError, UnicodeDecodeError):
-                return None
-        return raw_content
+    """File of the contents API (base64-encoded content)."""
 
     def get_html_url(self, _client):
         return self._raw.get('html_url')
@@ -46,6 +39,8 @@ class CodebergClient(GitPlatformClient):
     """Client for interacting with the Codeberg API and web endpoints,
     providing cached access to repository metadata, contents, and related resources."""
 
+    platform = "codeberg"
+
     def _get_api_base_url(self) -> str:
         """Returns the Codeberg API base URL."""
         return "https://codeberg.org/api/v1"
@@ -127,6 +122,13 @@ class CodebergClient(GitPlatformClient):
         url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/tags"
         return self._caching_get(url).json()
 
+    def get_head_commit_sha(self) -> str | None:
+        """Returns the SHA of the default branch's latest commit (without diff stats or file lists)."""
+        url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/commits"
+        params = {"limit": 1, "stat": "false", "verification": "false", "files": "false"}
+        commits = self._caching_get(url, params=params).json()
+        return commits[0]["sha"] if commits else None
+
     def get_default_branch(self) -> str:
         """Fetches the default branch name for the repository."""
         repository = self.get_repository()
@@ -139,6 +141,9 @@ class CodebergClient(GitPlatformClient):
     def get_download_url(self):
         return f"https://codeberg.org/{self.get_repository_owner()}/{self.get_repository_name()}/archive/{self.get_default_branch()}.zip"
 
+    def get_archive_url(self, ref: str) -> str:
+        return f"https://codeberg.org/{self.get_repository_owner()}/{self.get_repository_name()}/archive/{quote(ref, safe='')}.zip"
+
     def get_html_url(self):
         repo = self.get_repository()
         return repo.get('html_url')
@@ -155,10 +160,33 @@ class CodebergClient(GitPlatformClient):
         for tag in self.get_tags():
             return tag.get('commit', {}).get('created')
 
+    def get_entry_html_url(self, path: str, is_dir: bool) -> str | None:
+        html_url = self.get_html_url()
+        if not html_url:
+            return None
+        return f"{html_url}/src/branch/{quote(self.get_default_branch())}/{quote(path)}"
+
+    def list_tree(self) -> list[RepositoryItem] | None:
+        """Lists the whole default-branch tree via Gitea's paginated git trees API.
+
+        Returns None if the listing is truncated or needs more than `tree_max_pages` pages.
+        """
+        revision = quote(self.get_revision(), safe="")
+        url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/git/trees/{revision}"
+        entries: list[RepositoryItem] = []
+        for page in range(1, self.tree_max_pages + 1):
+            raw = self._caching_get(url, params={"recursive": "true", "page": page}).json()
+            tree = raw.get("tree") or []
+            entries.extend(CodebergRepositoryItem(entry) for entry in tree)
+            # Gitea flags every page but the last one as truncated
+            if not tree or not raw.get("truncated"):
+                return entries
+        return None
+
     def list_directory(self, path: str = "") -> list[RepositoryItem]:
         """Lists the immediate entries at `path` via Codeberg's (Gitea-compatible) contents API."""
         url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/contents/{path}"
-        response = self._caching_get(url)
+        response = self._caching_get(url, params={"ref": self.get_revision()})
         if response.status_code == 404:
             raise FileNotFoundOnPlatformError(path)
         raw = response.json()
@@ -169,8 +197,7 @@ class CodebergClient(GitPlatformClient):
     def _fetch_file(self, path: str, ref: str | None = None) -> RepositoryFile:
         """Fetches a single file's metadata and content via GitHub's contents API."""
         url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/contents/{path}"
-        params = {"ref": ref} if ref else None
-        response = self._caching_get(url, params=params)
+        response = self._caching_get(url, params={"ref": ref or self.get_revision()})
         if response.status_code == 404:
             raise FileNotFoundOnPlatformError(path)
         raw = response.json()
@@ -5,12 +5,18 @@ GitHub's `contents` endpoint already unifies file/directory access (unlike
 GitLab's split tree/files endpoints), so `list_directory` and `get_file`
 both hit the same endpoint here — mirroring the original Codeberg-style
 implementation almost exactly, since Codeberg's API is Gitea's
-GitHub-compatible surface.
+GitHub-compatible surface. The whole tree is listed in one request through
+the git trees API (`list_tree`).
 """
 
-import base64
+import contextvars
+import json
 import re
+import requests
+from urllib.parse import quote
 from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
+from app.layer_3.plugins.shared.caching_http_client import FetchError
+from app.layer_3.plugins.shared.http_session import get_fetch_executor
 from app.layer_3.plugins.shared.git_platform_client import (
     GitPlatformClient,
     RepositoryItem,
@@ -19,9 +25,11 @@ from app.layer_3.plugins.shared.git_platform_client import (
 )
 
 class GitHubRepositoryItem(RepositoryItem):
+    """Entry of the contents API or of the git trees API (which has no name / html_url)."""
+
     @property
     def name(self) -> str:
-        return self._raw["name"]
+        return self._raw.get("name") or self._raw["path"].rpartition("/")[2]
 
     @property
     def path(self) -> str:
@@ -29,30 +37,23 @@ class GitHubRepositoryItem(RepositoryItem):
 
     @property
     def is_dir(self) -> bool:
-        return self._raw["type"] == "dir"
+        return self._raw["type"] in ("dir", "tree")
 
-    def get_html_url(self, _client) -> str | None:
-        return self._raw.get("html_url")
+    def get_html_url(self, client) -> str | None:
+        return self._raw.get("html_url") or client.get_entry_html_url(self.path, self.is_dir)
 
 class GitHubRepositoryFile(GitHubRepositoryItem, RepositoryFile):
-    def get_content(self) -> str | None:
-        raw_content = self._raw.get("content")
-        if raw_content is None:
-            return None
-        if self._raw.get("encoding") == "base64":
-            try:
-                return base64.b64decode(raw_content).decode("utf-8")
-            except (ValueError, UnicodeDecodeError):
-                return None
-        return raw_content
-
-    def get_html_url(self, _client):
-        return self._raw.get("html_url")
+    """File of the contents API (base64) or of a batched fetch (already decoded text)."""
 
 class GitHubClient(GitPlatformClient):
     """Client for interacting with the GitHub API,
     providing cached access to repository metadata, contents, and related resources."""
 
+    platform = "github"
+
+    # files per GraphQL query in `_fetch_files`
+    GRAPHQL_BATCH_SIZE = 50
+
     def _get_api_base_url(self) -> str:
         """Returns the GitHub API base URL."""
         return "https://api.github.com"
@@ -140,6 +141,12 @@ class GitHubClient(GitPlatformClient):
         repository = self.get_repository()
         return repository.get("default_branch", "main")
 
+    def get_head_commit_sha(self) -> str | None:
+        """Returns the SHA of the default branch's latest commit (one commit listed, no repository call)."""
+        url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/commits"
+        commits = self._caching_get(url, params={"per_page": 1}).json()
+        return commits[0]["sha"] if commits else None
+
     def get_clone_url(self):
         repository = self.get_repository()
         return repository.get("clone_url")
@@ -147,6 +154,9 @@ class GitHubClient(GitPlatformClient):
     def get_download_url(self):
         return f"https://github.com/{self.get_repository_owner()}/{self.get_repository_name()}/archive/refs/heads/{self.get_default_branch()}.zip"
 
+    def get_archive_url(self, ref: str) -> str:
+        return f"https://github.com/{self.get_repository_owner()}/{self.get_repository_name()}/archive/{quote(ref, safe='')}.zip"
+
     def get_html_url(self):
         repo = self.get_repository()
         return repo.get('html_url')
@@ -172,10 +182,29 @@ class GitHubClient(GitPlatformClient):
         response = self._caching_get(f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/license")
         return response.json().get('license')
         
+    def get_entry_html_url(self, path: str, is_dir: bool) -> str | None:
+        html_url = self.get_html_url()
+        if not html_url:
+            return None
+        kind = "tree" if is_dir else "blob"
+        return f"{html_url}/{kind}/{quote(self.get_default_branch())}/{quote(path)}"
+
+    def list_tree(self) -> list[RepositoryItem] | None:
+        """Lists the whole default-branch tree in one request via GitHub's git trees API.
+
+        Returns None if GitHub truncated the listing (very large repositories).
+        """
+        revision = quote(self.get_revision(), safe="")
+        url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/git/trees/{revision}"
+        raw = self._caching_get(url, params={"recursive": "1"}).json()
+        if raw.get("truncated"):
+            return None
+        return [GitHubRepositoryItem(entry) for entry in raw.get("tree", [])]
+
     def list_directory(self, path: str = "") -> list[RepositoryItem]:
         """Lists the immediate entries at `path` via GitHub's contents API."""
         url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/contents/{path}"
-        response = self._caching_get(url)
+        response = self._caching_get(url, params={"ref": self.get_revision()})
         if response.status_code == 404:
             raise FileNotFoundOnPlatformError(path)
         raw = response.json()
@@ -183,11 +212,97 @@ class GitHubClient(GitPlatformClient):
             raise FileNotFoundOnPlatformError(path)
         return [GitHubRepositoryItem(entry) for entry in raw]
 
+    def _fetch_files(self, paths: list[str]) -> dict[str, RepositoryFile | None]:
+        """Fetches several default-branch files without the base64 contents API.
+
+        With a token (the user's or a pooled one), GitHub's GraphQL API returns up to `GRAPHQL_BATCH_SIZE`
+        blobs per query (`object(expression: "<revision>:<path>")` aliases). GraphQL
+        requires authentication, so anonymous clients read the unencoded bytes
+        from raw.githubusercontent.com instead, which is also not counted
+        against the REST API rate limit.
+        """
+        if self.has_credentials:
+            result: dict[str, RepositoryFile | None] = {}
+            for start in range(0, len(paths), self.GRAPHQL_BATCH_SIZE):
+                result.update(self._fetch_files_graphql(paths[start:start + self.GRAPHQL_BATCH_SIZE]))
+            return result
+        return self._fetch_files_raw(paths)
+
+    def _fetch_files_graphql(self, paths: list[str]) -> dict[str, RepositoryFile | None]:
+        revision = self.get_revision()
+        aliases = "\n".join(
+            f"f{i}: object(expression: {json.dumps(revision + ':' + path)}) {{ ... on Blob {{ oid byteSize isBinary isTruncated text }} }}"
+            for i, path in enumerate(paths)
+        )
+        query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {aliases} }} }}"
+        body = {
+            "query": query,
+            "variables": {"owner": self.get_repository_owner(), "name": self.get_repository_name()},
+        }
+        payload = self._caching_post(f"{self._get_api_base_url()}/graphql", body).json()
+        repository = (payload.get("data") or {}).get("repository")
+        if repository is None:
+            return {}
+
+        result: dict[str, RepositoryFile | None] = {}
+        for i, path in enumerate(paths):
+            key = f"f{i}"
+            if key not in repository:
+                continue
+            blob = repository[key]
+            if blob is None:
+                result[path] = None
+            elif not blob.get("isTruncated"):
+                result[path] = self._file_from_text(path, blob.get("text"), blob.get("oid"), blob.get("byteSize"))
+        return result
+
+    def _fetch_files_raw(self, paths: list[str]) -> dict[str, RepositoryFile | None]:
+        """Fetches `paths` from raw.githubusercontent.com concurrently, at most one request per pooled connection."""
+        base = f"https://raw.githubusercontent.com/{self.get_repository_owner()}/{self.get_repository_name()}/{quote(self.get_revision(), safe='')}"
+        executor = get_fetch_executor()
+        futures = {
+            path: executor.submit(contextvars.copy_context().run, self._fetch_file_raw, f"{base}/{quote(path)}", path)
+            for path in paths
+        }
+        result: dict[str, RepositoryFile | None] = {}
+        for path, future in futures.items():
+            found, file = future.result()
+            if found:
+                result[path] = file
+        return result
+
+    def _fetch_file_raw(self, url: str, path: str) -> tuple[bool, RepositoryFile | None]:
+        """(True, file) for a fetched file, (True, None) for a missing one, (False, None) when the fetch failed."""
+        try:
+            response = self._caching_get(url)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return True, None
+            return False, None
+        except FetchError:
+            return False, None
+        try:
+            text = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            text = None
+        return True, self._file_from_text(path, text, None, len(response.content))
+
+    @staticmethod
+    def _file_from_text(path: str, text: str | None, sha: str | None, size: int | None) -> RepositoryFile:
+        """Wraps already-decoded file text in the contents API's file shape."""
+        return GitHubRepositoryFile({
+            "type": "file",
+            "name": path.rpartition("/")[2],
+            "path": path,
+            "sha": sha,
+            "size": size,
+            "content": text,
+        })
+
     def _fetch_file(self, path: str, ref: str | None = None) -> RepositoryFile:
         """Fetches a single file's metadata and content via GitHub's contents API."""
         url = f"{self._get_api_base_url()}/repos/{self.get_repository_owner()}/{self.get_repository_name()}/contents/{path}"
-        params = {"ref": ref} if ref else None
-        response = self._caching_get(url, params=params)
+        response = self._caching_get(url, params={"ref": ref or self.get_revision()})
         if response.status_code == 404:
             raise FileNotFoundOnPlatformError(path)
         raw = response.json()
@@ -7,10 +7,11 @@ on top of GitLab's actual API shape:
 - File content goes through the `repository/files/{path}` endpoint.
 These are genuinely different endpoints on GitLab (unlike GitHub's unified
 "contents" endpoint), so no shape-sniffing or unified method is attempted.
+The whole tree is listed through `repository/tree?recursive=true`, following
+GitLab's `X-Next-Page` pagination (`list_tree`).
 """
 
 import re
-import base64
 import requests
 from urllib.parse import quote
 
@@ -39,6 +40,11 @@ class GitLabRepositoryItem(RepositoryItem):
     def is_dir(self) -> bool:
         return self._raw["type"] == "tree"
 
+    @property
+    def blob_sha(self) -> str | None:
+        # tree entries carry the blob SHA as "id", file responses as "blob_id"
+        return self._raw.get("id") or self._raw.get("blob_id")
+
     def get_html_url(self, client: GitPlatformClient) -> str | None:
         repo = client.get_repository_name()
         owner = client.get_repository_owner()
@@ -49,17 +55,6 @@ class GitLabRepositoryItem(RepositoryItem):
         return None
 
 class GitLabRepositoryFile(GitLabRepositoryItem, RepositoryFile):
-    def get_content(self) -> str | None:
-        raw_content = self._raw.get("content")
-        if raw_content is None:
-            return None
-        if self._raw.get("encoding") == "base64":
-            try:
-                return base64.b64decode(raw_content).decode("utf-8")
-            except (ValueError, UnicodeDecodeError):
-                return None
-        return raw_content
-
     def get_html_url(self, client: GitPlatformClient):
         repo = client.get_repository_name()
         owner = client.get_repository_owner()
@@ -73,6 +68,11 @@ class GitLabClient(GitPlatformClient):
     """Client for interacting with the GitLab API,
     providing cached access to repository metadata, contents, and related resources."""
 
+    platform = "gitlab"
+
+    # files per GraphQL query in `_fetch_files`
+    GRAPHQL_BATCH_SIZE = 50
+
     # ------------------------------------------------------------------
     # Platform identity / API basics
     # ------------------------------------------------------------------
@@ -81,6 +81,14 @@ class GitLabClient(GitPlatformClient):
         """Returns the GitLab API base URL."""
         return "https://gitlab.com/api/v4"
 
+    def _get_graphql_url(self) -> str:
+        """Returns the GraphQL endpoint of the instance serving `_get_api_base_url()`."""
+        base = self._get_api_base_url()
+        return f"{base.removesuffix('/v4')}/graphql"
+
+    def _authorization_headers(self, token: str) -> dict:
+        return {"Authorization": f"Bearer {token}"}
+
     def _build_headers(self) -> dict:
         """Builds request headers for GitLab API."""
         headers = {
@@ -169,6 +177,12 @@ class GitLabClient(GitPlatformClient):
         url = f"{self._get_api_base_url()}/projects/{self.get_project_id()}/repository/tags"
         return self._caching_get(url).json()
 
+    def get_head_commit_sha(self) -> str | None:
+        """Returns the SHA of the default branch's latest commit."""
+        url = f"{self._get_api_base_url()}/projects/{self.get_project_id()}/repository/commits"
+        commits = self._caching_get(url, params={"per_page": 1}).json()
+        return commits[0]["id"] if commits else None
+
     def get_default_branch(self) -> str:
         """Fetches the default branch name for the repository."""
         repository = self.get_repository()
@@ -181,6 +195,9 @@ class GitLabClient(GitPlatformClient):
     def get_download_url(self):
         return f"https://gitlab.com/api/v4/projects/{self.get_repository_owner()}/{self.get_repository_name()}/archive.zip?sha={self.get_default_branch()}"
 
+    def get_archive_url(self, ref: str) -> str:
+        return f"{self._get_api_base_url()}/projects/{self.get_project_id()}/repository/archive.zip?sha={quote(ref, safe='')}"
+
     def get_html_url(self):
         repo = self.get_repository()
         return repo.get('html_url')
@@ -189,13 +206,24 @@ class GitLabClient(GitPlatformClient):
     # Normalized content contract
     # ------------------------------------------------------------------
 
+    def get_entry_html_url(self, path: str, is_dir: bool) -> str | None:
+        # same shapes as GitLabRepositoryItem (directories) / GitLabRepositoryFile (files)
+        repo = self.get_repository_name()
+        owner = self.get_repository_owner()
+        defbra = self.get_default_branch()
+        if not (repo and owner and defbra and path):
+            return None
+        if is_dir:
+            return f"https://gitlab.com/{owner}/{repo}/-/tree/{defbra}/{path}?ref_type=heads"
+        return f"https://gitlab.com/{owner}/{repo}/-/raw/{defbra}/{path}?ref_type=heads&inline=true"
+
     def list_directory(self, path: str = "") -> list[RepositoryItem]:
         """Lists the immediate entries at `path` via GitLab's repository tree API.
 
         Raises:
             FileNotFoundOnPlatformError: if `path` doesn't exist (404) or isn't a directory.
         """
-        ref = self.get_default_branch()
+        ref = self.get_revision()
         url = f"{self._get_api_base_url()}/projects/{self.get_project_id()}/repository/tree"
         params = {"ref": ref}
         if path:
@@ -211,17 +239,79 @@ class GitLabClient(GitPlatformClient):
         raw_entries = response.json()
         return [GitLabRepositoryItem(entry) for entry in raw_entries]
 
+    def list_tree(self) -> list[RepositoryItem] | None:
+        """Lists the whole default-branch tree via GitLab's recursive, paginated tree API.
+
+        Returns None if the listing needs more than `tree_max_pages` pages.
+        """
+        url = f"{self._get_api_base_url()}/projects/{self.get_project_id()}/repository/tree"
+        params = {"ref": self.get_revision(), "recursive": "true", "per_page": 100}
+        entries: list[RepositoryItem] = []
+        page = 1
+        while page:
+            if page > self.tree_max_pages:
+                return None
+            response = self._caching_get(url, params={**params, "page": page})
+            entries.extend(GitLabRepositoryItem(entry) for entry in response.json())
+            page = int(response.headers.get("X-Next-Page") or 0)
+        return entries
+
+    def _fetch_files(self, paths: list[str]) -> dict[str, RepositoryFile | None]:
+        """Fetches several default-branch files per request via GitLab's GraphQL `blobs(paths:)`.
+
+        Blob text arrives unencoded; paths the response leaves out do not exist.
+        """
+        query = """
+            query($fullPath: ID!, $ref: String!, $paths: [String!]!) {
+              project(fullPath: $fullPath) {
+                repository {
+                  blobs(ref: $ref, paths: $paths) { nodes { path name oid size rawTextBlob } }
+                }
+              }
+            }
+        """
+        url = self._get_graphql_url()
+        full_path = f"{self.get_repository_owner()}/{self.get_repository_name()}"
+        result: dict[str, RepositoryFile | None] = {}
+        for start in range(0, len(paths), self.GRAPHQL_BATCH_SIZE):
+            batch = paths[start:start + self.GRAPHQL_BATCH_SIZE]
+            body = {
+                "query": query,
+                "variables": {"fullPath": full_path, "ref": self.get_revision(), "paths": batch},
+            }
+            payload = self._caching_post(url, body).json()
+            project = (payload.get("data") or {}).get("project")
+            repository = (project or {}).get("repository")
+            if repository is None:
+                continue
+            nodes = ((repository.get("blobs") or {}).get("nodes")) or []
+            found = {node["path"]: node for node in nodes if node}
+            for path in batch:
+                node = found.get(path)
+                if node is None:
+                    result[path] = None
+                    continue
+                result[path] = GitLabRepositoryFile({
+                    "type": "blob",
+                    "file_name": node.get("name") or path.rpartition("/")[2],
+                    "file_path": path,
+                    "blob_id": node.get("oid"),
+                    "size": node.get("size"),
+                    "content": node.get("rawTextBlob"),
+                })
+        return result
+
     def _fetch_file(self, path: str, ref: str | None = None) -> dict:
         """Fetches a single file's metadata and decoded content via GitLab's files API.
 
         Args:
             path: File path relative to the repository root.
-            ref: Branch, tag, or commit SHA (defaults to the project's default branch).
+            ref: Branch, tag, or commit SHA (defaults to the default branch at `get_revision()`).
 
         Raises:
             FileNotFoundOnPlatformError: if `path` doesn't exist or isn't a file.
         """
-        ref = ref or self.get_default_branch()
+        ref = ref or self.get_revision()
         encoded_path = quote(path, safe="")
         url = f"{self._get_api_base_url()}/projects/{self.get_project_id()}/repository/files/{encoded_path}"
 
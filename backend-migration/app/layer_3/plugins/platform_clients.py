@@ -0,0 +1,52 @@
+"""
+Maps a repository URL to the `GitPlatformClient` of its hosting platform.
+
+Extraction plugins pick their client themselves (`get_client`); this lookup
+is for code outside the plugins that needs a platform call before, or
+instead of, running the pipeline (e.g. the result cache asking for the HEAD
+commit, or a batch job checking the rate limit before it starts a repository).
+"""
+
+from typing import Callable
+
+from app.layer_3.plugins.codeberg.codeberg_client import CodebergClient
+from app.layer_3.plugins.github.github_client import GitHubClient
+from app.layer_3.plugins.gitlab.gitlab_client import GitLabClient
+from app.layer_3.plugins.shared.git_platform_client import GitPlatformClient
+from app.layer_2.contracts import canonical_platform
+from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
+
+PLATFORM_CLIENTS: dict[str, type[GitPlatformClient]] = {
+    "github.com": GitHubClient,
+    "gitlab.com": GitLabClient,
+    "codeberg.org": CodebergClient,
+}
+
+
+def get_platform_client(context: ExtractionContext, state: ExtractionState) -> GitPlatformClient | None:
+    """Returns the (per-extraction shared) client for `context.repo_url`, or None for unknown hosts."""
+    client_class = PLATFORM_CLIENTS.get(canonical_platform(context.repo_url))
+    return client_class.get_or_create(context, state) if client_class else None
+
+
+def rate_limit_probe(repo_url: str, access_token: str | None = None) -> Callable[[], float]:
+    """Returns a function giving the current `rate_limit_wait` of extractions of `repo_url`.
+
+    The budget only depends on the platform and the credentials that
+    extraction would use (`access_token`, else the platform's token pool,
+    else none), so one probe serves every repository of that platform.
+    Unknown hosts never wait.
+    """
+    platform = canonical_platform(repo_url)
+    client_class = PLATFORM_CLIENTS.get(platform)
+    if client_class is None:
+        return lambda: 0.0
+    context = ExtractionContext(
+        repo_url=repo_url, domain="software", schema=None, platform=platform, access_token=access_token
+    )
+    return client_class(context, ExtractionState(metadata_collector=None)).rate_limit_wait
+
+
+def rate_limit_wait(repo_url: str, access_token: str | None = None) -> float:
+    """Seconds until an extraction of `repo_url` can call its platform's API without waiting for a rate-limit reset."""
+    return rate_limit_probe(repo_url, access_token)()
@@ -0,0 +1,159 @@
+"""
+Process-wide cache of repository file contents keyed by git blob SHA.
+
+Tree listings (GitHub/Codeberg git trees, GitLab repository tree) report the
+blob SHA of every file, and a blob SHA identifies content regardless of the
+repository, path or branch it appears under. Forks, mirrors and repositories
+generated from the same template share many identical LICENSE, CITATION.cff
+and README files; `GitPlatformClient.get_file` looks a file's blob SHA up here
+before downloading it, so each distinct blob is downloaded once per process
+(or once overall with the SQLite backend).
+
+Contents are only stored after checking that they hash to the blob SHA they
+are stored under. A hit is therefore the exact content of the requested blob
+and can be shared across auth scopes: only a caller that was allowed to list
+the tree knows the SHA in the first place.
+"""
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+
+from app.layer_3.plugins.shared.hashing import git_blob_sha
+
+
+class BlobCacheBackend(ABC):
+    """Storage contract for blob contents keyed by git blob SHA."""
+
+    @abstractmethod
+    def get(self, sha: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def _store(self, sha: str, content: bytes) -> None:
+        pass
+
+    def set(self, sha: str, content: bytes) -> bool:
+        """Stores `content` under `sha` if it is that blob's content; returns whether it was stored."""
+        if git_blob_sha(content) != sha:
+            return False
+        self._store(sha, content)
+        return True
+
+
+class MemoryBlobCache(BlobCacheBackend):
+    """In-memory LRU bounded by the total size of the stored contents."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, sha: str) -> bytes | None:
+        with self._lock:
+            content = self._blobs.get(sha)
+            if content is not None:
+                self._blobs.move_to_end(sha)
+            return content
+
+    def _store(self, sha: str, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if sha in self._blobs:
+                self._blobs.move_to_end(sha)
+                return
+            self._blobs[sha] = content
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                _, evicted = self._blobs.popitem(last=False)
+                self._size -= len(evicted)
+
+
+class SqliteBlobCache(BlobCacheBackend):
+    """SQLite-backed blob store with LRU eviction by total size, shared across processes and runs."""
+
+    # how many writes between two eviction passes (eviction needs an aggregate query)
+    EVICTION_INTERVAL = 64
+
+    def __init__(self, path: str | Path, max_bytes: int = 256 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    sha         TEXT PRIMARY KEY,
+                    content     BLOB NOT NULL,
+                    size        INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS blobs_last_access ON blobs (last_access)")
+
+    def get(self, sha: str) -> bytes | None:
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT content FROM blobs WHERE sha = ?", (sha,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE blobs SET last_access = ? WHERE sha = ?", (time.time(), sha))
+        return bytes(row[0])
+
+    def _store(self, sha: str, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO blobs (sha, content, size, last_access) VALUES (?, ?, ?, ?)",
+                (sha, sqlite3.Binary(content), len(content), time.time()),
+            )
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= self.EVICTION_INTERVAL:
+                self._writes_since_eviction = 0
+                self._evict()
+
+    def evict(self) -> None:
+        """Forces an eviction pass (normally run every `EVICTION_INTERVAL` writes)."""
+        with self._lock, self._connection:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drops least-recently-used blobs until the size limit holds. Caller holds the lock."""
+        (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for sha, size in self._connection.execute("SELECT sha, size FROM blobs ORDER BY last_access ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            doomed.append((sha,))
+            total -= size
+        self._connection.executemany("DELETE FROM blobs WHERE sha = ?", doomed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_blob_cache: BlobCacheBackend | None = MemoryBlobCache()
+
+
+def configure_blob_cache(backend: BlobCacheBackend | None) -> None:
+    """Installs (or, with None, removes) the process-wide blob cache."""
+    global _blob_cache
+    _blob_cache = backend
+
+
+def get_blob_cache() -> BlobCacheBackend | None:
+    """Returns the process-wide blob cache, if one is configured."""
+    return _blob_cache
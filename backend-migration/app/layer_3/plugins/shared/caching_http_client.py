@@ -1,7 +1,17 @@
+import json
+import threading
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from time import sleep
+from types import MappingProxyType
+from typing import Any, Mapping
 import requests
+from requests.structures import CaseInsensitiveDict
 from app.layer_3.plugins.shared.named_stateful_singleton import NamedStatefulSingleton
+from app.layer_3.plugins.shared.http_cache import get_http_cache, build_cache_key, auth_scope
+from app.layer_3.plugins.shared.http_session import get_session
+from app.layer_3.plugins.shared import input_tracking
+from app.layer_3.plugins.shared.rate_limiter import get_rate_limiter
 from app.layer_3.steps.contracts import ExtractionState, ExtractionContext
 
 
@@ -10,24 +20,77 @@ class FetchError(Exception):
     pass
 
 
+class RateLimitError(FetchError):
+    """Raised when a request would have to wait longer than the rate limiter allows."""
+
+    def __init__(self, message: str, wait_seconds: float):
+        super().__init__(message)
+        self.wait_seconds = wait_seconds
+
+
+def _wait_for_rate_limit(url: str, wait: float, max_wait: float) -> None:
+    if wait > max_wait:
+        raise RateLimitError(f"Rate limit for {url} resets in {wait:.0f}s", wait)
+    if wait > 0:
+        print(f"[fetchFunction] rate limited, waiting {wait:.1f}s for url: {url}")
+        sleep(wait)
+
+
 def fetchFunction(
     url: str,
     headers: dict = None,
     params: dict = None,
     retries: int = 3,
     timeout: int = 5,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    session: requests.Session | None = None,
+    json: dict | None = None,
+    max_wait: float | None = None,
 ) -> requests.Response:
     """Performs a GET request with up to `retries` attempts on transient failures.
 
+    With a `json` body the request is sent as a POST instead (used for
+    read-only query APIs such as GraphQL).
+
+    Requests go through the process-wide pooled session for the URL's host
+    (see `http_session`) unless an explicit `session` is given, and are paced
+    by the process-wide rate limiter (see `rate_limiter`): a request waits
+    while the host's budget for these credentials is exhausted, and a
+    rate-limited 403/429 is retried after its reset / Retry-After. `max_wait`
+    overrides the limiter's longest acceptable wait (0 fails right away, so
+    the caller can switch credentials instead).
+
+    When `etag` and/or `last_modified` are given, the request is made
+    conditional (`If-None-Match` / `If-Modified-Since`) and a `304 Not Modified`
+    response is returned as-is for the caller to serve from its stored copy.
+
     Raises:
         FetchError: if the request fails on all attempts (timeout, connection
             error, or non-2xx response).
+        RateLimitError: if the rate limit resets later than `max_wait`.
     """
     last_exception: Exception | None = None
+    limiter = get_rate_limiter()
+    max_wait = limiter.max_wait if max_wait is None else max_wait
+
+    if etag or last_modified:
+        headers = dict(headers or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    session = session or get_session(url)
 
     for attempt in range(1, retries + 1):
+        _wait_for_rate_limit(url, limiter.reserve(url, headers), max_wait)
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=timeout)
+            if json is None:
+                response = session.get(url, headers=headers, params=params, timeout=timeout)
+            else:
+                response = session.post(url, headers=headers, params=params, json=json, timeout=timeout)
+            limiter.update(url, headers, response)
             response.raise_for_status()
             return response
         except (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError) as exc:
@@ -35,7 +98,12 @@ def fetchFunction(
             print(f"[fetchFunction] transient error on attempt {attempt}/{retries} for url: {url} ({exc})")
         except requests.exceptions.HTTPError as exc:
             status = exc.response.status_code if exc.response is not None else None
-            # Retry on server errors (5xx); don't retry on client errors (4xx).
+            # Retry on server errors (5xx) and rate limiting; don't retry on other client errors (4xx).
+            if exc.response is not None and limiter.retry_delay(exc.response) is not None:
+                # the limiter recorded the retry time; the next attempt waits for it
+                last_exception = exc
+                print(f"[fetchFunction] rate limited ({status}) on attempt {attempt}/{retries} for url: {url}")
+                continue
             if status is not None and 500 <= status < 600:
                 last_exception = exc
                 print(f"[fetchFunction] server error {status} on attempt {attempt}/{retries} for url: {url}")
@@ -48,29 +116,248 @@ def fetchFunction(
     raise FetchError(f"Failed to fetch {url} after {retries} attempts") from last_exception
 
 
+# response headers still read once a response is cached (pagination, body type)
+KEPT_HEADERS = ("Content-Type", "Link", "X-Next-Page", "X-Total", "X-Total-Pages")
+
+
+def _is_json(content_type: str | None) -> bool:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+
+@dataclass(frozen=True, eq=False)
+class CachedResponse:
+    """What `CachingHttpClient` keeps of a response: status, a few headers and the body.
+
+    A JSON body is decoded once, when the response is cached, and only the
+    decoded value is kept; every `json()` call returns that same value, so
+    callers must not modify it. Other bodies (raw file contents, HTML, ...)
+    are kept as bytes. Instances are immutable and shared by all threads of
+    an extraction.
+    """
+    url: str
+    status_code: int
+    headers: Mapping[str, str]
+    # the raw body; None for a JSON body, which is kept decoded in `data`
+    body: bytes | None = None
+    data: Any = None
+
+    @classmethod
+    def build(cls, url: str, status_code: int, headers: Mapping[str, str], content: bytes) -> "CachedResponse":
+        """Compacts a fetched or persisted response."""
+        headers = CaseInsensitiveDict(headers)
+        kept = CaseInsensitiveDict({name: headers[name] for name in KEPT_HEADERS if name in headers})
+        headers = MappingProxyType(kept)
+        if _is_json(kept.get("Content-Type")):
+            try:
+                return cls(url, status_code, headers, data=json.loads(content))
+            except ValueError:
+                pass
+        return cls(url, status_code, headers, body=content)
+
+    @classmethod
+    def from_response(cls, response: requests.Response, url: str) -> "CachedResponse":
+        return cls.build(response.url or url, response.status_code, response.headers, response.content)
+
+    @classmethod
+    def from_entry(cls, entry) -> "CachedResponse":
+        """Rebuilds a response from a persisted cache entry (see `http_cache.CachedHttpEntry`)."""
+        return cls.build(entry.url, entry.status_code, entry.headers, entry.content)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def encoding(self) -> str | None:
+        return requests.utils.get_encoding_from_headers(self.headers)
+
+    @property
+    def content(self) -> bytes:
+        if self.body is not None:
+            return self.body
+        # compact re-encoding of a JSON body; only needed for fingerprints and raw reads
+        return json.dumps(self.data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    @property
+    def has_graphql_errors(self) -> bool:
+        """Whether the body is a GraphQL response with a non-empty `errors` list."""
+        return isinstance(self.data, dict) and bool(self.data.get("errors"))
+
+    def json(self) -> Any:
+        if self.body is None:
+            return self.data
+        return json.loads(self.body)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
 class CachingHttpClient(NamedStatefulSingleton, ABC):
-    """Base client providing HTTP request caching functionality."""
+    """Base client providing HTTP request caching functionality.
+
+    Instances are shared by all steps of one extraction, which may run on
+    several threads; concurrent requests for the same key are collapsed into
+    a single fetch (single-flight). Cached responses are compact, read-only
+    `CachedResponse`s rather than `requests.Response`s.
+    """
 
     def __init__(self, context: ExtractionContext, state: ExtractionState):
         super().__init__(context, state)
-        self.cache: dict[tuple, requests.Response] = {}
+        self.cache: dict[tuple, CachedResponse] = {}
         self.headers = {}
+        self._inflight_guard = threading.Lock()
+        self._inflight: dict[tuple, threading.Lock] = {}
+
+    def _cache_scope(self) -> str:
+        """Scope persisted responses are shared under (see `http_cache.auth_scope`)."""
+        return auth_scope(self.headers)
+
+    def _fetch(self, fetch_function, url: str, **kwargs) -> requests.Response:
+        """Sends one request through `fetch_function` with this client's credentials."""
+        return fetch_function(url, headers=self.headers, **kwargs)
+
+    def _key_lock(self, cache_key: tuple) -> threading.Lock:
+        """Returns the lock serializing fetches of `cache_key`."""
+        with self._inflight_guard:
+            return self._inflight.setdefault(cache_key, threading.Lock())
 
     def _caching_get(
         self,
         url: str,
         params: dict = None,
         fetch_function=fetchFunction,
-    ) -> requests.Response:
-        """Fetches a URL using the given fetch function, caching successful responses for reuse."""
+        revalidate: bool = False,
+    ) -> CachedResponse:
+        """Fetches a URL using the given fetch function, caching successful responses for reuse.
+
+        Lookups go to the per-instance cache first, then to the process-wide
+        persistent cache (if configured), and only then to the network. With
+        `revalidate`, a persisted entry is treated as stale even if its TTL has
+        not run out, so the response reflects the resource as it is now.
+        """
+        try:
+            response = self._cached_get(url, params, fetch_function, revalidate)
+        except Exception as e:
+            input_tracking.record_request(self, "GET", url, params, error=e)
+            raise
+        input_tracking.record_request(self, "GET", url, params, response=response)
+        return response
+
+    def _cached_get(self, url: str, params: dict | None, fetch_function, revalidate: bool = False) -> CachedResponse:
         cache_key = (url, tuple(sorted(params.items()))) if params else (url, ())
 
-        if cache_key not in self.cache:
-            response = fetch_function(url, headers=self.headers, params=params)
+        if cache_key in self.cache:
+            return self.cache[cache_key]
+
+        with self._key_lock(cache_key):
+            if cache_key in self.cache:
+                return self.cache[cache_key]
+            persistent_cache = get_http_cache()
+            persistent_key = build_cache_key("GET", url, params, self._cache_scope())
+            entry = persistent_cache.get(persistent_key) if persistent_cache else None
+            if entry is not None and entry.is_fresh() and not revalidate:
+                response = CachedResponse.from_entry(entry)
+            elif entry is not None and self._is_revalidatable(entry):
+                response = self._revalidate(url, params, fetch_function, persistent_cache, persistent_key, entry)
+            else:
+                fetched = self._fetch(fetch_function, url, params=params)
+                self._persist(persistent_cache, persistent_key, url, fetched)
+                response = CachedResponse.from_response(fetched, url)
+            self.cache[cache_key] = response
+
+        return self.cache[cache_key]
+
+    def _caching_post(
+        self,
+        url: str,
+        json_body: dict,
+        fetch_function=fetchFunction,
+        revalidate: bool = False,
+    ) -> CachedResponse:
+        """POSTs `json_body` and caches the response like `_caching_get` does.
+
+        Only meant for side-effect free query APIs (e.g. GraphQL), where the
+        same body always asks for the same data. Persisted entries are served
+        while fresh and refetched once expired (there is nothing to revalidate);
+        `revalidate` refetches regardless of freshness. Responses carrying
+        GraphQL `errors` are kept for this client only, never persisted.
+        """
+        body = json.dumps(json_body, sort_keys=True, separators=(",", ":"))
+        try:
+            response = self._cached_post(url, json_body, body, fetch_function, revalidate)
+        except Exception as e:
+            input_tracking.record_request(self, "POST", url, body, error=e)
+            raise
+        input_tracking.record_request(self, "POST", url, body, response=response)
+        return response
+
+    def _cached_post(self, url: str, json_body: dict, body: str, fetch_function, revalidate: bool = False) -> CachedResponse:
+        cache_key = ("POST", url, body)
+
+        if cache_key in self.cache:
+            return self.cache[cache_key]
+
+        with self._key_lock(cache_key):
+            if cache_key in self.cache:
+                return self.cache[cache_key]
+            persistent_cache = get_http_cache()
+            persistent_key = build_cache_key("POST", url, {"body": body}, self._cache_scope())
+            entry = persistent_cache.get(persistent_key) if persistent_cache else None
+            if entry is not None and entry.is_fresh() and not revalidate:
+                response = CachedResponse.from_entry(entry)
+            else:
+                fetched = self._fetch(fetch_function, url, json=json_body)
+                response = CachedResponse.from_response(fetched, url)
+                # GraphQL reports failures (rate limits, timeouts, missing objects) with a 200
+                if not response.has_graphql_errors:
+                    self._persist(persistent_cache, persistent_key, url, fetched)
             self.cache[cache_key] = response
 
         return self.cache[cache_key]
 
+    @staticmethod
+    def _persist(persistent_cache, persistent_key: str, url: str, response: requests.Response) -> None:
+        """Stores a successful response in the persistent cache, if one is configured."""
+        if persistent_cache and response.ok:
+            persistent_cache.set(
+                persistent_key,
+                persistent_cache.build_entry(
+                    response.url or url, response.status_code, dict(response.headers), response.content
+                ),
+            )
+
+    @staticmethod
+    def _is_revalidatable(entry) -> bool:
+        headers = CaseInsensitiveDict(entry.headers)
+        return bool(headers.get("ETag") or headers.get("Last-Modified"))
+
+    def _revalidate(self, url, params, fetch_function, persistent_cache, persistent_key, entry) -> CachedResponse:
+        """Re-requests a stale entry conditionally; a 304 renews it without a body transfer."""
+        stored_headers = CaseInsensitiveDict(entry.headers)
+        response = self._fetch(
+            fetch_function,
+            url,
+            params=params,
+            etag=stored_headers.get("ETag"),
+            last_modified=stored_headers.get("Last-Modified"),
+        )
+        if response.status_code == 304:
+            # 304 carries refreshed validators but no body: keep the stored body.
+            for header in ("ETag", "Last-Modified", "Cache-Control"):
+                if header in response.headers:
+                    stored_headers[header] = response.headers[header]
+            renewed = persistent_cache.build_entry(entry.url, entry.status_code, dict(stored_headers), entry.content)
+            persistent_cache.set(persistent_key, renewed)
+            return CachedResponse.from_entry(renewed)
+        self._persist(persistent_cache, persistent_key, url, response)
+        return CachedResponse.from_response(response, url)
+
     @abstractmethod
     def _build_headers(self) -> dict:
         """Builds request headers specific to the platform's API requirements."""
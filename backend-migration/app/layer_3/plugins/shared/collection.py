@@ -2,7 +2,8 @@ import re
 import datetime
 from app.layer_3.plugins.shared.git_platform_base_extractor import GitPlatformBaseExtractor
 from app.layer_3.plugins.url_pattern_matcher_plugin import URLPatternMatcher
-from app.layer_3.plugins.codeberg.utils import match_license_text, dependency_files
+from app.layer_3.plugins.shared.utils import match_license_text
+from app.layer_3.plugins.shared import repository_index
 from app.layer_3.plugins.shared.wayback_client import WaybackClient
 from app.layer_3.plugins.shared.software_heritage_client import SoftwareHeritageClient
 from app.layer_3.plugins.shared.open_alex_client import OpenAlexClient
@@ -582,13 +583,13 @@ class GitPlatformSoftwareRequirementExtractor(GitPlatformBaseExtractor):
 
     def extract(self, context, state):
         client = self.get_client(context, state)
-        files = client.list_contents()
+        files = client.get_repository_index().by_category(repository_index.DEPENDENCY)
         found = []
         for file in files:
-            if file.name.lower() in dependency_files:
-                download_url = client.get_file(file.path).get_html_url(client)
-                if download_url:
-                    found.append(download_url)
+            # only the location is reported: the tree entry is enough, the (often large) contents are never read
+            download_url = client.get_entry_html_url(file.path, False)
+            if download_url:
+                found.append(download_url)
         if len(found) > 0:
             state.metadata_collector.collect("Platform API", 'https://schema.org/softwareRequirements', found, 0.95)
         return state
@@ -670,38 +671,16 @@ class GitPlatformDeveloperDocumentationExtractor(GitPlatformBaseExtractor):
 
     extracts = {'https://codemeta.github.io/terms/developerDocumentation'}
 
-    developer_doc_filenames = {
-        'hacking.md',
-        'hacking.rst',
-        'hacking.txt',
-        'hacking',
-        'developers.md',
-        'developers.rst',
-        'developers.txt',
-        'developers',
-        'developer.md',
-        'developer.rst',
-        'developer.txt',
-        'developer',
-        'contributing.md',
-        'contributing.rst',
-        'contributing.txt',
-        'contributing',
-        'development.md',
-        'development.rst',
-        'development.txt',
-        'development',
-    }
+    developer_doc_filenames = repository_index.developer_doc_filenames
 
     def extract(self, context, state):
         client = self.get_client(context, state)
         found = []
-        for entry in client.list_contents():
-            if entry.name.lower() in self.developer_doc_filenames and not entry.is_dir:
-                doc_file = client.get_file(entry.path)
-                html_url = doc_file.get_html_url(client)
-                if html_url:
-                    found.append(html_url)
+        for entry in client.get_repository_index().by_category(repository_index.DEVELOPER_DOCS):
+            doc_file = client.get_file(entry.path)
+            html_url = doc_file.get_html_url(client)
+            if html_url:
+                found.append(html_url)
         if len(found) > 0:
             state.metadata_collector.collect("Pattern", 'https://codemeta.github.io/terms/developerDocumentation', found, 0.85)
         return state
@@ -714,49 +693,13 @@ class GitPlatformDocumentationExtractor(GitPlatformBaseExtractor):
     extracts = {'https://schema.org/documentation'}
 
     # top-level files that indicate documentation
-    doc_filenames = {
-        'documentation.md',
-        'documentation.rst',
-        'documentation.txt',
-        'documentation',
-        'docs.md',
-        'docs.rst',
-        'docs.txt',
-        'usage.md',
-        'usage.rst',
-        'usage.txt',
-        'guide.md',
-        'guide.rst',
-        'manual.md',
-        'manual.rst',
-    }
+    doc_filenames = repository_index.doc_filenames
 
     # directories whose mere presence strongly suggests documentation
-    doc_dirnames = {
-        'docs',
-        'doc',
-        'documentation',
-        'wiki',
-        'guides',
-        'manual',
-    }
+    doc_dirnames = repository_index.doc_dirnames
 
     # config files that indicate a documentation-generator/site is in use
-    doc_tool_filenames = {
-        'mkdocs.yml',
-        'mkdocs.yaml',
-        '_config.yml',       # Jekyll
-        'book.toml',         # mdBook
-        'docusaurus.config.js',
-        'docusaurus.config.ts',
-        '.readthedocs.yml',
-        '.readthedocs.yaml',
-        'vuepress.config.js',
-        'nextra.config.js',
-        'typedoc.json',
-        'jsdoc.json',
-        '.jsdoc.json',
-    }
+    doc_tool_filenames = repository_index.doc_tool_filenames
 
     # known documentation hosting domains, used to scan README links
     doc_url_pattern = re.compile(
@@ -781,15 +724,12 @@ class GitPlatformDocumentationExtractor(GitPlatformBaseExtractor):
         found = set()
 
         # 1. Look for dedicated documentation files/directories at repo root
-        for entry in client.list_contents():
-            name_lower = entry.name.lower()
-            if entry.is_dir and name_lower in self.doc_dirnames:
+        for entry in client.get_repository_index().by_category(repository_index.DOCS):
+            if entry.is_dir:
                 dir_url = entry.get_html_url(client)
                 if dir_url:
                     found.add(dir_url)
-            elif not entry.is_dir and (
-                name_lower in self.doc_filenames or name_lower in self.doc_tool_filenames
-            ):
+            else:
                 doc_file = client.get_file(entry.path)
                 html_url = doc_file.get_html_url(client)
                 if html_url:
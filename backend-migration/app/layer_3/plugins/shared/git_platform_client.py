@@ -8,17 +8,32 @@ CITATION/CHANGELOG discovery, citation parsing). Platform-specific API shapes
 (GitHub's dual-purpose "contents" endpoint vs. GitLab's separate "tree"/"files"
 endpoints, etc.) are implemented by subclasses behind `list_directory` and
 `get_file`, and never leak into this class.
+
+Platforms that can list a whole repository tree in one (or a few paginated)
+requests implement `list_tree`; the resulting path index is built once per
+client and serves every `list_contents` call. Platforms without such an API
+fall back to walking `list_directory`.
 """
 
+import base64
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
+import requests
 import yaml
 
-from app.layer_3.plugins.shared.caching_http_client import CachingHttpClient
+from app.layer_3.plugins.shared.caching_http_client import CachingHttpClient, FetchError, RateLimitError
 from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
 from app.layer_3.plugins.url_pattern_matcher_plugin import URLPatternMatcher
 from app.layer_3.plugins.shared.bibtex import parse_bibtex
+from app.layer_3.plugins.shared import input_tracking, repository_index
+from app.layer_3.plugins.shared.blob_cache import get_blob_cache
+from app.layer_3.plugins.shared.repository_index import RepositoryIndex
+from app.layer_3.plugins.shared import repository_snapshot
+from app.layer_3.plugins.shared.repository_snapshot import RepositorySnapshot, SnapshotError
+from app.layer_3.plugins.shared.token_pool import get_token_pool
+from app.layer_3.plugins.shared.rate_limiter import get_rate_limiter
 
 class RepositoryItem(ABC):
     """Thin wrapper around a platform's raw JSON representation of a single
@@ -51,25 +66,138 @@ class RepositoryItem(ABC):
     def get_html_url(client : "GitPlatformClient") -> str | None:
         ...
 
+    @property
+    def blob_sha(self) -> str | None:
+        """Git blob SHA of the entry's content, if the platform reports one."""
+        return self._raw.get("sha")
+
+    @property
+    def size(self) -> int | None:
+        """Size of the entry's content in bytes, if the platform reports one."""
+        size = self._raw.get("size")
+        # GraphQL APIs may report sizes as strings
+        return int(size) if size is not None else None
+
+# marks a not yet decoded `RepositoryFile` content
+_UNDECODED = object()
+
 class RepositoryFile(RepositoryItem, ABC):
     """Thin wrapper around a platform's raw JSON representation of a single
     fetched file (metadata + content).
 
-    Subclasses know how their platform encodes file content (e.g. base64)
-    and decode it in `get_content`.
+    The payload's "content" is either text, bytes, or base64 (with
+    "encoding": "base64"), which covers every platform's contents API. It
+    is decoded on first access and the result kept, so repeated
+    `get_content` calls on the same file are free. Files larger than
+    `max_bytes` (see `configure_repository_files`) are not decoded at all.
     """
 
-    @abstractmethod
+    # files above this size (in bytes) have no content; None (default): no limit
+    max_bytes: int | None = None
+
+    def __init__(self, raw: dict):
+        super().__init__(raw)
+        self._bytes = _UNDECODED
+        self._text = _UNDECODED
+
+    def is_oversized(self) -> bool:
+        """Whether the file exceeds `max_bytes`, judged by its reported or (estimated) payload size."""
+        if self.max_bytes is None:
+            return False
+        size = self.size
+        if size is None:
+            payload = self._raw.get("content")
+            if payload is None:
+                return False
+            size = len(payload) * 3 // 4 if self._raw.get("encoding") == "base64" else len(payload)
+        return size > self.max_bytes
+
+    def get_bytes(self) -> bytes | None:
+        """Returns the file's raw content, or None if it is missing or oversized."""
+        if self._bytes is _UNDECODED:
+            self._bytes = self._decode_bytes()
+        return self._bytes
+
     def get_content(self) -> str | None:
         """Returns the file's decoded text content, or None if the file is
-        binary / not text-decodable."""
-        pass
+        binary / not text-decodable / oversized."""
+        if self._text is _UNDECODED:
+            self._text = self._decode_text()
+        return self._text
+
+    def _decode_bytes(self) -> bytes | None:
+        payload = self._raw.get("content")
+        if payload is None or self.is_oversized():
+            return None
+        if isinstance(payload, bytes):
+            return payload
+        if self._raw.get("encoding") == "base64":
+            try:
+                return base64.b64decode(payload)
+            except ValueError:
+                return None
+        return payload.encode("utf-8")
+
+    def _decode_text(self) -> str | None:
+        payload = self._raw.get("content")
+        if isinstance(payload, str) and self._raw.get("encoding") != "base64":
+            # already text (GraphQL blobs, raw downloads): no round trip through bytes
+            return None if self.is_oversized() else payload
+        content = self.get_bytes()
+        if content is None:
+            return None
+        try:
+            return content.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+class SnapshotRepositoryItem(RepositoryItem):
+    """Tree entry served from a local repository snapshot; web URLs are built by the client."""
+
+    @property
+    def name(self) -> str:
+        return self._raw["path"].rpartition("/")[2]
+
+    @property
+    def path(self) -> str:
+        return self._raw["path"]
+
+    @property
+    def is_dir(self) -> bool:
+        return self._raw["type"] == "tree"
+
+    def get_html_url(self, client: "GitPlatformClient") -> str | None:
+        return client.get_entry_html_url(self.path, self.is_dir)
+
+class SnapshotRepositoryFile(SnapshotRepositoryItem, RepositoryFile):
+    """File read from a local repository snapshot (raw bytes, no transport encoding)."""
+
+class CachedBlobRepositoryFile(SnapshotRepositoryItem, RepositoryFile):
+    """File whose content came from the blob cache (raw bytes, see `blob_cache`)."""
+
+class SkippedRepositoryFile(SnapshotRepositoryItem, RepositoryFile):
+    """Tree entry whose reported size exceeds `RepositoryFile.max_bytes`; its content is never downloaded."""
+
+    def is_oversized(self) -> bool:
+        return True
 
 class FileNotFoundOnPlatformError(Exception):
     """Raised when a requested file path does not exist / is not a file on the platform."""
     pass
 
 
+# candidate files fetched together in one batch on first use (see `prefetch_candidate_files`)
+PREFETCH_CATEGORIES = (
+    repository_index.README,
+    repository_index.LICENSE,
+    repository_index.CITATION,
+    repository_index.CHANGELOG,
+    repository_index.BIBTEX,
+    repository_index.CODEMETA,
+    repository_index.DEPENDENCY,
+)
+
+
 class GitPlatformClient(CachingHttpClient, ABC):
     """Abstract base class for platform-specific Git repository clients.
 
@@ -77,6 +205,13 @@ class GitPlatformClient(CachingHttpClient, ABC):
     (Codeberg, GitHub, GitLab, etc.), handling repository metadata, contents, and resources.
     """
 
+    # name of the shared token pool used when the user gives no token (see `token_pool`)
+    platform: str | None = None
+    # default depth of `list_contents` (see `configure_repository_tree`)
+    tree_depth: int = 2
+    # paginated tree listings needing more pages than this fall back to the directory walk
+    tree_max_pages: int = 10
+
     def __init__(self, context: ExtractionContext, state: ExtractionState):
         """Initializes the client with extraction context/state and sets up request headers.
 
@@ -92,7 +227,23 @@ class GitPlatformClient(CachingHttpClient, ABC):
         self._dois_from_readme: set[str] | None = None
         self._parsed_bibtex: list[dict] | None = None
         self._file_cache: dict[tuple[str, str | None], RepositoryFile] = {}
+        # default-branch paths a batched fetch reported as non-existent
+        self._missing_files: set[str] = set()
+        self._candidates_prefetched = False
+        self._prefetch_lock = threading.Lock()
+        self._tree_index: dict[str, list[RepositoryItem]] | None = None
+        # path -> entry over the same listing, for per-file lookups (see `_tree_entry`)
+        self._tree_entries: dict[str, RepositoryItem] | None = None
+        self._tree_complete = False
+        self._repository_index: RepositoryIndex | None = None
+        self._snapshot: RepositorySnapshot | None = None
+        self._snapshot_loaded = False
+        # commit SHA (or, failing that, branch name) default-branch contents are read at, see `get_revision`
+        self._revision: str | None = None
+        self._tree_lock = threading.RLock()
         self.headers = self._build_headers()
+        # a user's own token is never mixed with the shared pool
+        self.token_pool = None if context.access_token else get_token_pool(self.platform)
 
     # ------------------------------------------------------------------
     # Platform identity / API basics — must be implemented per platform
@@ -108,6 +259,57 @@ class GitPlatformClient(CachingHttpClient, ABC):
         """Builds request headers specific to the platform's API requirements."""
         pass
 
+    def _authorization_headers(self, token: str) -> dict:
+        """Returns the headers authenticating a request with `token` (used for pooled tokens)."""
+        return {"Authorization": f"token {token}"}
+
+    @property
+    def has_credentials(self) -> bool:
+        """Whether requests are authenticated, by the user's token or a pooled one."""
+        return bool(self.context.access_token or self.token_pool)
+
+    def _pooled_headers(self, token: str) -> dict:
+        return {**self.headers, **self._authorization_headers(token)}
+
+    def _cache_scope(self) -> str:
+        if self.token_pool is not None:
+            return self.token_pool.cache_scope
+        return super()._cache_scope()
+
+    def _fetch(self, fetch_function, url: str, **kwargs) -> requests.Response:
+        """Sends a request with the user's token, or with the pool token that has the most budget left.
+
+        A pooled request whose token turns out to be rate limited moves on to
+        the next token instead of waiting. Once only blocked or exhausted
+        tokens are left (by the same budget lookup `TokenPool.rank` and
+        `rate_limit_wait` use), the one usable soonest waits for its reset.
+        """
+        if self.token_pool is None:
+            return super()._fetch(fetch_function, url, **kwargs)
+        limiter = get_rate_limiter()
+        ranked = self.token_pool.rank(url, self._pooled_headers)
+        for token in ranked[:-1]:
+            headers = self._pooled_headers(token)
+            if limiter.wait_for(url, headers) > 0:
+                # ranked usable first, then soonest reset first: no later token is usable sooner
+                return fetch_function(url, headers=headers, **kwargs)
+            try:
+                return fetch_function(url, headers=headers, max_wait=0, **kwargs)
+            except RateLimitError:
+                continue
+        return fetch_function(url, headers=self._pooled_headers(ranked[-1]), **kwargs)
+
+    def rate_limit_wait(self) -> float:
+        """Seconds until this client can call the platform API without waiting for a rate-limit reset.
+
+        Looks at the credentials `_fetch` would send: the user's token (or
+        none), else the pool token that becomes usable first.
+        """
+        url = self._get_api_base_url()
+        if self.token_pool is None:
+            return get_rate_limiter().wait_for(url, self.headers)
+        return self.token_pool.wait_seconds(url, self._pooled_headers)
+
     @abstractmethod
     def _extract_repository_info(self, context: ExtractionContext) -> tuple[str, str]:
         """Parses the repository owner and name from the context's repository URL.
@@ -163,6 +365,28 @@ class GitPlatformClient(CachingHttpClient, ABC):
         """Fetches the default branch name for the repository."""
         pass
 
+    def get_head_commit_sha(self) -> str | None:
+        """Returns the SHA of the default branch's latest commit, or None if the platform cannot tell."""
+        return None
+
+    def get_revision(self) -> str:
+        """Returns the ref every default-branch tree and file read uses: the HEAD commit SHA, resolved once per client.
+
+        Reads addressed by a commit SHA never change, so the HTTP cache may keep
+        them indefinitely, and a push is noticed by the (always revalidated) HEAD
+        lookup alone. Falls back to the branch name if HEAD cannot be resolved.
+        """
+        if self._revision is None:
+            with self._tree_lock:
+                if self._revision is None:
+                    try:
+                        sha = self.get_head_commit_sha()
+                    except Exception as e:
+                        print(f"[GitPlatformClient] cannot resolve HEAD of {self.context.repo_url}, reading by branch ({e})")
+                        sha = None
+                    self._revision = sha or self.get_default_branch()
+        return self._revision
+
     @abstractmethod
     def get_html_url(self) -> str | None:
         """Fetches the repositories' clone url using the api"""
@@ -178,6 +402,11 @@ class GitPlatformClient(CachingHttpClient, ABC):
         """Fetches the repositories' download url using the api"""
         pass
 
+    @abstractmethod
+    def get_archive_url(self, ref: str) -> str:
+        """Returns the URL of the zip archive of the tree at `ref` (commit SHA or branch), for snapshots."""
+        pass
+
     @abstractmethod
     def get_date_created(self) -> str | None:
         pass
@@ -221,7 +450,7 @@ class GitPlatformClient(CachingHttpClient, ABC):
 
         Args:
             path: File path relative to the repo root.
-            ref: Branch, tag, or commit SHA (defaults to the repository's default branch).
+            ref: Branch, tag, or commit SHA (defaults to the default branch at `get_revision()`).
 
         Returns:
             A RepositoryFile wrapping the platform's raw response for `path`.
@@ -230,10 +459,96 @@ class GitPlatformClient(CachingHttpClient, ABC):
             FileNotFoundOnPlatformError: if `path` does not exist or is not a file.
         """
         cache_key = (path, ref)
-        if cache_key not in self._file_cache:
-            self._file_cache[cache_key] = self._fetch_file(path, ref)
+        if ref is None:
+            input_tracking.record_file(self.state, path)
+        if ref is None and path in self._missing_files:
+            raise FileNotFoundOnPlatformError(path)
+        if cache_key in self._file_cache:
+            return self._file_cache[cache_key]
+        # one fetch per file even when several plugins ask for it at once (same single-flight as `_caching_get`)
+        with self._key_lock(("file", path, ref)):
+            if cache_key not in self._file_cache:
+                self._file_cache[cache_key] = self._load_file(path, ref)
         return self._file_cache[cache_key]
 
+    def _load_file(self, path: str, ref: str | None) -> RepositoryFile:
+        """Serves `path` from the size cap, the snapshot or the blob cache, or fetches (and stores) it."""
+        with input_tracking.untracked():
+            snapshot = self.get_snapshot() if ref is None else None
+            skipped = self._skipped_file(path) if ref is None else None
+            if skipped is not None:
+                return skipped
+            if snapshot is not None:
+                return self._snapshot_file(snapshot, path)
+            cached = self._cached_blob_file(path) if ref is None else None
+            if cached is not None:
+                return cached
+            file = self._fetch_file(path, ref)
+            self._store_blob(path, file)
+            return file
+
+    def _tree_entry(self, path: str) -> RepositoryItem | None:
+        """The default-branch tree entry of `path`, if the tree index is already built (it is not built for this)."""
+        entries = self._tree_entries
+        return entries.get(path) if entries is not None else None
+
+    def _skipped_file(self, path: str) -> RepositoryFile | None:
+        """A content-less file for `path` if the tree index reports it larger than `RepositoryFile.max_bytes`.
+
+        A file of unknown size is fetched and capped when decoded.
+        """
+        if RepositoryFile.max_bytes is None:
+            return None
+        entry = self._tree_entry(path)
+        if entry is not None and entry.size is not None and entry.size > RepositoryFile.max_bytes:
+            return SkippedRepositoryFile({"path": path, "type": "blob", "size": entry.size, "sha": entry.blob_sha})
+        return None
+
+    def _cached_blob_file(self, path: str) -> RepositoryFile | None:
+        """`path` served from the blob cache, if the tree index reports its blob SHA and the cache has that blob."""
+        blob_cache = get_blob_cache()
+        entry = self._tree_entry(path) if blob_cache is not None else None
+        sha = entry.blob_sha if entry is not None else None
+        content = blob_cache.get(sha) if sha else None
+        if content is None:
+            return None
+        return CachedBlobRepositoryFile({"path": path, "type": "blob", "size": len(content), "sha": sha, "content": content})
+
+    def _store_blob(self, path: str, file: RepositoryFile) -> None:
+        """Adds a fetched default-branch file to the blob cache under its (or its tree entry's) blob SHA."""
+        blob_cache = get_blob_cache()
+        if blob_cache is None:
+            return
+        sha = file.blob_sha
+        if not sha:
+            entry = self._tree_entry(path)
+            sha = entry.blob_sha if entry is not None else None
+        content = file.get_bytes() if sha else None
+        if content is not None:
+            blob_cache.set(sha, content)
+
+    def list_tree(self) -> list[RepositoryItem] | None:
+        """Lists every entry of the repository in as few requests as the platform allows.
+
+        Platforms with a recursive tree API override this. Returns None when
+        no complete listing is available (no such API, truncated response, too
+        many pages); callers then fall back to walking `list_directory`.
+        """
+        return None
+
+    def _fetch_files(self, paths: list[str]) -> dict[str, RepositoryFile | None]:
+        """Platform-specific batched fetch of several default-branch files.
+
+        Platforms that can return many files in one round-trip override this.
+        Returns path -> file, or path -> None for paths known not to exist;
+        paths left out of the result are fetched one by one via `_fetch_file`.
+        """
+        return {}
+
+    def get_entry_html_url(self, path: str, is_dir: bool) -> str | None:
+        """Builds the web URL of a tree entry whose raw payload carries none."""
+        return None
+
     @abstractmethod
     def _fetch_file(self, path: str, ref: str | None = None) -> RepositoryFile:
         """Platform-specific fetch of a single file's metadata + content.
@@ -247,28 +562,93 @@ class GitPlatformClient(CachingHttpClient, ABC):
         """
         pass
 
+    # ------------------------------------------------------------------
+    # Local snapshot (archive / shallow clone) of the default branch
+    # ------------------------------------------------------------------
+
+    def get_snapshot(self) -> RepositorySnapshot | None:
+        """Returns the local snapshot serving tree and file reads, if snapshots are enabled.
+
+        Created on first use according to `repository_snapshot.configure_repository_snapshots`
+        and removed when the extraction finishes. If it cannot be created the
+        client keeps using the platform API.
+        """
+        if not self._snapshot_loaded:
+            with self._tree_lock:
+                if not self._snapshot_loaded:
+                    self._snapshot = self._open_snapshot()
+                    self._snapshot_loaded = True
+                    if self._snapshot is not None:
+                        self.state.add_cleanup(self.close_snapshot)
+        return self._snapshot
+
+    def close_snapshot(self) -> None:
+        """Deletes the snapshot's temporary files; later reads go to the platform API.
+
+        Registered as a cleanup of the extraction (see `ExtractionState.close`)
+        whenever `get_snapshot` opens a snapshot.
+        """
+        with self._tree_lock:
+            snapshot, self._snapshot = self._snapshot, None
+            self._snapshot_loaded = True
+        if snapshot is not None:
+            snapshot.close()
+
+    def use_snapshot(self, snapshot: RepositorySnapshot | None) -> None:
+        """Serves tree and default-branch file reads from `snapshot` (None: platform API)."""
+        with self._tree_lock:
+            self._snapshot = snapshot
+            self._snapshot_loaded = True
+            self._tree_index = None
+            self._tree_entries = None
+            self._repository_index = None
+
+    def _open_snapshot(self) -> RepositorySnapshot | None:
+        mode = repository_snapshot.get_snapshot_mode()
+        if mode is None:
+            return None
+        try:
+            # pinned like every other default-branch read, so the snapshot matches the commit results are stored under
+            revision = self.get_revision()
+            if mode == repository_snapshot.CLONE:
+                source = repository_snapshot.find_mirror(self.get_repository_owner(), self.get_repository_name())
+                return repository_snapshot.clone_snapshot(source or self.get_clone_url(), ref=revision)
+            return repository_snapshot.download_archive_snapshot(self.get_archive_url(revision), headers=self.headers)
+        except (SnapshotError, requests.exceptions.RequestException, FetchError, ValueError) as e:
+            print(f"[GitPlatformClient] no {mode} snapshot for {self.context.repo_url}, using the platform API ({e})")
+            return None
+
+    @staticmethod
+    def _snapshot_file(snapshot: RepositorySnapshot, path: str) -> RepositoryFile:
+        content = snapshot.read_bytes(path)
+        if content is None:
+            raise FileNotFoundOnPlatformError(path)
+        return SnapshotRepositoryFile({"path": path, "type": "blob", "size": len(content), "content": content})
+
     # ------------------------------------------------------------------
     # Generic traversal built on the normalized contract above
     # ------------------------------------------------------------------
 
-    def list_contents(self, path: str = "", depth: int = 2) -> list[RepositoryItem]:
+    def list_contents(self, path: str = "", depth: int | None = None) -> list[RepositoryItem]:
         """Recursively lists repository file/directory entries up to the given depth.
 
+        Served from the path index built once per client (see `get_tree_index`).
+
         Args:
             path: Directory path to start from ("" = repo root).
             depth: How many levels of subdirectories to recurse into.
                    depth=1 lists only the immediate contents of `path`.
+                   Defaults to `tree_depth`.
 
         Returns:
             A flat list of RepoEntry for all discovered files/directories.
         """
+        if depth is None:
+            depth = self.tree_depth
         if depth <= 0:
             return []
 
-        try:
-            entries = self.list_directory(path)
-        except FileNotFoundOnPlatformError:
-            return []
+        entries = self._list_children(path)
 
         # Iterate over a stable copy; accumulate into a separate list so we
         # never mutate the collection we're iterating over.
@@ -278,35 +658,146 @@ class GitPlatformClient(CachingHttpClient, ABC):
                 results.extend(self.list_contents(entry.path, depth - 1))
         return results
 
-    def _filter_files(self, filter_fn) -> list[RepositoryItem]:
-        files = self.list_contents()
-        return [f for f in files if not f.is_dir and filter_fn(f)]
+    def get_tree_index(self) -> dict[str, list[RepositoryItem]]:
+        """Returns the path index: directory path ("" = root) -> immediate entries.
 
-    def _discover_files_by_prefix(self, prefix: str) -> list[RepositoryItem]:
-        """Helper method to discover files matching a given name prefix (case-insensitive)."""
-        return self._filter_files(lambda f: f.name.lower().startswith(prefix))
+        Built on first use from `list_tree`, or from a `list_directory` walk
+        down to `tree_depth` when the platform offers no complete listing.
+        """
+        input_tracking.record_tree(self.state)
+        if self._tree_index is None:
+            with self._tree_lock, input_tracking.untracked():
+                if self._tree_index is None:
+                    index = self._build_tree_index()
+                    self._tree_entries = {entry.path: entry for entries in index.values() for entry in entries}
+                    self._tree_index = index
+        return self._tree_index
+
+    def get_tree_entry(self, path: str) -> RepositoryItem | None:
+        """Returns the default-branch tree entry of `path` (building the tree index if needed), or None."""
+        self.get_tree_index()
+        return self._tree_entry(path)
+
+    def _build_tree_index(self) -> dict[str, list[RepositoryItem]]:
+        snapshot = self.get_snapshot()
+        if snapshot is not None:
+            entries = [
+                SnapshotRepositoryItem({"path": entry.path, "type": "tree" if entry.is_dir else "blob", "size": entry.size})
+                for entry in snapshot.entries()
+            ]
+        else:
+            try:
+                entries = self.list_tree()
+            except (requests.exceptions.RequestException, FetchError, ValueError):
+                entries = None
+
+        index: dict[str, list[RepositoryItem]] = {}
+        if entries is not None:
+            index[""] = []
+            for entry in entries:
+                if entry.is_dir:
+                    index.setdefault(entry.path, [])
+                index.setdefault(entry.path.rpartition("/")[0], []).append(entry)
+            self._tree_complete = True
+            return index
+
+        pending = [("", self.tree_depth)]
+        while pending:
+            path, depth = pending.pop()
+            try:
+                children = self.list_directory(path)
+            except FileNotFoundOnPlatformError:
+                children = []
+            index[path] = children
+            if depth > 1:
+                pending.extend((child.path, depth - 1) for child in children if child.is_dir)
+        return index
+
+    def _list_children(self, path: str) -> list[RepositoryItem]:
+        """Immediate entries of `path`, listed live only if the index does not cover it."""
+        index = self.get_tree_index()
+        if path in index:
+            return index[path]
+        if self._tree_complete:
+            return []
+        try:
+            with input_tracking.untracked():
+                return self.list_directory(path)
+        except FileNotFoundOnPlatformError:
+            return []
 
-    def _discover_files_by_postfix(self, postfix: str) -> list[RepositoryItem]:
-        """Helper method to discover files matching a given name postfix (case-insensitive)."""
-        return self._filter_files(lambda f: f.name.lower().endswith(postfix))
+    def get_repository_index(self) -> RepositoryIndex:
+        """Returns the classified index over `list_contents()`, built once per client."""
+        input_tracking.record_tree(self.state)
+        if self._repository_index is None:
+            with self._tree_lock:
+                if self._repository_index is None:
+                    self._repository_index = RepositoryIndex(self.list_contents())
+        return self._repository_index
 
     def discover_readme_candidates(self) -> list[RepositoryItem]:
         """Finds files in the repository whose names suggest they are README files."""
-        return self._discover_files_by_prefix("readme")
+        return self.get_repository_index().by_category(repository_index.README)
 
     def discover_license_candidates(self) -> list[RepositoryItem]:
         """Finds files in the repository whose names suggest they are license files."""
-        return self._discover_files_by_prefix("license")
+        return self.get_repository_index().by_category(repository_index.LICENSE)
 
     def discover_citation_candidates(self) -> list[RepositoryItem]:
         """Finds files in the repository whose names suggest they are citation files."""
-        return self._discover_files_by_prefix("citation")
+        return self.get_repository_index().by_category(repository_index.CITATION)
 
     def discover_changelog_candidates(self) -> list[RepositoryItem]:
         """Finds files in the repository whose names suggest they are changelog files."""
-        return self._discover_files_by_prefix("changelog")
+        return self.get_repository_index().by_category(repository_index.CHANGELOG)
+
+    def discover_bibtex_candidates(self) -> list[RepositoryItem]:
+        """Finds BibTeX (.bib) files in the repository."""
+        return self.get_repository_index().by_category(repository_index.BIBTEX)
+
+    def prefetch_files(self, paths: list[str]) -> None:
+        """Loads default-branch `paths` into the file cache with as few requests as possible."""
+        if self.get_snapshot() is not None:
+            return
+        pending = []
+        for path in dict.fromkeys(paths):
+            if (path, None) in self._file_cache or path in self._missing_files:
+                continue
+            served = self._skipped_file(path) or self._cached_blob_file(path)
+            if served is not None:
+                self._file_cache.setdefault((path, None), served)
+            else:
+                pending.append(path)
+        if len(pending) < 2:
+            return
+        try:
+            with input_tracking.untracked():
+                fetched = self._fetch_files(pending)
+        except (requests.exceptions.RequestException, FetchError, ValueError):
+            return
+        for path, file in fetched.items():
+            if file is None:
+                self._missing_files.add(path)
+            else:
+                self._store_blob(path, file)
+                self._file_cache.setdefault((path, None), file)
+
+    def prefetch_candidate_files(self) -> None:
+        """Fetches all README/LICENSE/CITATION/... candidates in one batch, once per client."""
+        if self._candidates_prefetched:
+            return
+        with self._prefetch_lock:
+            if not self._candidates_prefetched:
+                index = self.get_repository_index()
+                self.prefetch_files([
+                    entry.path
+                    for category in PREFETCH_CATEGORIES
+                    for entry in index.by_category(category)
+                ])
+                self._candidates_prefetched = True
 
     def get_multiple_files(self, paths: list[str]) -> list[RepositoryFile]:
+        self.prefetch_files(paths)
         files = []
         for path in paths:
             try:
@@ -319,32 +810,41 @@ class GitPlatformClient(CachingHttpClient, ABC):
 
     def get_readme_candidate_files(self) -> list[RepositoryFile]:
         """Fetches the content of all discovered README candidate files."""
+        self.prefetch_candidate_files()
         candidates = self.discover_readme_candidates()
         return self.get_multiple_files([c.path for c in candidates])
 
     def get_license_candidate_files(self) -> list[RepositoryFile]:
         """Fetches the content of all discovered license candidate files."""
+        self.prefetch_candidate_files()
         candidates = self.discover_license_candidates()
         return self.get_multiple_files([c.path for c in candidates])
 
     def get_citation_candidate_files(self) -> list[RepositoryFile]:
         """Fetches the content of all discovered citation candidate files."""
+        self.prefetch_candidate_files()
         candidates = self.discover_citation_candidates()
         return self.get_multiple_files([c.path for c in candidates])
 
     def get_changelog_candidate_files(self) -> list[RepositoryFile]:
         """Fetches the content of all discovered changelog candidate files."""
+        self.prefetch_candidate_files()
         candidates = self.discover_changelog_candidates()
         return self.get_multiple_files([c.path for c in candidates])
 
     def get_bibtex_candidate_files(self) -> list[RepositoryFile]:
-            """Fetches the content of all discovered changelog candidate files."""
-            candidates = self._discover_files_by_postfix(".bib")
-            return self.get_multiple_files([c.path for c in candidates])
+        """Fetches the content of all discovered BibTeX candidate files."""
+        self.prefetch_candidate_files()
+        candidates = self.discover_bibtex_candidates()
+        return self.get_multiple_files([c.path for c in candidates])
+
+    # The helpers below memoize parsing only: they go through the candidate
+    # getters on every call (cheap once fetched), so each calling step's file
+    # reads are recorded for input tracking.
 
     def get_parsed_citations(self) -> list[dict]:
+        citation_files = self.get_citation_candidate_files()
         if self._parsed_citations is None:
-            citation_files = self.get_citation_candidate_files()
             parsed = []
             for file in citation_files:
                 content = file.get_content()
@@ -360,9 +860,9 @@ class GitPlatformClient(CachingHttpClient, ABC):
         return self._parsed_citations
     
     def get_dois_from_readmes(self) -> set[str]:
+        readmes = self.get_readme_candidate_files()
         if self._dois_from_readme is None:
             result = set()
-            readmes = self.get_readme_candidate_files()
             for readme in readmes:
                 content = readme.get_content()
                 if content:
@@ -371,8 +871,8 @@ class GitPlatformClient(CachingHttpClient, ABC):
         return self._dois_from_readme
     
     def get_dois_from_parsed_citaitons(self) -> set[str]:
+        citations = self.get_parsed_citations()
         if self._dois_from_citation is None:
-            citations = self.get_parsed_citations()
             identifiers = set()
             for cff in citations:
                 for cffIdentifier in cff.get("identifiers", []):
@@ -387,14 +887,25 @@ class GitPlatformClient(CachingHttpClient, ABC):
         return self._dois_from_citation
 
     def get_parsed_bibtex(self) -> list[dict]:
+        filesA = {f.name: f for f in self.get_bibtex_candidate_files()}
+        filesB = {f.name: f for f in self.get_readme_candidate_files()}
         if self._parsed_bibtex is None:
             result = []
-            filesA = {f.name: f for f in self.get_bibtex_candidate_files()}
-            filesB = {f.name: f for f in self.get_readme_candidate_files()}
             filesA.update(filesB)
             files = filesA.values()
             for readme in files:
                 for item in parse_bibtex(readme.get_content()):
                     result.append(item)
             self._parsed_bibtex = result
-        return self._parsed_bibtex
\ No newline at end of file
+        return self._parsed_bibtex
+
+
+def configure_repository_tree(depth: int, max_pages: int) -> None:
+    """Sets the default `list_contents` depth and the page budget of bulk tree listings."""
+    GitPlatformClient.tree_depth = depth
+    GitPlatformClient.tree_max_pages = max_pages
+
+
+def configure_repository_files(max_bytes: int | None) -> None:
+    """Sets the size above which files are neither downloaded (when the tree reports it) nor decoded; None or 0: no limit."""
+    RepositoryFile.max_bytes = max_bytes or None
@@ -41,19 +41,19 @@ class GitPlatformCodemetaExtractor(GitPlatformBaseExtractor):
     def _get_codemeta(self, client):
         """Fetches and parses codemeta.json from repo root, if it exists."""
         try:
-            files = client.list_contents()
+            client.prefetch_candidate_files()
+            files = client.get_repository_index().by_name("codemeta.json")
         except Exception:
             return None
 
         for file in files:
-            if file.name.lower() == "codemeta.json":
-                try:
-                    file_obj = client.get_file(file.path)
-                    content = file_obj.get_content()
-                    if content:
-                        return json.loads(content)
-                except (json.JSONDecodeError, Exception):
-                    return None
+            try:
+                file_obj = client.get_file(file.path)
+                content = file_obj.get_content()
+                if content:
+                    return json.loads(content)
+            except (json.JSONDecodeError, Exception):
+                return None
         return None
 
     @staticmethod
@@ -0,0 +1,12 @@
+"""
+Content hashes shared by the caches and input tracking.
+"""
+
+import hashlib
+
+
+def git_blob_sha(content: bytes) -> str:
+    """The SHA git assigns to a blob with `content` (what tree listings report)."""
+    digest = hashlib.sha1(b"blob %d\0" % len(content))
+    digest.update(content)
+    return digest.hexdigest()
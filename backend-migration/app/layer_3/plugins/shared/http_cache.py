@@ -0,0 +1,271 @@
+"""
+Persistent HTTP response cache shared by all `CachingHttpClient` instances.
+
+`CachingHttpClient` keeps a per-instance dict that lives only as long as one
+`ExtractionState`. The backends in this module sit *behind* that dict and
+survive across extractions (and across processes when file-backed), so a
+re-harvest of the same repository does not re-download identical platform
+API payloads.
+
+Entries are keyed by method + URL + params + auth scope, expire according to
+a per-endpoint-class TTL policy, and are evicted least-recently-used once the
+configured entry count or byte budget is exceeded. Expired entries are not
+dropped on read: `CachingHttpClient` revalidates them with their stored
+`ETag` / `Last-Modified` and keeps serving the stored body on a 304.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class CachedHttpEntry:
+    """A stored HTTP response: enough to rebuild a response object later."""
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    stored_at: float
+    expires_at: float
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) < self.expires_at
+
+
+class HttpCacheTtlPolicy:
+    """Maps request URLs to a time-to-live (in seconds) by endpoint class.
+
+    Rules are `(regex, ttl)` pairs checked in order; the first rule whose
+    pattern matches the URL wins, otherwise `default_ttl` is used.
+    """
+
+    DEFAULT_RULES: tuple[tuple[str, int], ...] = (
+        # trees / files addressed by a full commit SHA (see `GitPlatformClient.get_revision`) never change
+        (r"(/|ref=)[0-9a-f]{40}(/|$|\?|&)", 30 * 24 * 3600),
+        # file contents / trees only change with a new commit
+        (r"/(contents|repository/files|repository/tree|git/trees)(/|$|\?)", 24 * 3600),
+        (r"^https://raw\.githubusercontent\.com/", 24 * 3600),
+        # the latest commit decides whether a stored extraction result is still valid: always revalidate
+        (r"/(repository/)?commits(/|$|\?)", 0),
+        (r"/(releases|tags|repository/tags)(/|$|\?)", 6 * 3600),
+        (r"/(languages|contributors|repository/contributors)(/|$|\?)", 6 * 3600),
+        # external services: works and archive snapshots are effectively immutable
+        (r"^https://api\.openalex\.org/", 7 * 24 * 3600),
+        (r"^https://(web\.archive\.org|archive\.softwareheritage\.org)/", 24 * 3600),
+    )
+
+    def __init__(self, rules: tuple[tuple[str, int], ...] | None = None, default_ttl: int = 3600):
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in (rules if rules is not None else self.DEFAULT_RULES)]
+        self.default_ttl = default_ttl
+
+    def ttl_for(self, url: str) -> int:
+        for pattern, ttl in self.rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+
+def auth_scope(headers: dict | None) -> str:
+    """Returns a non-reversible scope identifier for the credentials in `headers`.
+
+    Responses fetched with one token must never be served to a request made
+    with a different (or no) token, since private repositories differ per user.
+    """
+    authorization = (headers or {}).get("Authorization")
+    if not authorization:
+        return "anonymous"
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:16]
+
+
+def build_cache_key(method: str, url: str, params: dict | None, scope: str) -> str:
+    """Builds a stable cache key from method, URL, params and auth scope."""
+    normalized_params = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    raw = json.dumps([method.upper(), url, normalized_params, scope], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class HttpCacheBackend(ABC):
+    """Storage contract for persistent HTTP response caches."""
+
+    def __init__(self, ttl_policy: HttpCacheTtlPolicy | None = None):
+        self.ttl_policy = ttl_policy or HttpCacheTtlPolicy()
+
+    @abstractmethod
+    def get(self, key: str) -> CachedHttpEntry | None:
+        """Returns the stored entry for `key` (fresh or stale), or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedHttpEntry) -> None:
+        """Stores `entry` under `key`, evicting old entries if needed."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def build_entry(self, url: str, status_code: int, headers: dict[str, str], content: bytes) -> CachedHttpEntry:
+        """Creates an entry for `url` whose expiry follows the TTL policy."""
+        now = time.time()
+        return CachedHttpEntry(
+            url=url,
+            status_code=status_code,
+            headers=dict(headers),
+            content=content,
+            stored_at=now,
+            expires_at=now + self.ttl_policy.ttl_for(url),
+        )
+
+
+class SqliteHttpCacheBackend(HttpCacheBackend):
+    """SQLite-backed response cache with LRU eviction by entry count and total size.
+
+    A single database file may be shared by several processes (e.g. a batch
+    worker pool); SQLite's own file locking serializes writers.
+    """
+
+    # how many writes between two eviction passes (eviction needs an aggregate query)
+    EVICTION_INTERVAL = 64
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 50_000,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_policy: HttpCacheTtlPolicy | None = None,
+    ):
+        super().__init__(ttl_policy)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    key         TEXT PRIMARY KEY,
+                    url         TEXT NOT NULL,
+                    status_code INTEGER NOT NULL,
+                    headers     TEXT NOT NULL,
+                    content     BLOB NOT NULL,
+                    size        INTEGER NOT NULL,
+                    stored_at   REAL NOT NULL,
+                    expires_at  REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS http_cache_last_access ON http_cache (last_access)"
+            )
+
+    def get(self, key: str) -> CachedHttpEntry | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT url, status_code, headers, content, stored_at, expires_at FROM http_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE http_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+        url, status_code, headers, content, stored_at, expires_at = row
+        return CachedHttpEntry(
+            url=url,
+            status_code=status_code,
+            headers=json.loads(headers),
+            content=bytes(content),
+            stored_at=stored_at,
+            expires_at=expires_at,
+        )
+
+    def set(self, key: str, entry: CachedHttpEntry) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO http_cache
+                    (key, url, status_code, headers, content, size, stored_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    entry.url,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    sqlite3.Binary(entry.content),
+                    len(entry.content),
+                    entry.stored_at,
+                    entry.expires_at,
+                    time.time(),
+                ),
+            )
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= self.EVICTION_INTERVAL:
+                self._writes_since_eviction = 0
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM http_cache")
+
+    def evict(self) -> None:
+        """Forces an eviction pass (normally run every `EVICTION_INTERVAL` writes)."""
+        with self._lock, self._connection:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drops least-recently-used entries until both limits hold. Caller holds the lock."""
+        count, total = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._connection.execute(
+            "SELECT key, size FROM http_cache ORDER BY last_access ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._connection.executemany("DELETE FROM http_cache WHERE key = ?", doomed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_http_cache: HttpCacheBackend | None = None
+
+
+def configure_http_cache(backend: HttpCacheBackend | None) -> None:
+    """Installs (or, with None, removes) the process-wide persistent HTTP cache."""
+    global _http_cache
+    _http_cache = backend
+
+
+def get_http_cache() -> HttpCacheBackend | None:
+    """Returns the process-wide persistent HTTP cache, if one is configured."""
+    return _http_cache
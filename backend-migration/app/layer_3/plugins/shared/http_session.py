@@ -0,0 +1,79 @@
+"""
+Process-wide pooled HTTP sessions for `fetchFunction`.
+
+A bare `requests.get` opens (and tears down) a new TCP + TLS connection per
+call. Every `CachingHttpClient` subclass talks to a handful of hosts
+(api.github.com, gitlab.com, api.openalex.org, ...), so one keep-alive
+`requests.Session` per scheme + host is shared across clients, extractions
+and threads instead.
+
+`requests`/urllib3 speak HTTP/1.1 only; keep-alive reuse is what removes the
+per-call handshake here.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpSessionPool:
+    """Hands out one keep-alive `requests.Session` per scheme + host."""
+
+    def __init__(self, pool_maxsize: int = 20):
+        self.pool_maxsize = pool_maxsize
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url: str) -> requests.Session:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc.lower()}"
+        session = self._sessions.get(origin)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(origin)
+                if session is None:
+                    session = self._new_session()
+                    self._sessions[origin] = session
+        return session
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        # retries are handled by fetchFunction itself; the adapter only pools connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_session_pool = HttpSessionPool()
+# fans out independent requests to one host; as many threads as keep-alive connections per host
+_fetch_executor = ThreadPoolExecutor(max_workers=_session_pool.pool_maxsize, thread_name_prefix="http-fetch")
+
+
+def configure_http_sessions(pool_maxsize: int) -> None:
+    """Replaces the process-wide session pool (and fetch executor), closing the previous one's connections."""
+    global _session_pool, _fetch_executor
+    previous, previous_executor = _session_pool, _fetch_executor
+    _session_pool = HttpSessionPool(pool_maxsize=pool_maxsize)
+    _fetch_executor = ThreadPoolExecutor(max_workers=pool_maxsize, thread_name_prefix="http-fetch")
+    previous_executor.shutdown(wait=False)
+    previous.close()
+
+
+def get_session(url: str) -> requests.Session:
+    """Returns the shared pooled session for `url`'s host."""
+    return _session_pool.session_for(url)
+
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """Returns the shared executor for concurrent requests, sized to the per-host connection pool."""
+    return _fetch_executor
@@ -0,0 +1,206 @@
+"""
+Per-step record of the repository and API resources an extraction read.
+
+While a pipeline runs, every step executes with `collecting_step` naming it
+(see `steps.contracts.pipeline.run_step`). The clients report what they
+read on behalf of that step:
+
+- ``file``: a default-branch file (`GitPlatformClient.get_file`), identified
+  by its git blob SHA,
+- ``tree``: the repository listing (candidate discovery, `list_contents`),
+  identified by the set of paths,
+- ``request``: any other API response (`CachingHttpClient._caching_get` /
+  `_caching_post`), identified by a hash of its status and body.
+
+Reads done internally to serve one of these (the file / tree requests
+themselves, batched prefetches) are not recorded separately.
+
+The result cache stores the inputs of every step next to its output. When
+the repository moves to a new commit, `fingerprint` recomputes each input
+against the new revision and only steps with a changed input are run again.
+Files and the tree are read at the new commit SHA; other requests revalidate
+whatever the persistent HTTP cache holds for them, since a fresh entry there
+may still describe the previous commit.
+Tracking is off unless a `StepInputs` has been put into the state with
+`start_tracking`.
+"""
+
+import hashlib
+import importlib
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from app.layer_1.metadata_collector.metadata_collector import collecting_step
+from app.layer_3.plugins.shared.hashing import git_blob_sha
+from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
+
+FILE = "file"
+TREE = "tree"
+REQUEST = "request"
+
+# fingerprints of inputs that could not be read
+MISSING = "missing"
+BINARY = "binary"
+
+_STATE_KEY = "input_tracking.inputs"
+
+_untracked: ContextVar[bool] = ContextVar("input_tracking_untracked", default=False)
+
+
+class StepInputs:
+    """Resources read per step: step name -> {resource: fingerprint or None (computed on demand)}."""
+
+    def __init__(self):
+        self._inputs: dict[str, dict[str, str | None]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, resource: str, fingerprint: str | None = None) -> None:
+        step = collecting_step.get()
+        if step is None or _untracked.get():
+            return
+        with self._lock:
+            inputs = self._inputs.setdefault(step, {})
+            if fingerprint is not None or resource not in inputs:
+                inputs[resource] = fingerprint
+
+    def reuse(self, step: str, inputs: dict[str, str]) -> None:
+        """Takes over the inputs of a step whose previous output is reused instead of running it."""
+        with self._lock:
+            self._inputs[step] = dict(inputs)
+
+    def steps(self) -> dict[str, dict[str, str | None]]:
+        with self._lock:
+            return {step: dict(inputs) for step, inputs in self._inputs.items()}
+
+
+def start_tracking(state: ExtractionState) -> StepInputs:
+    """Enables input tracking for the extraction running on `state`."""
+    return state.data.setdefault(_STATE_KEY, StepInputs())
+
+
+def get_step_inputs(state: ExtractionState) -> StepInputs | None:
+    return state.data.get(_STATE_KEY)
+
+
+@contextmanager
+def untracked() -> Iterator[None]:
+    """Suppresses recording, for reads made on behalf of an already recorded resource."""
+    token = _untracked.set(True)
+    try:
+        yield
+    finally:
+        _untracked.reset(token)
+
+
+def _resource(*parts: Any) -> str:
+    return json.dumps(parts, sort_keys=True, separators=(",", ":"))
+
+
+def record_file(state: ExtractionState, path: str) -> None:
+    inputs = get_step_inputs(state)
+    if inputs is not None:
+        inputs.record(_resource(FILE, path))
+
+
+def record_tree(state: ExtractionState) -> None:
+    inputs = get_step_inputs(state)
+    if inputs is not None:
+        inputs.record(_resource(TREE))
+
+
+def record_request(client, method: str, url: str, arguments: Any, response=None, error: Exception | None = None) -> None:
+    """Records the response (or failure) of an API request made by `client` (a `CachingHttpClient`)."""
+    inputs = get_step_inputs(client.state)
+    if inputs is None or collecting_step.get() is None or _untracked.get():
+        return
+    client_class = f"{type(client).__module__}:{type(client).__qualname__}"
+    value = f"error:{type(error).__name__}" if error is not None else response_fingerprint(response)
+    inputs.record(_resource(REQUEST, client_class, method, url, arguments), value)
+
+
+def response_fingerprint(response) -> str:
+    digest = hashlib.sha256(str(response.status_code).encode("ascii"))
+    digest.update(response.content or b"")
+    return digest.hexdigest()
+
+
+def _platform_client(context: ExtractionContext, state: ExtractionState):
+    # imported here: the platform clients pull in every platform package
+    from app.layer_3.plugins.platform_clients import get_platform_client
+
+    return get_platform_client(context, state)
+
+
+def _file_fingerprint(client, path: str) -> str:
+    from app.layer_3.plugins.shared.git_platform_client import FileNotFoundOnPlatformError
+
+    entry = client.get_tree_entry(path)
+    if entry is not None and entry.blob_sha:
+        return entry.blob_sha
+    try:
+        content = client.get_file(path).get_content()
+    except FileNotFoundOnPlatformError:
+        return MISSING
+    return git_blob_sha(content.encode("utf-8")) if content is not None else BINARY
+
+
+def _tree_fingerprint(client) -> str:
+    paths = sorted(
+        entry.path + ("/" if entry.is_dir else "")
+        for entries in client.get_tree_index().values()
+        for entry in entries
+    )
+    return hashlib.sha256("\n".join(paths).encode("utf-8")).hexdigest()
+
+
+def _request_fingerprint(context: ExtractionContext, state: ExtractionState, client_class: str, method: str, url: str, arguments) -> str:
+    module_name, _, qualname = client_class.partition(":")
+    cls: Any = importlib.import_module(module_name)
+    for attribute in qualname.split("."):
+        cls = getattr(cls, attribute)
+    client = cls.get_or_create(context, state)
+    # persisted responses may predate the new commit: check them against the API
+    if method == "POST":
+        return response_fingerprint(client._caching_post(url, json.loads(arguments), revalidate=True))
+    return response_fingerprint(client._caching_get(url, params=arguments or None, revalidate=True))
+
+
+def fingerprint(resource: str, context: ExtractionContext, state: ExtractionState) -> str:
+    """Identifies the current version of a recorded resource.
+
+    Reads go through the clients of `state`, so a step run afterwards is
+    served from what was read here.
+    """
+    kind, *parts = json.loads(resource)
+    with untracked():
+        try:
+            if kind == REQUEST:
+                return _request_fingerprint(context, state, *parts)
+            client = _platform_client(context, state)
+            if client is None:
+                return MISSING
+            if kind == FILE:
+                return _file_fingerprint(client, parts[0])
+            if kind == TREE:
+                return _tree_fingerprint(client)
+        except Exception as e:
+            return f"error:{type(e).__name__}"
+    raise ValueError(f"unknown input kind: {kind!r}")
+
+
+def resolve_fingerprints(inputs: StepInputs, context: ExtractionContext, state: ExtractionState) -> dict[str, dict[str, str]]:
+    """Returns the recorded inputs with every not yet known fingerprint computed."""
+    known: dict[str, str] = {}
+    resolved = {}
+    for step, step_inputs in inputs.steps().items():
+        resolved[step] = {}
+        for resource, value in step_inputs.items():
+            if value is None:
+                if resource not in known:
+                    known[resource] = fingerprint(resource, context, state)
+                value = known[resource]
+            resolved[step][resource] = value
+    return resolved
@@ -0,0 +1,94 @@
+"""
+Process-wide license matching on top of scancode.
+
+Loading scancode (and its license index) is the most expensive CPU step of an
+extraction, and most repositories ship one of a handful of identical LICENSE
+texts. `LicenseMatcher` therefore
+
+- imports scancode lazily (plugin discovery and startup do not pay for it),
+- keeps the license index resident once loaded, optionally pre-warmed at
+  startup via `warm_up`,
+- memoizes results by content hash in a bounded LRU, so identical texts are
+  matched once per process.
+
+Texts are matched in memory against the index (`query_string`), and the
+result carries the same keys as scancode's `get_licenses` that extractors read.
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class LicenseMatcher:
+    """Memoizing, in-memory license matcher on top of scancode's license index."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._results: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Imports scancode and loads its license index now instead of on the first match."""
+        from licensedcode.cache import get_index
+        get_index()
+
+    def match(self, text: str) -> dict:
+        """Returns scancode's license detection result for `text`."""
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return copy.deepcopy(result)
+
+        result = self._match_uncached(text)
+
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return copy.deepcopy(result)
+
+    def cache_info(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._results), "max_entries": self.max_entries}
+
+    def _match_uncached(self, text: str) -> dict:
+        from license_expression import combine_expressions
+        from licensedcode.cache import build_spdx_license_expression, get_index
+        from licensedcode.detection import get_percentage_of_license_text
+
+        matches = get_index().match(query_string=text)
+        if not matches:
+            return {
+                "detected_license_expression": None,
+                "detected_license_expression_spdx": None,
+                "percentage_of_license_text": 0,
+            }
+
+        expression = str(combine_expressions([match.rule.license_expression for match in matches]))
+        return {
+            "detected_license_expression": expression,
+            "detected_license_expression_spdx": str(build_spdx_license_expression(expression)),
+            "percentage_of_license_text": get_percentage_of_license_text(
+                query=matches[0].query, matches=matches
+            ),
+        }
+
+
+_license_matcher = LicenseMatcher()
+
+
+def configure_license_matcher(max_entries: int, warm_up: bool = False) -> None:
+    """Replaces the process-wide matcher; with `warm_up` the scancode index is loaded right away."""
+    global _license_matcher
+    _license_matcher = LicenseMatcher(max_entries=max_entries)
+    if warm_up:
+        _license_matcher.warm_up()
+
+
+def get_license_matcher() -> LicenseMatcher:
+    return _license_matcher
@@ -1,3 +1,4 @@
+import threading
 from abc import ABC
 from app.layer_3.steps.contracts.step import ExtractionContext, ExtractionState
 
@@ -5,6 +6,9 @@ class NamedStatefulSingleton(ABC):
 
     name : str = "please.specify.the.name"
 
+    # guards creation so concurrently running steps share one instance per state
+    _creation_lock = threading.RLock()
+
     def __init__(self, context: ExtractionContext, state: ExtractionState):
         self.context = context
         self.state   = state
@@ -12,5 +16,7 @@ class NamedStatefulSingleton(ABC):
     @classmethod
     def get_or_create(cls, context: ExtractionContext, state: ExtractionState) -> "NamedStatefulSingleton":
         if not cls.name in state.data:
-            state.data[cls.name] = cls(context, state)
+            with cls._creation_lock:
+                if not cls.name in state.data:
+                    state.data[cls.name] = cls(context, state)
         return state.data[cls.name]
@@ -0,0 +1,227 @@
+"""
+Rate-limit-aware request scheduling for `fetchFunction`.
+
+GitHub (`X-RateLimit-*`), GitLab (`RateLimit-*`) and most other APIs report
+the remaining request budget and its reset time on every response. A
+`RateLimiter` keeps one budget per host + credentials + API resource (GitHub
+meters REST, GraphQL and search separately) and, before each request,
+
+- lets it through while plenty of budget is left,
+- paces it once the budget drops below `pace_below` of the limit, spreading
+  the remaining requests evenly over the time left until reset,
+- sleeps until the reset once the budget is exhausted (or until a
+  `Retry-After` given by a 403/429 has passed).
+
+`reserve` only computes and books the wait; `fetchFunction` does the
+sleeping, and fails with `RateLimitError` instead of sleeping through waits
+longer than `max_wait`.
+
+`budgets()`, `wait_for()` and `wait_seconds()` expose the current state, so
+batch jobs can hold back new repositories instead of queueing requests that
+would block (see `platform_clients.rate_limit_wait`).
+"""
+
+import email.utils
+import threading
+import time
+from dataclasses import dataclass, replace
+from urllib.parse import urlsplit
+
+from app.layer_3.plugins.shared.http_cache import auth_scope
+
+# reset values below this are delta-seconds (IETF RateLimit draft), above it epoch seconds
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class RateLimitBudget:
+    """Last known request budget of one host / credentials / resource."""
+    host: str
+    scope: str
+    resource: str
+    limit: int | None
+    remaining: int | None
+    reset_at: float | None
+    blocked_until: float = 0.0
+
+    def seconds_until_reset(self, now: float | None = None) -> float:
+        if self.reset_at is None:
+            return 0.0
+        return max(self.reset_at - (now if now is not None else time.time()), 0.0)
+
+    def seconds_until_usable(self, now: float | None = None) -> float:
+        """Seconds until a request may use this budget again: 0 unless it is blocked or exhausted."""
+        now = now if now is not None else time.time()
+        wait = max(self.blocked_until - now, 0.0)
+        if self.remaining is not None and self.remaining <= 0:
+            wait = max(wait, self.seconds_until_reset(now))
+        return wait
+
+
+def resource_of(url: str) -> str:
+    """Returns the separately-metered API resource a URL belongs to."""
+    path = urlsplit(url).path
+    if path.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """Parses a Retry-After header (delta-seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    now = now if now is not None else time.time()
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - now, 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _header(headers, *names: str) -> str | None:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def _int_or_none(value: str | None) -> int | None:
+    try:
+        return int(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_headers(headers, now: float | None = None) -> tuple[int | None, int | None, float | None]:
+    """Returns (limit, remaining, reset_at epoch) from X-RateLimit-* or RateLimit-* headers."""
+    now = now if now is not None else time.time()
+    limit = _int_or_none(_header(headers, "X-RateLimit-Limit", "RateLimit-Limit"))
+    remaining = _int_or_none(_header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining"))
+    reset = _int_or_none(_header(headers, "X-RateLimit-Reset", "RateLimit-Reset"))
+    reset_at = None
+    if reset is not None:
+        reset_at = float(reset) if reset >= _EPOCH_THRESHOLD else now + reset
+    return limit, remaining, reset_at
+
+
+class RateLimiter:
+    """Per host / credentials / resource request budgets, shared by all threads of a process."""
+
+    def __init__(self, pace_below: float = 0.2, max_wait: float = 900.0):
+        self.pace_below = pace_below
+        self.max_wait = max_wait
+        self._budgets: dict[tuple[str, str, str], RateLimitBudget] = {}
+        self._next_slot: dict[tuple[str, str, str], float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str, headers: dict | None) -> tuple[str, str, str]:
+        return (urlsplit(url).netloc.lower(), auth_scope(headers), resource_of(url))
+
+    def reserve(self, url: str, headers: dict | None = None) -> float:
+        """Books the next request to `url` with `headers`; returns how many seconds to wait before sending it."""
+        with self._lock:
+            return self._reserve_slot(self._key(url, headers), time.time())
+
+    def _reserve_slot(self, key: tuple[str, str, str], now: float) -> float:
+        """Returns how long the next request for `key` must wait and books it. Caller holds the lock."""
+        budget = self._budgets.get(key)
+        if budget is None:
+            return 0.0
+        start = max(now, budget.blocked_until)
+        if budget.remaining is not None and budget.reset_at is not None and budget.reset_at > now:
+            if budget.remaining <= 0:
+                # exhausted: everyone waits for the reset; the budget is unknown again until a response arrives
+                start = max(start, budget.reset_at)
+                self._budgets[key] = replace(budget, remaining=None, reset_at=None, blocked_until=start)
+                return start - now
+            if budget.limit and budget.remaining < budget.limit * self.pace_below:
+                interval = (budget.reset_at - now) / budget.remaining
+                start = max(start, self._next_slot.get(key, now))
+                self._next_slot[key] = start + interval
+            # count the request right away so concurrent callers see the reduced budget
+            self._budgets[key] = replace(budget, remaining=budget.remaining - 1)
+        return start - now
+
+    def update(self, url: str, request_headers: dict | None, response) -> None:
+        """Records the budget reported by `response`; a rate-limited 403/429 blocks until its retry time."""
+        key = self._key(url, request_headers)
+        now = time.time()
+        limit, remaining, reset_at = parse_rate_limit_headers(response.headers, now)
+        delay = self.retry_delay(response)
+        if remaining is None and delay is None:
+            return
+        with self._lock:
+            budget = self._budgets.get(key) or RateLimitBudget(*key, limit=None, remaining=None, reset_at=None)
+            if remaining is not None:
+                budget = replace(budget, limit=limit, remaining=remaining, reset_at=reset_at)
+            if delay is not None:
+                budget = replace(budget, blocked_until=max(budget.blocked_until, now + delay))
+            self._budgets[key] = budget
+
+    @staticmethod
+    def retry_delay(response) -> float | None:
+        """For a rate-limited 403/429 response, returns how long to wait before retrying.
+
+        Returns None for any other response, including an ordinary 403 (e.g.
+        a private repository) while budget is left.
+        """
+        if response.status_code not in (403, 429):
+            return None
+        now = time.time()
+        retry_after = parse_retry_after(response.headers.get("Retry-After"), now)
+        if retry_after is not None:
+            return retry_after
+        _, remaining, reset_at = parse_rate_limit_headers(response.headers, now)
+        if remaining == 0 and reset_at is not None:
+            return max(reset_at - now, 0.0)
+        if response.status_code == 429:
+            return 1.0
+        return None
+
+    def budget_for(self, url: str, headers: dict | None = None) -> RateLimitBudget | None:
+        """Returns the last known budget for requests to `url` with `headers`, or None."""
+        with self._lock:
+            return self._budgets.get(self._key(url, headers))
+
+    def budgets(self) -> list[RateLimitBudget]:
+        """Returns the last known budget of every host / credentials / resource seen so far."""
+        with self._lock:
+            return list(self._budgets.values())
+
+    def wait_for(self, url: str, headers: dict | None = None) -> float:
+        """Seconds until a request to `url` with `headers` can go out without waiting for a reset."""
+        budget = self.budget_for(url, headers)
+        return budget.seconds_until_usable() if budget is not None else 0.0
+
+    def wait_seconds(self, host: str | None = None) -> float:
+        """Seconds until every exhausted or blocked budget (of hosts ending in `host`) is usable again.
+
+        This spans all credentials; to know when one particular request can
+        go out, use `wait_for`.
+        """
+        now = time.time()
+        wait = 0.0
+        with self._lock:
+            for budget in self._budgets.values():
+                if host and not budget.host.endswith(host.lower()):
+                    continue
+                wait = max(wait, budget.seconds_until_usable(now))
+        return wait
+
+_rate_limiter = RateLimiter()
+
+
+def configure_rate_limiter(pace_below: float, max_wait: float) -> None:
+    """Replaces the process-wide rate limiter (dropping all known budgets)."""
+    global _rate_limiter
+    _rate_limiter = RateLimiter(pace_below=pace_below, max_wait=max_wait)
+
+
+def get_rate_limiter() -> RateLimiter:
+    return _rate_limiter
@@ -0,0 +1,200 @@
+"""
+Classified index over the entries of a repository tree.
+
+Candidate discovery (README, LICENSE, CITATION, manifests, docs, ...) used to
+re-list the tree and linearly filter it once per helper and per plugin. A
+`RepositoryIndex` classifies every entry in a single pass when it is built and
+then answers lookups by category, by (lower-cased) file name and by extension
+from dicts.
+"""
+
+from collections.abc import Iterable
+
+dependency_files = {
+    # Python
+    "requirements.txt", "pyproject.toml", "setup.py", "setup.cfg",
+    "pipfile", "pipfile.lock", "poetry.lock", "environment.yml",
+    # JavaScript / Node
+    "package.json", "package-lock.json", "yarn.lock", "pnpm-lock.yaml",
+    # Ruby
+    "gemfile", "gemfile.lock",
+    # Rust
+    "cargo.toml", "cargo.lock",
+    # Go
+    "go.mod", "go.sum",
+    # Java / JVM
+    "pom.xml", "build.gradle", "build.gradle.kts", "gradle.lockfile",
+    # PHP
+    "composer.json", "composer.lock",
+    # .NET
+    "packages.config", "*.csproj",
+    # C/C++
+    "conanfile.txt", "conanfile.py", "vcpkg.json",
+    # Other
+    "mix.exs", "mix.lock",  # Elixir
+    "dependencies.yaml",    # Generic
+}
+
+# developer-facing documentation (HACKING.md, CONTRIBUTING.md, ...)
+developer_doc_filenames = {
+    'hacking.md',
+    'hacking.rst',
+    'hacking.txt',
+    'hacking',
+    'developers.md',
+    'developers.rst',
+    'developers.txt',
+    'developers',
+    'developer.md',
+    'developer.rst',
+    'developer.txt',
+    'developer',
+    'contributing.md',
+    'contributing.rst',
+    'contributing.txt',
+    'contributing',
+    'development.md',
+    'development.rst',
+    'development.txt',
+    'development',
+}
+
+# top-level files that indicate documentation
+doc_filenames = {
+    'documentation.md',
+    'documentation.rst',
+    'documentation.txt',
+    'documentation',
+    'docs.md',
+    'docs.rst',
+    'docs.txt',
+    'usage.md',
+    'usage.rst',
+    'usage.txt',
+    'guide.md',
+    'guide.rst',
+    'manual.md',
+    'manual.rst',
+}
+
+# directories whose mere presence strongly suggests documentation
+doc_dirnames = {
+    'docs',
+    'doc',
+    'documentation',
+    'wiki',
+    'guides',
+    'manual',
+}
+
+# config files that indicate a documentation-generator/site is in use
+doc_tool_filenames = {
+    'mkdocs.yml',
+    'mkdocs.yaml',
+    '_config.yml',       # Jekyll
+    'book.toml',         # mdBook
+    'docusaurus.config.js',
+    'docusaurus.config.ts',
+    '.readthedocs.yml',
+    '.readthedocs.yaml',
+    'vuepress.config.js',
+    'nextra.config.js',
+    'typedoc.json',
+    'jsdoc.json',
+    '.jsdoc.json',
+}
+
+README = "readme"
+LICENSE = "license"
+CITATION = "citation"
+CHANGELOG = "changelog"
+BIBTEX = "bib"
+CODEMETA = "codemeta"
+DEPENDENCY = "dependency"
+DEVELOPER_DOCS = "developer_docs"
+DOCS = "docs"
+
+CATEGORIES = (README, LICENSE, CITATION, CHANGELOG, BIBTEX, CODEMETA, DEPENDENCY, DEVELOPER_DOCS, DOCS)
+
+# file categories recognised by name prefix
+_PREFIX_CATEGORIES = ((README, "readme"), (LICENSE, "license"), (CITATION, "citation"), (CHANGELOG, "changelog"))
+
+# "*.csproj" style manifest patterns match on extension, everything else on the exact name
+_DEPENDENCY_NAMES = frozenset(name for name in dependency_files if not name.startswith("*."))
+_DEPENDENCY_EXTENSIONS = frozenset(name[1:] for name in dependency_files if name.startswith("*."))
+
+
+def extension_of(name: str) -> str:
+    """Returns the lower-cased extension of `name` including the dot ("" if none)."""
+    stem, dot, extension = name.lower().rpartition(".")
+    return f".{extension}" if dot and stem else ""
+
+
+def classify(name: str, is_dir: bool) -> list[str]:
+    """Returns the categories an entry called `name` belongs to."""
+    name = name.lower()
+    if is_dir:
+        return [DOCS] if name in doc_dirnames else []
+
+    categories = [category for category, prefix in _PREFIX_CATEGORIES if name.startswith(prefix)]
+    extension = extension_of(name)
+    if extension == ".bib":
+        categories.append(BIBTEX)
+    if name == "codemeta.json":
+        categories.append(CODEMETA)
+    if name in _DEPENDENCY_NAMES or extension in _DEPENDENCY_EXTENSIONS:
+        categories.append(DEPENDENCY)
+    if name in developer_doc_filenames:
+        categories.append(DEVELOPER_DOCS)
+    if name in doc_filenames or name in doc_tool_filenames:
+        categories.append(DOCS)
+    return categories
+
+
+class RepositoryIndex:
+    """Repository entries classified once, with dict lookups by category, name and extension.
+
+    Entries keep their listing order within every lookup. Name and extension
+    lookups only return files.
+    """
+
+    def __init__(self, entries: Iterable):
+        self._entries = list(entries)
+        self._by_path = {}
+        self._by_category: dict[str, list] = {category: [] for category in CATEGORIES}
+        self._by_name: dict[str, list] = {}
+        self._by_extension: dict[str, list] = {}
+
+        for entry in self._entries:
+            self._by_path[entry.path] = entry
+            for category in classify(entry.name, entry.is_dir):
+                self._by_category[category].append(entry)
+            if entry.is_dir:
+                continue
+            name = entry.name.lower()
+            self._by_name.setdefault(name, []).append(entry)
+            extension = extension_of(name)
+            if extension:
+                self._by_extension.setdefault(extension, []).append(entry)
+
+    def entries(self) -> list:
+        return list(self._entries)
+
+    def get(self, path: str):
+        """Returns the entry at `path`, or None."""
+        return self._by_path.get(path)
+
+    def by_category(self, category: str) -> list:
+        """Returns the entries classified as `category` (one of `CATEGORIES`)."""
+        return list(self._by_category.get(category, ()))
+
+    def by_name(self, name: str) -> list:
+        """Returns the files called `name` (case-insensitive), at any depth."""
+        return list(self._by_name.get(name.lower(), ()))
+
+    def by_extension(self, extension: str) -> list:
+        """Returns the files with `extension` (".bib" or "bib", case-insensitive)."""
+        extension = extension.lower()
+        if not extension.startswith("."):
+            extension = f".{extension}"
+        return list(self._by_extension.get(extension, ()))
@@ -0,0 +1,349 @@
+"""
+Local snapshots of a repository's default branch.
+
+Instead of one platform API call per directory and file, a
+`GitPlatformClient` can materialize the repository once — from the archive
+`get_archive_url` points to, or from a `git clone --depth 1` (of a local
+mirror when one exists) — and serve the tree and file contents from it. Both
+are taken at the commit the other reads are pinned to (`get_revision`).
+
+Zip archives are read in place (random access per member); tarballs have no
+random access when compressed, so they are extracted to a temporary
+directory, as are clones. Snapshots own their temporary files and remove them
+on `close()` (or when garbage collected).
+
+Archives are untrusted input: downloads, and the uncompressed size of zip and
+tar members, are capped (see `configure_repository_snapshots`), and tar
+members with absolute or `..` paths, links and special files are never
+extracted.
+
+Enabled process-wide with `configure_repository_snapshots`; repository
+metadata (description, releases, contributors, ...) still comes from the
+platform API.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+import requests
+
+from app.layer_3.plugins.shared.http_session import get_session
+
+ARCHIVE = "archive"
+CLONE = "clone"
+
+_COMMIT_SHA = re.compile(r"[0-9a-f]{40}")
+
+
+class SnapshotError(Exception):
+    """Raised when a repository snapshot cannot be created."""
+    pass
+
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    path: str
+    is_dir: bool
+    size: int | None = None
+
+
+class RepositorySnapshot(ABC):
+    """Read-only view of one repository tree."""
+
+    @abstractmethod
+    def entries(self) -> list[SnapshotEntry]:
+        """Lists every file and directory, parents before their children."""
+        pass
+
+    @abstractmethod
+    def read_bytes(self, path: str) -> bytes | None:
+        """Returns the content of the file at `path`, or None if there is no such file."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class DirectorySnapshot(RepositorySnapshot):
+    """Snapshot backed by a checked-out / extracted directory.
+
+    When `owned` is set the directory is deleted on `close()`.
+    """
+
+    def __init__(self, root: str | Path, owned: tempfile.TemporaryDirectory | None = None):
+        self.root = Path(root)
+        self._owned = owned
+
+    def entries(self) -> list[SnapshotEntry]:
+        result = []
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(name for name in dirnames if name != ".git")
+            relative = Path(directory).relative_to(self.root).as_posix()
+            prefix = "" if relative == "." else f"{relative}/"
+            for name in dirnames:
+                result.append(SnapshotEntry(f"{prefix}{name}", True))
+            for name in sorted(filenames):
+                full_path = Path(directory, name)
+                if full_path.is_file():
+                    result.append(SnapshotEntry(f"{prefix}{name}", False, full_path.stat().st_size))
+        return result
+
+    def read_bytes(self, path: str) -> bytes | None:
+        full_path = (self.root / path).resolve()
+        if self.root.resolve() not in full_path.parents or ".git" in Path(path).parts:
+            return None
+        if not full_path.is_file():
+            return None
+        return full_path.read_bytes()
+
+    def close(self) -> None:
+        if self._owned is not None:
+            self._owned.cleanup()
+            self._owned = None
+
+
+class ZipArchiveSnapshot(RepositorySnapshot):
+    """Snapshot reading members of a zip archive on demand.
+
+    Platform archives wrap the tree in one top-level directory
+    (`repo-main/...`), which is stripped.
+    """
+
+    def __init__(self, archive_path: str | Path, owned: tempfile.TemporaryDirectory | None = None):
+        self._zip = zipfile.ZipFile(archive_path)
+        try:
+            # reads stop at the declared member size, so the declared sizes bound what can be inflated
+            _check_size(sum(info.file_size for info in self._zip.infolist()), f"Uncompressed {archive_path}")
+        except SnapshotError:
+            self._zip.close()
+            raise
+        self._owned = owned
+        self._lock = threading.Lock()
+        names = [info.filename for info in self._zip.infolist()]
+        self._prefix = _common_top_level(names)
+        self._members: dict[str, zipfile.ZipInfo] = {}
+        self._entries: list[SnapshotEntry] = []
+        directories: set[str] = set()
+        for info in self._zip.infolist():
+            path = info.filename[len(self._prefix):].rstrip("/")
+            if not path:
+                continue
+            for parent in _parents(path):
+                if parent not in directories:
+                    directories.add(parent)
+                    self._entries.append(SnapshotEntry(parent, True))
+            if info.is_dir():
+                if path not in directories:
+                    directories.add(path)
+                    self._entries.append(SnapshotEntry(path, True))
+            else:
+                self._members[path] = info
+                self._entries.append(SnapshotEntry(path, False, info.file_size))
+
+    def entries(self) -> list[SnapshotEntry]:
+        return list(self._entries)
+
+    def read_bytes(self, path: str) -> bytes | None:
+        info = self._members.get(path)
+        if info is None:
+            return None
+        # ZipFile shares one file handle between readers
+        with self._lock:
+            return self._zip.read(info)
+
+    def close(self) -> None:
+        self._zip.close()
+        if self._owned is not None:
+            self._owned.cleanup()
+            self._owned = None
+
+
+def _parents(path: str) -> list[str]:
+    """"a/b/c" -> ["a", "a/b"]"""
+    parts = path.split("/")[:-1]
+    return ["/".join(parts[:i + 1]) for i in range(len(parts))]
+
+
+def _common_top_level(names: list[str]) -> str:
+    """Returns "top/" if every name lives below one top-level directory, else ""."""
+    tops = {name.split("/", 1)[0] for name in names if name}
+    if len(tops) != 1:
+        return ""
+    top = f"{tops.pop()}/"
+    return top if all(name.startswith(top) for name in names if name) else ""
+
+
+def _check_size(size: int, what: str) -> None:
+    if _max_archive_bytes and size > _max_archive_bytes:
+        raise SnapshotError(f"{what} exceeds the snapshot size limit of {_max_archive_bytes} bytes")
+
+
+def _extractable_members(tar: tarfile.TarFile, archive_path: Path) -> list[tarfile.TarInfo]:
+    """Returns the files and directories of `tar` to extract.
+
+    Checked here rather than left to the "data" extraction filter, which
+    older Pythons lack: absolute or `..` paths reject the archive; links and
+    special files are left out; the total size must stay within the limit.
+    """
+    members = []
+    total = 0
+    for member in tar.getmembers():
+        path = PurePosixPath(member.name)
+        if path.is_absolute() or ".." in path.parts:
+            raise SnapshotError(f"Unsafe path {member.name!r} in {archive_path}")
+        if not (member.isfile() or member.isdir()):
+            continue
+        total += member.size
+        _check_size(total, f"Uncompressed {archive_path}")
+        members.append(member)
+    return members
+
+
+def open_archive_snapshot(archive_path: str | Path, owned: tempfile.TemporaryDirectory | None = None) -> RepositorySnapshot:
+    """Opens a local zip or tar(.gz/.bz2/.xz) archive as a snapshot."""
+    archive_path = Path(archive_path)
+    if zipfile.is_zipfile(archive_path):
+        try:
+            return ZipArchiveSnapshot(archive_path, owned=owned)
+        except SnapshotError:
+            if owned is not None:
+                owned.cleanup()
+            raise
+    if not tarfile.is_tarfile(archive_path):
+        raise SnapshotError(f"Not a zip or tar archive: {archive_path}")
+
+    workdir = tempfile.TemporaryDirectory(prefix="repository-snapshot-")
+    try:
+        with tarfile.open(archive_path) as tar:
+            members = _extractable_members(tar, archive_path)
+            # the "data" filter (3.10.12+) also checks what is written, e.g. no files outside the tree
+            safe = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+            tar.extractall(workdir.name, members=members, **safe)
+    except SnapshotError:
+        workdir.cleanup()
+        raise
+    except (tarfile.TarError, OSError) as e:
+        workdir.cleanup()
+        raise SnapshotError(f"Cannot extract {archive_path}") from e
+    finally:
+        if owned is not None:
+            owned.cleanup()
+
+    root = Path(workdir.name)
+    children = list(root.iterdir())
+    if len(children) == 1 and children[0].is_dir():
+        root = children[0]
+    return DirectorySnapshot(root, owned=workdir)
+
+
+def download_archive_snapshot(url: str, headers: dict | None = None, timeout: int = 60) -> RepositorySnapshot:
+    """Downloads the archive at `url` into a temporary file and opens it as a snapshot.
+
+    The download is abandoned as soon as it exceeds the snapshot size limit.
+    """
+    workdir = tempfile.TemporaryDirectory(prefix="repository-archive-")
+    archive_path = Path(workdir.name, "archive")
+    try:
+        with get_session(url).get(url, headers=headers, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            _check_size(int(response.headers.get("Content-Length") or 0), f"Archive {url}")
+            downloaded = 0
+            with open(archive_path, "wb") as target:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    downloaded += len(chunk)
+                    _check_size(downloaded, f"Archive {url}")
+                    target.write(chunk)
+    except SnapshotError:
+        workdir.cleanup()
+        raise
+    except (requests.exceptions.RequestException, OSError, ValueError) as e:
+        workdir.cleanup()
+        raise SnapshotError(f"Cannot download {url}") from e
+    return open_archive_snapshot(archive_path, owned=workdir)
+
+
+def clone_snapshot(source: str, ref: str | None = None, timeout: int = 300) -> RepositorySnapshot:
+    """Shallow-clones `source` (URL, local mirror or bare repository) into a temporary directory.
+
+    `ref` is a branch, or a full commit SHA, which is fetched and checked out
+    on its own (servers allow fetching reachable commits by SHA).
+    """
+    if shutil.which("git") is None:
+        raise SnapshotError("git is not installed")
+    # --depth is ignored for plain local paths; file:// makes git honour it
+    if os.path.isdir(source):
+        source = Path(source).resolve().as_uri()
+
+    workdir = tempfile.TemporaryDirectory(prefix="repository-clone-")
+    if ref and _COMMIT_SHA.fullmatch(ref):
+        commands = [
+            ["git", "init", "--quiet", workdir.name],
+            ["git", "-C", workdir.name, "fetch", "--quiet", "--depth", "1", source, ref],
+            ["git", "-C", workdir.name, "checkout", "--quiet", "FETCH_HEAD"],
+        ]
+    else:
+        command = ["git", "clone", "--quiet", "--depth", "1", "--single-branch"]
+        if ref:
+            command += ["--branch", ref]
+        commands = [command + [source, workdir.name]]
+    try:
+        for command in commands:
+            subprocess.run(
+                command,
+                check=True,
+                capture_output=True,
+                timeout=timeout,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        workdir.cleanup()
+        raise SnapshotError(f"Cannot clone {source}") from e
+    return DirectorySnapshot(workdir.name, owned=workdir)
+
+
+_snapshot_mode: str | None = None
+_mirror_dir: str | None = None
+# bytes an archive may take, downloaded and uncompressed (0 or None: no limit)
+_max_archive_bytes: int | None = 256 * 1024 * 1024
+
+
+def configure_repository_snapshots(
+    mode: str | None,
+    mirror_dir: str | None = None,
+    max_archive_bytes: int | None = 256 * 1024 * 1024,
+) -> None:
+    """Enables snapshots process-wide: mode "archive", "clone", or None (platform API only).
+
+    With `mirror_dir`, "clone" mode clones `<mirror_dir>/<owner>/<name>(.git)`
+    when it exists instead of the platform's clone URL. Archives larger than
+    `max_archive_bytes`, downloaded or uncompressed, are not used.
+    """
+    global _snapshot_mode, _mirror_dir, _max_archive_bytes
+    if mode not in (None, ARCHIVE, CLONE):
+        raise ValueError(f"Unknown repository snapshot mode: {mode}")
+    _snapshot_mode = mode
+    _mirror_dir = mirror_dir
+    _max_archive_bytes = max_archive_bytes
+
+
+def get_snapshot_mode() -> str | None:
+    return _snapshot_mode
+
+
+def find_mirror(owner: str, name: str) -> str | None:
+    """Returns the local mirror of owner/name under the configured mirror directory, if any."""
+    if not _mirror_dir:
+        return None
+    for candidate in (Path(_mirror_dir, owner, f"{name}.git"), Path(_mirror_dir, owner, name)):
+        if candidate.is_dir():
+            return str(candidate)
+    return None
@@ -0,0 +1,299 @@
+"""
+Whole-extraction result cache keyed by repository revision.
+
+An extraction only depends on the repository contents at its default-branch
+HEAD, the schema it is exported to and the plugins that ran. Results are
+therefore stored under
+
+    (canonical repository URL, HEAD commit SHA, schema, schema class,
+     requested fields, plugin set fingerprint, credentials scope)
+
+and a repeat request costs one HEAD lookup (a conditional request once the
+commit listing is in the HTTP cache) instead of the whole pipeline. A new
+commit, schema or plugin version simply misses; old entries age out LRU.
+Trees and files are read at that same commit SHA (see
+`GitPlatformClient.get_revision`), so a miss after a push never re-extracts
+from the previous commit's cached contents.
+
+Both the JSON-LD document and the collected metadata (sources and
+confidences used by the enriched endpoints) are stored, as JSON; an
+extraction whose collected values are not JSON-serializable is not cached.
+Repositories whose HEAD cannot be determined are never cached.
+
+Each entry also keeps the inputs every step read (see `input_tracking`).
+When a repository misses because it moved to a new commit,
+`restore_unchanged` compares those inputs with the new revision, restores
+the collected values of the steps whose inputs are unchanged and leaves only
+the other steps to run.
+"""
+
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from app.layer_1.metadata_collector.metadata_collector import MetadataProperty
+from app.layer_3.plugins.shared import input_tracking
+from app.layer_3.plugins.shared.http_cache import auth_scope
+from app.layer_3.steps.contracts import ExtractionContext, ExtractionPipeline, ExtractionState
+
+# bump when the stored layout or the meaning of a stored result changes
+RESULT_FORMAT_VERSION = 3
+
+# where `load` leaves the key for `save` of the same extraction
+_STATE_KEY = "result_cache.key"
+
+
+def canonical_repo_url(repo_url: str) -> str:
+    """Normalizes a repository URL: lower case, no scheme/www/.git/trailing slash."""
+    parts = urlsplit(repo_url.strip())
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    path = parts.path.strip("/").lower().removesuffix(".git")
+    return f"{host}/{path}"
+
+
+def dump_collected(data: dict[str, list[MetadataProperty]]) -> str:
+    """Serializes collected metadata (`MetadataCollector.data`) as a JSON list of records."""
+    return json.dumps([dataclasses.asdict(record) for records in data.values() for record in records])
+
+
+def load_collected(text: str) -> list[MetadataProperty]:
+    """Rebuilds the records serialized by `dump_collected`."""
+    return [MetadataProperty(**fields) for fields in json.loads(text)]
+
+
+def head_commit_sha(context: ExtractionContext, state: ExtractionState) -> str | None:
+    """Asks the repository's platform for its HEAD commit; None if unknown or unreachable."""
+    # imported here: the platform clients pull in every platform package
+    from app.layer_3.plugins.platform_clients import get_platform_client
+
+    client = get_platform_client(context, state)
+    if client is None:
+        return None
+    try:
+        return client.get_head_commit_sha()
+    except Exception as e:
+        print(f"[result_cache] cannot determine HEAD of {context.repo_url}: {e}")
+        return None
+
+
+class SqliteResultCache:
+    """SQLite store of finished extractions with LRU eviction by entry count.
+
+    Implements the `ResultCache` contract of the extraction use case.
+    """
+
+    # how many writes between two eviction passes
+    EVICTION_INTERVAL = 64
+
+    def __init__(
+        self,
+        path: str | Path,
+        plugin_set_version: Callable[[], str],
+        max_entries: int = 10_000,
+        revision_resolver: Callable[[ExtractionContext, ExtractionState], str | None] = head_commit_sha,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.plugin_set_version = plugin_set_version
+        self.max_entries = max_entries
+        self.revision_resolver = revision_resolver
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(extraction_results)")}
+            if columns and "lineage" not in columns:
+                # written before step inputs were stored: start over
+                self._connection.execute("DROP TABLE extraction_results")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extraction_results (
+                    key         TEXT PRIMARY KEY,
+                    lineage     TEXT NOT NULL,
+                    repo_url    TEXT NOT NULL,
+                    commit_sha  TEXT NOT NULL,
+                    jsonld      TEXT NOT NULL,
+                    collector   TEXT NOT NULL,
+                    inputs      TEXT,
+                    stored_at   REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS extraction_results_last_access ON extraction_results (last_access)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS extraction_results_lineage ON extraction_results (lineage, stored_at)"
+            )
+
+    def _hash_key(self, context: ExtractionContext, commit_sha: str | None) -> str:
+        scope = auth_scope({"Authorization": context.access_token} if context.access_token else None)
+        raw = json.dumps(
+            [
+                RESULT_FORMAT_VERSION,
+                canonical_repo_url(context.repo_url),
+                commit_sha,
+                context.schema.get_schema_name(),
+                context.schema.get_class_name(),
+                sorted(context.fields) if context.fields else None,
+                self.plugin_set_version(),
+                scope,
+            ],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def key_for(self, context: ExtractionContext, commit_sha: str) -> str:
+        return self._hash_key(context, commit_sha)
+
+    def lineage_for(self, context: ExtractionContext) -> str:
+        """Key of everything but the revision: entries of one lineage only differ by commit."""
+        return self._hash_key(context, None)
+
+    def load(self, context: ExtractionContext, state: ExtractionState) -> dict | None:
+        commit_sha = self.revision_resolver(context, state)
+        if not commit_sha:
+            return None
+        key = self.key_for(context, commit_sha)
+        state.data[_STATE_KEY] = (key, commit_sha)
+
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT jsonld, collector FROM extraction_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                input_tracking.start_tracking(state)
+                return None
+            self._connection.execute(
+                "UPDATE extraction_results SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+        jsonld, collected = row
+        if state.metadata_collector is not None:
+            for record in load_collected(collected):
+                state.metadata_collector.add(record)
+        return json.loads(jsonld)
+
+    def restore_unchanged(
+        self, context: ExtractionContext, state: ExtractionState, pipeline: ExtractionPipeline
+    ) -> ExtractionPipeline:
+        """Restores the output of steps whose inputs did not change since the last stored commit.
+
+        Returns the pipeline of the steps that still have to run. Steps
+        without stored inputs (new plugins, or the previous run never
+        reached them) always run.
+        """
+        stored = state.data.get(_STATE_KEY)
+        step_inputs = input_tracking.get_step_inputs(state)
+        if stored is None or step_inputs is None:
+            return pipeline
+        _, commit_sha = stored
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                """
+                SELECT collector, inputs FROM extraction_results
+                WHERE lineage = ? AND commit_sha != ? AND inputs IS NOT NULL
+                ORDER BY stored_at DESC LIMIT 1
+                """,
+                (self.lineage_for(context), commit_sha),
+            ).fetchone()
+        if row is None:
+            return pipeline
+        previous_records, previous_inputs = load_collected(row[0]), json.loads(row[1])
+
+        current: dict[str, str] = {}
+
+        def unchanged(inputs: dict[str, str]) -> bool:
+            for resource, fingerprint in inputs.items():
+                if resource not in current:
+                    current[resource] = input_tracking.fingerprint(resource, context, state)
+                if current[resource] != fingerprint:
+                    return False
+            return True
+
+        reused = set()
+        for step in pipeline.steps:
+            inputs = previous_inputs.get(step.name)
+            if inputs is not None and unchanged(inputs):
+                reused.add(step.name)
+                step_inputs.reuse(step.name, inputs)
+        if not reused:
+            return pipeline
+
+        if state.metadata_collector is not None:
+            for record in previous_records:
+                if record.step in reused:
+                    state.metadata_collector.add(record)
+        print(f"[result_cache] {context.repo_url}: reusing {len(reused)} of {len(pipeline.steps)} steps")
+        return ExtractionPipeline(steps=tuple(step for step in pipeline.steps if step.name not in reused))
+
+    def save(self, context: ExtractionContext, state: ExtractionState, jsonld_document: dict) -> None:
+        stored = state.data.get(_STATE_KEY)
+        if stored is None:
+            return
+        key, commit_sha = stored
+        collector_data = state.metadata_collector.data if state.metadata_collector is not None else {}
+        step_inputs = input_tracking.get_step_inputs(state)
+        try:
+            jsonld = json.dumps(jsonld_document)
+            collected = dump_collected(collector_data)
+            inputs = (
+                json.dumps(input_tracking.resolve_fingerprints(step_inputs, context, state))
+                if step_inputs is not None else None
+            )
+        except (TypeError, ValueError, AttributeError) as e:
+            print(f"[result_cache] not caching {context.repo_url}: {e}")
+            return
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO extraction_results
+                    (key, lineage, repo_url, commit_sha, jsonld, collector, inputs, stored_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    self.lineage_for(context),
+                    canonical_repo_url(context.repo_url),
+                    commit_sha,
+                    jsonld,
+                    collected,
+                    inputs,
+                    now,
+                    now,
+                ),
+            )
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= self.EVICTION_INTERVAL:
+                self._writes_since_eviction = 0
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drops least-recently-used results beyond `max_entries`. Caller holds the lock."""
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM extraction_results").fetchone()
+        if count <= self.max_entries:
+            return
+        self._connection.execute(
+            """
+            DELETE FROM extraction_results WHERE key IN (
+                SELECT key FROM extraction_results ORDER BY last_access ASC LIMIT ?
+            )
+            """,
+            (count - self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM extraction_results")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,89 @@
+"""
+Shared access-token pools for platform API clients.
+
+Without a user token a client used to go anonymous (60 requests/hour on
+GitHub). A `TokenPool` holds the credentials configured for one platform and
+ranks them by the budget the rate limiter last saw for them, so requests go
+out with the token that has the most requests left and move on to the next
+one once it is exhausted. Throughput therefore grows with the number of
+tokens.
+
+A user's own token (`ExtractionContext.access_token`) always wins and is
+never mixed with the pool: it may see private repositories the pool cannot.
+Responses fetched with any pool token are cached under one shared scope
+(`pool:<platform>`), since pool tokens only ever read public data.
+"""
+
+import itertools
+import threading
+import time
+from collections.abc import Callable
+
+from app.layer_3.plugins.shared.rate_limiter import get_rate_limiter
+
+
+class TokenPool:
+    """Credentials of one platform, handed out by remaining rate-limit budget."""
+
+    def __init__(self, platform: str, tokens: list[str]):
+        self.platform = platform
+        self.tokens = list(dict.fromkeys(token for token in tokens if token))
+        # rotates the starting point so tokens with equal budgets take turns
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def cache_scope(self) -> str:
+        return f"pool:{self.platform}"
+
+    def rank(self, url: str, headers_for: Callable[[str], dict]) -> list[str]:
+        """Returns the tokens best-first for a request to `url`.
+
+        Tokens that can be used right away come first, most remaining budget
+        (unknown counts as most) first; exhausted or blocked tokens follow,
+        soonest reset first. `headers_for(token)` builds the request headers
+        the token is sent with.
+        """
+        with self._lock:
+            offset = next(self._turn) % len(self.tokens)
+        rotated = self.tokens[offset:] + self.tokens[:offset]
+        limiter = get_rate_limiter()
+        now = time.time()
+
+        def score(token: str) -> tuple:
+            budget = limiter.budget_for(url, headers_for(token))
+            if budget is None:
+                return (0, 0.0, float("-inf"))
+            wait = budget.seconds_until_usable(now)
+            if wait > 0:
+                return (1, wait, 0.0)
+            remaining = budget.remaining if budget.remaining is not None else float("inf")
+            return (0, 0.0, -remaining)
+
+        return sorted(rotated, key=score)
+
+    def wait_seconds(self, url: str, headers_for: Callable[[str], dict]) -> float:
+        """Seconds until some token can send a request to `url` (the wait of the token `rank` puts first)."""
+        limiter = get_rate_limiter()
+        return min(limiter.wait_for(url, headers_for(token)) for token in self.tokens)
+
+
+_token_pools: dict[str, TokenPool] = {}
+
+
+def configure_token_pools(tokens_by_platform: dict[str, list[str]]) -> None:
+    """Installs the process-wide token pools, e.g. {"github": [...], "gitlab": [...]}."""
+    global _token_pools
+    _token_pools = {
+        platform: TokenPool(platform, tokens)
+        for platform, tokens in tokens_by_platform.items()
+        if any(tokens)
+    }
+
+
+def get_token_pool(platform: str | None) -> TokenPool | None:
+    """Returns the pool configured for `platform`, or None."""
+    return _token_pools.get(platform) if platform else None
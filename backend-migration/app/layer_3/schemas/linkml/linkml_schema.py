@@ -2,8 +2,10 @@ from typing import Any
 
 from linkml_runtime import SchemaView
 from app.layer_1.schemas.base_schema import BaseSchema
+from app.layer_1.schemas.compiled_schema import CompiledSchema
 
 class LinkMlSchema(BaseSchema):
+    """Schema class answered live from a `SchemaView`; `compile` precomputes all answers."""
 
     def __init__(self, schema_view : SchemaView, class_name:str):
         self.schema_view = schema_view
@@ -50,4 +52,18 @@ class LinkMlSchema(BaseSchema):
 
     def get_uri(self, property_name):
         slot = self.schema_view.get_slot(property_name)
-        return self.schema_view.get_uri(slot, expand=True)
\ No newline at end of file
+        return self.schema_view.get_uri(slot, expand=True)
+
+    def compile(self) -> CompiledSchema:
+        """Resolves every property's URI and categories and the `@context` once."""
+        properties = self.get_property_list()
+        slot_names = list(dict.fromkeys([*properties, *self.schema_view.all_slots()]))
+        return CompiledSchema(
+            schema_name=self.get_schema_name(),
+            class_name=self.get_class_name(),
+            properties=tuple(properties),
+            uris={name: self.get_uri(name) for name in slot_names},
+            categories={name: self.get_categories_of(name) for name in slot_names},
+            prefixes=self.get_prefixes(),
+            context=self.build_context(),
+        )
\ No newline at end of file
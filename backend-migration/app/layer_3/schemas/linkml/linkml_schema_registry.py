@@ -1,34 +1,116 @@
-
+import hashlib
+import json
+import os
+import tempfile
+from importlib import metadata
 from pathlib import Path
-from linkml_runtime import SchemaView
 from app.layer_1.schemas.base_schema_registry import BaseSchemaRegistry
-from app.layer_3.schemas.linkml.linkml_schema import LinkMlSchema
+from app.layer_1.schemas.compiled_schema import CompiledSchema
+
+# bump when the snapshot layout or the way descriptors are compiled changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def _linkml_version() -> str:
+    try:
+        return metadata.version("linkml-runtime")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
 
 class LinkMlSchemaRegistry(BaseSchemaRegistry):
-    def __init__(self):
-        self.schemas: dict[str, LinkMlSchema] = {}
+    """Schemas loaded from LinkML YAML files, one compiled descriptor per (schema, class).
+
+    Compilation happens at load time, so extractions never query the `SchemaView`.
+
+    With a `cache_dir`, the compiled descriptors are also written to a JSON
+    snapshot named after a hash of the YAML files' contents. Later loads of
+    unchanged files read that snapshot and neither import LinkML nor build a
+    `SchemaView`; any change to the files selects a new snapshot.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None):
+        self.schemas: dict[str, CompiledSchema] = {}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
 
     def load(self, directory: str | Path) -> list[str]:
         directory = Path(directory)
         if not directory.is_dir():
             raise NotADirectoryError(f"{directory} is not a valid directory")
 
+        paths = sorted(directory.glob("*.yaml"))
+        snapshot_path = self._snapshot_path(paths) if self.cache_dir else None
+        snapshot = self._read_snapshot(snapshot_path) if snapshot_path else None
+        if snapshot is not None:
+            schemas, loaded = snapshot
+        else:
+            schemas, loaded = self._parse(paths)
+            if snapshot_path:
+                self._write_snapshot(snapshot_path, schemas, loaded)
+
+        self.schemas.update(schemas)
+        return loaded
+
+    @staticmethod
+    def _parse(paths: list[Path]) -> tuple[dict[str, CompiledSchema], list[str]]:
+        # imported here: LinkML is only needed when no snapshot can be used
+        from linkml_runtime import SchemaView
+        from app.layer_3.schemas.linkml.linkml_schema import LinkMlSchema
+
+        schemas: dict[str, CompiledSchema] = {}
         loaded = []
-        for path in directory.glob("*.yaml"):
+        for path in paths:
             try:
                 view = SchemaView(str(path))
                 for class_name in view.all_classes():
                     schema_name = view.schema.name
                     name = f"{schema_name.lower()}:{class_name.lower()}"
-                    schema = LinkMlSchema(view, class_name)
-                    self.schemas[name] = schema
+                    schemas[name] = LinkMlSchema(view, class_name).compile()
                 loaded.append(name)
             except Exception as e:
                 print(f"Error loading schema from {path}: {e}")
+        return schemas, loaded
 
-        return loaded
+    def _snapshot_path(self, paths: list[Path]) -> Path:
+        digest = hashlib.sha256(f"{SNAPSHOT_FORMAT_VERSION}:{_linkml_version()}".encode("utf-8"))
+        for path in paths:
+            digest.update(path.name.encode("utf-8") + b"\0")
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        return self.cache_dir / f"schemas-{digest.hexdigest()[:24]}.json"
+
+    @staticmethod
+    def _read_snapshot(path: Path) -> tuple[dict[str, CompiledSchema], list[str]] | None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != SNAPSHOT_FORMAT_VERSION:
+                return None
+            schemas = {name: CompiledSchema.from_dict(schema) for name, schema in data["schemas"].items()}
+            return schemas, list(data["loaded"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring unreadable schema snapshot {path}: {e}")
+            return None
+
+    @staticmethod
+    def _write_snapshot(path: Path, schemas: dict[str, CompiledSchema], loaded: list[str]) -> None:
+        data = {
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "schemas": {name: schema.to_dict() for name, schema in schemas.items()},
+            "loaded": loaded,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # written next to the target and renamed, so concurrent starts never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".schemas-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Cannot write schema snapshot {path}: {e}")
 
-    def get(self, schema_name: str, class_name: str) -> LinkMlSchema:
+    def get(self, schema_name: str, class_name: str) -> CompiledSchema:
         name = f"{schema_name.lower()}:{class_name.lower()}"
         if name not in self.schemas:
             raise KeyError(f"Schema '{name}' not found in registry")
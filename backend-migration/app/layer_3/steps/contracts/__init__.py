@@ -1,11 +1,18 @@
 """Public contracts for modular Layer 3 extraction pipelines."""
 
-from app.layer_3.steps.contracts.pipeline import ExtractionPipeline, ExtractionPipelineRunner
+from app.layer_3.steps.contracts.pipeline import (
+    AsyncExtractionPipelineRunner,
+    ExtractionPipeline,
+    ExtractionPipelineRunner,
+    ParallelExtractionPipelineRunner,
+)
 from app.layer_3.steps.contracts.step import ExtractionStep, ExtractionContext, ExtractionState
 
 __all__ = [
+    "AsyncExtractionPipelineRunner",
     "ExtractionPipeline",
     "ExtractionPipelineRunner",
+    "ParallelExtractionPipelineRunner",
     "ExtractionStep",
     "ExtractionContext",
     "ExtractionState",
@@ -1,6 +1,21 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import groupby
 from traceback import print_exc
 from app.layer_2.contracts.pipeline import ExtractionPipeline
 from app.layer_2.contracts.step import ExtractionContext, ExtractionState
+from app.layer_1.metadata_collector.metadata_collector import collecting_step
+
+
+def run_step(step, context, state):
+    """Runs one step with `collecting_step` set to its name, so what it collects and reads is attributed to it."""
+    token = collecting_step.set(getattr(step, "name", None))
+    try:
+        return step.extract(context, state)
+    finally:
+        collecting_step.reset(token)
+
 
 class ExtractionPipelineRunner:
     """Implements app.layer_2.contracts.pipeline.PipelineRunner (structural typing, no inheritance needed)."""
@@ -8,7 +23,101 @@ class ExtractionPipelineRunner:
         current = state
         for step in pipeline.steps:
             try:
-                current = step.extract(context, current)
+                current = run_step(step, context, current)
             except Exception:
                 print_exc()
-        return current
\ No newline at end of file
+        return current
+
+
+class ParallelExtractionPipelineRunner(ExtractionPipelineRunner):
+    """Runs each priority group of a pipeline concurrently on a thread pool.
+
+    `PluginPipelineComposer` orders steps by descending `priority_level`, so
+    consecutive steps sharing a level form a group. Groups still run one
+    after another (a higher-priority group may produce what a lower one
+    reads); the steps inside a group are independent and mostly wait on the
+    network, so they share one `ExtractionState` and run in parallel. As in
+    the serial runner, the state a step returns is what the next group gets.
+
+    Steps run on `executor` when one is given, otherwise on a pool of
+    `max_workers` threads created on first use and shared by every run; at
+    most `max_workers` steps of one extraction are in flight at a time.
+    """
+
+    def __init__(self, max_workers: int = 8, executor: Executor | None = None):
+        self.max_workers = max_workers
+        self.executor = executor
+        self._own_executor: ThreadPoolExecutor | None = None
+        self._own_executor_lock = threading.Lock()
+
+    @staticmethod
+    def _priority_groups(pipeline):
+        """Yields the consecutive runs of steps sharing one priority level."""
+        for _priority, group in groupby(pipeline.steps, key=lambda step: getattr(step, "priority_level", 100)):
+            yield list(group)
+
+    def _step_executor(self) -> Executor:
+        if self.executor is not None:
+            return self.executor
+        with self._own_executor_lock:
+            if self._own_executor is None:
+                self._own_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extraction")
+            return self._own_executor
+
+    def run(self, pipeline, context, state):
+        current = state
+        for steps in self._priority_groups(pipeline):
+            if len(steps) == 1 or self.max_workers <= 1:
+                current = super().run(ExtractionPipeline(steps=tuple(steps)), context, current)
+            else:
+                current = self._run_group(steps, context, current)
+        return current
+
+    def _run_group(self, steps, context, state):
+        executor = self._step_executor()
+        slots = threading.BoundedSemaphore(self.max_workers)
+        futures = []
+        for step in steps:
+            slots.acquire()
+            future = executor.submit(run_step, step, context, state)
+            future.add_done_callback(lambda _future: slots.release())
+            futures.append(future)
+        current = state
+        for future in futures:
+            try:
+                current = future.result()
+            except Exception:
+                print_exc()
+        return current
+
+
+class AsyncExtractionPipelineRunner(ParallelExtractionPipelineRunner):
+    """Implements app.layer_2.contracts.pipeline.AsyncPipelineRunner.
+
+    Plugins and platform clients are synchronous, so `run_async` never runs a
+    step on the event loop: each step is handed to `executor` (the loop's
+    default executor when None) and awaited. Priority groups keep their
+    order; at most `max_workers` steps of one extraction run at a time, while
+    the executor is shared by every extraction in flight. `run` stays
+    available for synchronous callers.
+    """
+
+    async def run_async(self, pipeline, context, state):
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(max(self.max_workers, 1))
+
+        async def run_in_executor(step, state):
+            async with slots:
+                try:
+                    return True, await loop.run_in_executor(self.executor, run_step, step, context, state)
+                except Exception:
+                    print_exc()
+                    return False, None
+
+        current = state
+        for steps in self._priority_groups(pipeline):
+            group_state = current
+            for succeeded, result in await asyncio.gather(*(run_in_executor(step, group_state) for step in steps)):
+                if succeeded:
+                    current = result
+        return current
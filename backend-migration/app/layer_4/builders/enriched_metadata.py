@@ -2,7 +2,7 @@
 Build enriched_metadata for the API (per-property confidence, source, category).
 Values come from results; this module only shapes annotations for the response.
 """
-from typing import Dict, Any
+from typing import AbstractSet, Dict, Any, Optional
 
 from app.layer_1.schemas.base_schema import BaseSchema
 from app.layer_1.metadata_collector.metadata_collector import MetadataCollector, MetadataProperty
@@ -10,16 +10,20 @@ from app.layer_1.metadata_collector.metadata_collector import MetadataCollector,
 def build_enriched_metadata(
     collector: MetadataCollector,
     schema: BaseSchema,
+    fields: Optional[AbstractSet[str]] = None,
 ) -> Dict[str, Any]:
     """
     Build enriched_metadata for the API response: per-profile, per-property annotations only.
     No value (get that from results); only confidence, source, category.
     - For maSMP: per-profile (SoftwareSourceCode / SoftwareApplication), with category.
     - For CODEMETA: flat \"codemeta\" profile without category.
+    Only `fields` are annotated when given.
     """
    
     result = {}
     for prop in schema.get_property_list():
+        if fields and prop not in fields:
+            continue
         uri = schema.get_uri(prop)
         record = collector.get_most_confident(uri)
         category = schema.get_categories_of(property_name=prop)
@@ -11,15 +11,19 @@ from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import HttpUrl
 
+from app.config.settings import settings
 from app.layer_4.schemas.metadata import (
+    BatchExtractionRequest,
+    BatchJobResponse,
     FairnessResponse,
     MetadataEnrichedResponse,
     MetadataPlainResponse,
     SinglePropertyResponse,
 )
 from app.layer_4.services import fairness_service
+from app.layer_4.services.batch_service import BatchJob, batch_jobs
 from app.layer_4.services.metadata_service import (
-    run_extraction,
+    run_extraction_async,
     run_extraction_with_progress,
     run_single_property_extraction,
 )
@@ -31,6 +35,18 @@ STEP_LABELS = {step_id: label for step_id, label in EXTRACTION_STEPS}
 
 router = APIRouter(prefix="/api", tags=["Metadata"])
 
+FIELDS_DESCRIPTION = (
+    "Optional comma-separated schema properties to extract (e.g. license,name); "
+    "only the plugins extracting them run. Default: all properties."
+)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    """Splits the comma-separated `fields` query parameter; None when absent or empty."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
+
 
 @router.get("/metadata", response_model=MetadataPlainResponse)
 async def extract_metadata_plain(
@@ -47,6 +63,7 @@ async def extract_metadata_plain(
         None,
         description="Optional access token for private repositories",
     ),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ) -> MetadataPlainResponse:
     """
     Extract metadata and return **only** the maSMP/CODEMETA JSON-LD.
@@ -56,11 +73,12 @@ async def extract_metadata_plain(
     """
     try:
 
-        jsonld_document, _ = run_extraction(
+        jsonld_document, _ = await run_extraction_async(
             repo_url=str(repo_url),
-            schema=schema,
+            schema_name=schema,
             access_token=access_token,
             with_enrichment=False,
+            fields=_parse_fields(fields),
         )
 
         return MetadataPlainResponse(
@@ -88,7 +106,8 @@ async def extract_metadata_enriched(
         None,
         description="Optional access token for private repositories",
     ),
-    schema_class:str="SoftwareSourceCode"
+    schema_class:str="SoftwareSourceCode",
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ) -> MetadataEnrichedResponse:
     """
     Extract metadata and return JSON-LD **plus** per-property enrichment.
@@ -98,12 +117,13 @@ async def extract_metadata_enriched(
     """
     try:
 
-        jsonld_document, enriched = run_extraction(
+        jsonld_document, enriched = await run_extraction_async(
             repo_url=str(repo_url),
             schema_name=schema,
             schema_class=schema_class,
             access_token=access_token,
             with_enrichment=True,
+            fields=_parse_fields(fields),
         )
 
         if not enriched:
@@ -139,6 +159,7 @@ async def _stream_metadata_events(
     repo_url: str,
     schema: str,
     access_token: Optional[str],
+    fields: Optional[list[str]] = None,
 ):
     """Async generator that yields SSE events: progress for each step, then enriched result or error."""
     progress_queue = queue.Queue()
@@ -161,6 +182,7 @@ async def _stream_metadata_events(
                 access_token=access_token,
                 with_enrichment=True,
                 progress_callback=progress_callback,
+                fields=fields,
             )
             result_holder.append(("ok", jsonld_document, enriched))
         except Exception as e:
@@ -213,6 +235,7 @@ async def extract_metadata_stream(
         None,
         description="Optional access token for private repositories",
     ),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """
     Extract metadata with live progress, then return enriched result (SSE).
@@ -230,6 +253,7 @@ async def extract_metadata_stream(
             repo_url=str(repo_url),
             schema=schema,
             access_token=access_token,
+            fields=_parse_fields(fields),
         ),
         media_type="text/event-stream",
         headers={
@@ -240,6 +264,90 @@ async def extract_metadata_stream(
     )
 
 
+def _get_batch_job(job_id: str) -> BatchJob:
+    job = batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown batch job: {job_id}")
+    return job
+
+
+@router.post("/metadata/batch", response_model=BatchJobResponse, status_code=202)
+async def submit_batch_extraction(request: BatchExtractionRequest) -> BatchJobResponse:
+    """
+    Start extracting many repositories in the background and return a job handle.
+
+    Repositories are extracted concurrently on a worker pool shared by all batch jobs.
+    Poll GET /metadata/batch/{job_id} for progress and read results from
+    GET /metadata/batch/{job_id}/results as each repository completes.
+    """
+    repo_urls = list(dict.fromkeys(str(url) for url in request.repo_urls))
+    if len(repo_urls) > settings.batch_max_urls:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.batch_max_urls} repositories per batch job.",
+        )
+    try:
+        job = batch_jobs.submit(
+            repo_urls,
+            schema_name=request.schema_,
+            schema_class=request.schema_class,
+            with_enrichment=request.with_enrichment,
+            access_token=request.access_token,
+            fields=request.fields or None,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return BatchJobResponse(**job.snapshot())
+
+
+@router.get("/metadata/batch/{job_id}", response_model=BatchJobResponse)
+async def get_batch_job(job_id: str) -> BatchJobResponse:
+    """Progress of a batch job: total, completed, succeeded and failed repositories."""
+    return BatchJobResponse(**_get_batch_job(job_id).snapshot())
+
+
+async def _stream_batch_ndjson(job: BatchJob):
+    async for record in job.iter_results():
+        yield json.dumps(record) + "\n"
+
+
+async def _stream_batch_sse(job: BatchJob):
+    async for record in job.iter_results():
+        yield _format_sse("result", record)
+    yield _format_sse("done", job.snapshot())
+
+
+@router.get("/metadata/batch/{job_id}/results")
+async def stream_batch_results(
+    job_id: str,
+    format: str = Query(
+        "ndjson",
+        description="ndjson: one JSON result per line; sse: one `result` event per repository, then `done`",
+        enum=["ndjson", "sse"],
+    ),
+):
+    """
+    Stream a batch job's per-repository results in completion order.
+
+    Results already available are sent first; the stream then follows the job
+    and ends when every repository has completed. Each result has code_url,
+    status ("success" or "error"), schema, duration_seconds and either
+    results / enriched_metadata or error.
+    """
+    job = _get_batch_job(job_id)
+    if format == "sse":
+        return StreamingResponse(
+            _stream_batch_sse(job),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+            },
+        )
+    return StreamingResponse(_stream_batch_ndjson(job), media_type="application/x-ndjson")
+
+
 @router.get("/fairness", response_model=FairnessResponse)
 async def get_fairness(
     repo_url: HttpUrl = Query(
@@ -263,7 +371,8 @@ async def get_fairness(
     """
     try:
 
-        jsonld_document, fairness_report = fairness_service.run_fairness_assessment(
+        jsonld_document, fairness_report = await asyncio.to_thread(
+            fairness_service.run_fairness_assessment,
             repo_url=str(repo_url),
             schema=schema,
             access_token=access_token,
@@ -319,9 +428,10 @@ async def extract_single_property(
     """
     try:
 
-        extracted_at, items = run_single_property_extraction(
+        extracted_at, items = await asyncio.to_thread(
+            run_single_property_extraction,
             repo_url=str(repo_url),
-            schema=schema,
+            schema_name=schema,
             access_token=access_token,
             property_name=property_name,
         )
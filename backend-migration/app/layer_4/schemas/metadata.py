@@ -70,3 +70,37 @@ class SinglePropertyResponse(BaseModel):
 
     class Config:
         populate_by_name = True
+
+
+class BatchExtractionRequest(BaseModel):
+    """Request body for POST /metadata/batch."""
+
+    repo_urls: List[HttpUrl] = Field(..., min_length=1, description="Repositories to extract")
+    schema_: str = Field("maSMP", alias="schema", description="Schema to analyze against (maSMP or CODEMETA)")
+    schema_class: str = "SoftwareSourceCode"
+    access_token: Optional[str] = Field(None, description="Optional access token, used for every repository")
+    with_enrichment: bool = False
+    fields: Optional[List[str]] = Field(
+        None,
+        description="Schema properties to extract (e.g. license, name); only their plugins run. Default: all.",
+    )
+
+    class Config:
+        populate_by_name = True
+
+
+class BatchJobResponse(BaseModel):
+    """Response for POST /metadata/batch and GET /metadata/batch/{job_id}: job progress counters."""
+
+    job_id: str
+    status: str = Field(description="queued, running or completed")
+    schema_: str = Field(alias="schema", description="Schema used (maSMP or CODEMETA)")
+    total: int
+    completed: int
+    succeeded: int
+    failed: int
+    created_at: float
+    finished_at: Optional[float] = None
+
+    class Config:
+        populate_by_name = True
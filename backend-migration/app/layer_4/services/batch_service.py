@@ -0,0 +1,363 @@
+"""
+Batch extraction service: runs extractions over many repositories on a
+bounded worker pool and hands out one result per repository as soon as it
+finishes.
+
+- `iter_batch_extraction` backs the `comet-rs batch` CLI subcommand. Startup
+  cost (schema load, plugin discovery) is paid once per process instead of
+  once per repository; with a process pool every worker initializes itself once.
+- `BatchJobRegistry` backs `POST /api/metadata/batch`: jobs run in the
+  background on the API's event loop (through `run_extraction_async`), and
+  clients poll their progress or stream their results.
+"""
+import asyncio
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config.settings import settings
+from app.layer_2.contracts import canonical_platform
+from app.layer_3.plugins.platform_clients import rate_limit_probe
+from app.layer_4.services import metadata_service
+
+
+def read_repo_urls(lines: Iterable[str]) -> List[str]:
+    """Parses repository URLs, one per line; blank lines and `#` comments are skipped, duplicates dropped."""
+    urls: Dict[str, None] = {}
+    for line in lines:
+        url = line.strip()
+        if url and not url.startswith("#"):
+            urls.setdefault(url, None)
+    return list(urls)
+
+
+class BatchCheckpoint:
+    """Append-only file of successfully extracted repository URLs.
+
+    Each URL is flushed and fsynced as soon as it is recorded, so after a
+    crash a rerun with the same checkpoint skips everything already written.
+    Failed repositories are not recorded and are retried on resume.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self) -> set[str]:
+        if not self.path.exists():
+            return set()
+        with open(self.path, encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def record(self, repo_url: str) -> None:
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(repo_url + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _success_record(repo_url: str, schema_name: str, jsonld_document, enriched, started: float) -> Dict[str, Any]:
+    return jsonable_encoder({
+        "code_url": repo_url,
+        "status": "success",
+        "schema": schema_name,
+        "results": jsonld_document,
+        "enriched_metadata": enriched or {},
+        "duration_seconds": round(time.monotonic() - started, 3),
+    })
+
+
+def _error_record(repo_url: str, schema_name: str, error: Exception, started: float) -> Dict[str, Any]:
+    return {
+        "code_url": repo_url,
+        "status": "error",
+        "schema": schema_name,
+        "error": str(error),
+        "duration_seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def extract_one(
+    repo_url: str,
+    schema_name: str,
+    schema_class: str,
+    access_token: Optional[str],
+    with_enrichment: bool,
+) -> Dict[str, Any]:
+    """Extracts one repository and returns a JSON-safe result record (never raises)."""
+    started = time.monotonic()
+    try:
+        jsonld_document, enriched = metadata_service.run_extraction(
+            repo_url=repo_url,
+            schema_name=schema_name,
+            access_token=access_token,
+            with_enrichment=with_enrichment,
+            schema_class=schema_class,
+        )
+    except Exception as e:
+        return _error_record(repo_url, schema_name, e, started)
+    return _success_record(repo_url, schema_name, jsonld_document, enriched, started)
+
+
+async def extract_one_async(
+    repo_url: str,
+    schema_name: str,
+    schema_class: str,
+    access_token: Optional[str],
+    with_enrichment: bool,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Async variant of `extract_one` for use on the API's event loop; `fields` restricts it to those properties."""
+    started = time.monotonic()
+    try:
+        jsonld_document, enriched = await metadata_service.run_extraction_async(
+            repo_url=repo_url,
+            schema_name=schema_name,
+            access_token=access_token,
+            with_enrichment=with_enrichment,
+            schema_class=schema_class,
+            fields=fields,
+        )
+    except Exception as e:
+        return _error_record(repo_url, schema_name, e, started)
+    return _success_record(repo_url, schema_name, jsonld_document, enriched, started)
+
+
+def _create_executor(workers: int, use_processes: bool) -> Executor:
+    if use_processes:
+        # every worker process loads schemas / plugins once
+        return ProcessPoolExecutor(max_workers=workers, initializer=metadata_service.initialize)
+    metadata_service.initialize()
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+
+
+def iter_batch_extraction(
+    repo_urls: Iterable[str],
+    schema_name: str,
+    schema_class: str = "SoftwareSourceCode",
+    with_enrichment: bool = False,
+    workers: int = 4,
+    use_processes: bool = False,
+    access_token_for: Optional[Callable[[str], Optional[str]]] = None,
+    checkpoint: Optional[BatchCheckpoint] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Extracts every repository in `repo_urls` and yields result records in completion order.
+
+    At most `2 * workers` extractions are queued at a time, so arbitrarily
+    long URL lists are streamed rather than submitted up front. Repositories
+    already in `checkpoint` are skipped; successful ones are recorded once the
+    caller has consumed their record.
+    """
+    done = checkpoint.load() if checkpoint else set()
+    pending_urls = (url for url in repo_urls if url not in done)
+    max_in_flight = max(workers, 1) * 2
+
+    with _create_executor(max(workers, 1), use_processes) as executor:
+        in_flight = set()
+
+        def submit_next() -> bool:
+            url = next(pending_urls, None)
+            if url is None:
+                return False
+            token = access_token_for(url) if access_token_for else None
+            in_flight.add(executor.submit(extract_one, url, schema_name, schema_class, token, with_enrichment))
+            return True
+
+        while len(in_flight) < max_in_flight and submit_next():
+            pass
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                in_flight.discard(future)
+                record = future.result()
+                yield record
+                if checkpoint and record["status"] == "success":
+                    checkpoint.record(record["code_url"])
+                submit_next()
+
+
+class BatchJob:
+    """One submitted batch: its repositories, progress counters and results so far.
+
+    Results are appended in completion order; `iter_results` replays them
+    and then follows the job live until it finishes.
+    """
+
+    def __init__(
+        self,
+        repo_urls: List[str],
+        schema_name: str,
+        schema_class: str,
+        with_enrichment: bool,
+        access_token: Optional[str],
+        fields: Optional[List[str]] = None,
+    ):
+        self.job_id = uuid.uuid4().hex
+        self.repo_urls = repo_urls
+        self.schema_name = schema_name
+        self.schema_class = schema_class
+        self.with_enrichment = with_enrichment
+        self.access_token = access_token
+        self.fields = fields
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.results: List[Dict[str, Any]] = []
+        self.succeeded = 0
+        self.failed = 0
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status == "completed"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Progress counters, without results or credentials."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "schema": self.schema_name,
+            "total": len(self.repo_urls),
+            "completed": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    async def add_result(self, record: Dict[str, Any]) -> None:
+        async with self._changed:
+            self.results.append(record)
+            if record["status"] == "success":
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self._changed.notify_all()
+
+    async def finish(self) -> None:
+        async with self._changed:
+            self.status = "completed"
+            self.finished_at = time.time()
+            self.access_token = None
+            self._changed.notify_all()
+
+    async def iter_results(self) -> AsyncIterator[Dict[str, Any]]:
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.results) or self.finished)
+                available = self.results[index:]
+                done = self.finished
+            for record in available:
+                yield record
+            index += len(available)
+            if done and index >= len(self.results):
+                return
+
+
+async def _wait_for_rate_limit(probe: Callable[[], float]) -> None:
+    """Holds back a repository while the API budget its extraction would use is exhausted.
+
+    `probe` (see `platform_clients.rate_limit_probe`) looks at the budget of
+    the job's access token, or of the platform's token pool (usable as soon
+    as any one of its tokens is); it takes locks, so it runs off the event loop.
+    """
+    while (wait := await asyncio.to_thread(probe)) > 0:
+        await asyncio.sleep(min(wait, 60))
+
+
+class BatchJobRegistry:
+    """In-memory registry of batch jobs sharing one bounded pool of extraction slots.
+
+    At most `max_concurrency` repositories are extracted at a time across all
+    jobs; at most `max_jobs` jobs may be unfinished at once; finished jobs are
+    forgotten `ttl_seconds` after completion. A repository is not started
+    while the API budget its extraction would use is exhausted.
+    """
+
+    def __init__(self, max_concurrency: int = 16, max_jobs: int = 100, ttl_seconds: int = 3600):
+        self.max_concurrency = max_concurrency
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, BatchJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def submit(
+        self,
+        repo_urls: List[str],
+        schema_name: str,
+        schema_class: str = "SoftwareSourceCode",
+        with_enrichment: bool = False,
+        access_token: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> BatchJob:
+        """Registers a job and starts it in the background; must be called on the event loop.
+
+        Raises:
+            RuntimeError: if `max_jobs` jobs are still running.
+        """
+        self._forget_expired()
+        running = sum(1 for job in self._jobs.values() if not job.finished)
+        if running >= self.max_jobs:
+            raise RuntimeError(f"Too many batch jobs in progress ({running}); try again later.")
+        job = BatchJob(repo_urls, schema_name, schema_class, with_enrichment, access_token, fields)
+        self._jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        self._forget_expired()
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: BatchJob) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        job.status = "running"
+        pending = iter(job.repo_urls)
+        # one rate-limit probe per platform: the budget does not depend on the repository
+        probes: Dict[str, Callable[[], float]] = {}
+
+        async def worker() -> None:
+            for repo_url in pending:
+                platform = canonical_platform(repo_url)
+                if platform not in probes:
+                    probes[platform] = await asyncio.to_thread(rate_limit_probe, repo_url, job.access_token)
+                await _wait_for_rate_limit(probes[platform])
+                async with self._slots:
+                    record = await extract_one_async(
+                        repo_url,
+                        job.schema_name,
+                        job.schema_class,
+                        job.access_token,
+                        job.with_enrichment,
+                        job.fields,
+                    )
+                await job.add_result(record)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.max_concurrency, len(job.repo_urls)))))
+        finally:
+            await job.finish()
+            self._tasks.pop(job.job_id, None)
+
+    def _forget_expired(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl_seconds:
+                del self._jobs[job_id]
+
+
+batch_jobs = BatchJobRegistry(
+    max_concurrency=settings.batch_max_concurrency,
+    max_jobs=settings.batch_max_jobs,
+    ttl_seconds=settings.batch_job_ttl_seconds,
+)
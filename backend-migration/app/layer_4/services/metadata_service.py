@@ -2,29 +2,105 @@
 Metadata extraction service: wires adapters and use case, runs extraction.
 Single place for composition; endpoints call this instead of building the use case themselves.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any, Callable, List
+from typing import Optional, Dict, Any, Callable, Iterable, List
 
 from app.layer_3.composers.plugin_pipeline_composer import PluginPipelineComposer
 from app.layer_3.builders.jsonld_builder import JSONLDBuilder
 from app.layer_1.metadata_collector.metadata_collector import MetadataCollector
-from app.layer_3.steps.contracts import ExtractionPipelineRunner
+from app.layer_3.steps.contracts import AsyncExtractionPipelineRunner
 from app.layer_2.use_cases.extract_metadata import ExtractMetadataUseCase
 from app.layer_4.builders.enriched_metadata import build_enriched_metadata
 from app.layer_3.schemas.linkml.linkml_schema_registry import LinkMlSchemaRegistry
+from app.layer_3.plugins.shared.http_cache import SqliteHttpCacheBackend, configure_http_cache
+from app.layer_3.plugins.shared.blob_cache import MemoryBlobCache, SqliteBlobCache, configure_blob_cache
+from app.layer_3.plugins.shared.http_session import configure_http_sessions
+from app.layer_3.plugins.shared.rate_limiter import configure_rate_limiter
+from app.layer_3.plugins.shared.token_pool import configure_token_pools
+from app.layer_3.plugins.shared.git_platform_client import configure_repository_files, configure_repository_tree
+from app.layer_3.plugins.shared.repository_snapshot import configure_repository_snapshots
+from app.layer_3.plugins.shared.license_matcher import configure_license_matcher
+from app.layer_3.plugins.shared.result_cache import SqliteResultCache
 from app.config.settings import settings
 
 # Stateless components (created once, reused)
 _jsonld_builder = JSONLDBuilder()
 _pipeline_composer = PluginPipelineComposer()
-_pipeline_runner = ExtractionPipelineRunner()
-_schema_registry = LinkMlSchemaRegistry()
+# blocking plugin work of async extractions runs here, never on the event loop
+_async_executor = ThreadPoolExecutor(
+    max_workers=settings.async_executor_threads,
+    thread_name_prefix="extraction-async",
+)
+_pipeline_runner = AsyncExtractionPipelineRunner(
+    max_workers=settings.pipeline_max_workers,
+    executor=_async_executor,
+)
+_schema_registry = LinkMlSchemaRegistry(cache_dir=settings.schema_cache_dir)
+# finished extractions keyed by repository HEAD commit (see `initialize`)
+_result_cache: Optional[SqliteResultCache] = None
 
 def initialize():
+    global _result_cache
     schema_dir = settings.comet_schemas_path
     if not schema_dir:
         raise RuntimeError("COMET_SCHEMAS_PATH is not configured!")
     _schema_registry.load(schema_dir)
+    configure_http_sessions(pool_maxsize=settings.http_pool_maxsize)
+    configure_rate_limiter(
+        pace_below=settings.rate_limit_pace_below,
+        max_wait=settings.rate_limit_max_wait_seconds,
+    )
+    configure_token_pools({
+        "github": settings.github_tokens,
+        "gitlab": settings.gitlab_tokens,
+        "codeberg": settings.codeberg_tokens,
+    })
+    configure_repository_tree(
+        depth=settings.repository_tree_depth,
+        max_pages=settings.repository_tree_max_pages,
+    )
+    configure_repository_files(max_bytes=settings.repository_file_max_bytes)
+    configure_repository_snapshots(
+        mode=settings.repository_snapshot_mode,
+        mirror_dir=settings.repository_mirror_dir,
+        max_archive_bytes=settings.repository_snapshot_max_bytes,
+    )
+    configure_license_matcher(
+        max_entries=settings.license_match_cache_size,
+        warm_up=settings.license_index_prewarm,
+    )
+    if settings.http_cache_path:
+        configure_http_cache(
+            SqliteHttpCacheBackend(
+                settings.http_cache_path,
+                max_entries=settings.http_cache_max_entries,
+                max_bytes=settings.http_cache_max_bytes,
+            )
+        )
+    if not settings.blob_cache_max_bytes:
+        configure_blob_cache(None)
+    elif settings.blob_cache_path:
+        configure_blob_cache(SqliteBlobCache(settings.blob_cache_path, max_bytes=settings.blob_cache_max_bytes))
+    else:
+        configure_blob_cache(MemoryBlobCache(max_bytes=settings.blob_cache_max_bytes))
+    if settings.result_cache_path:
+        _result_cache = SqliteResultCache(
+            settings.result_cache_path,
+            plugin_set_version=lambda: _pipeline_composer.get_plugin_manager().fingerprint(),
+            max_entries=settings.result_cache_max_entries,
+        )
+
+
+def _resolve_fields(schema, fields: Optional[Iterable[str]]) -> Optional[frozenset[str]]:
+    """Checks requested fields against the schema; None (or empty) means every property."""
+    if not fields:
+        return None
+    requested = frozenset(field.strip() for field in fields if field.strip())
+    unknown = sorted(requested - set(schema.get_property_list()))
+    if unknown:
+        raise ValueError(f"Unknown field(s) for schema {schema.get_schema_name()}: {', '.join(unknown)}")
+    return requested or None
 
 
 def _create_extraction_use_case(
@@ -46,6 +122,7 @@ def _create_extraction_use_case(
         pipeline_composer=_pipeline_composer,
         pipeline_runner=_pipeline_runner,
         extraction_metadata_collector=collector,
+        result_cache=_result_cache,
     )
 
     return use_case, collector
@@ -57,6 +134,7 @@ def run_extraction(
     access_token: Optional[str],
     with_enrichment: bool,
     schema_class: str = "SoftwareSourceCode",
+    fields: Optional[Iterable[str]] = None,
 ) -> tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
     """
     Run metadata extraction once.
@@ -71,14 +149,57 @@ def run_extraction(
     )
 
     schema = _schema_registry.get(schema_name, schema_class)
+    fields = _resolve_fields(schema, fields)
 
-    result = use_case.execute(repo_url=repo_url, schema=schema, access_token=access_token)
+    result = use_case.execute(repo_url=repo_url, schema=schema, access_token=access_token, fields=fields)
     jsonld_document = result.jsonld_document
 
     if with_enrichment:
         enriched = build_enriched_metadata(
             collector,
             schema,
+            fields,
+        )
+        return jsonld_document, enriched
+    return jsonld_document, None
+
+
+async def run_extraction_async(
+    repo_url: str,
+    schema_name: str,
+    access_token: Optional[str],
+    with_enrichment: bool,
+    schema_class: str = "SoftwareSourceCode",
+    fields: Optional[Iterable[str]] = None,
+) -> tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Async variant of `run_extraction` for the API endpoints.
+
+    Plugin steps run on the shared async executor, so the event loop stays
+    free to serve other requests while an extraction waits on the network.
+
+    Returns:
+        (jsonld_document, enriched_metadata or None)
+    """
+    use_case, collector = _create_extraction_use_case(
+        repo_url=repo_url,
+        access_token=access_token,
+        with_enrichment=with_enrichment,
+    )
+
+    schema = _schema_registry.get(schema_name, schema_class)
+    fields = _resolve_fields(schema, fields)
+
+    result = await use_case.execute_async(
+        repo_url=repo_url, schema=schema, access_token=access_token, fields=fields
+    )
+    jsonld_document = result.jsonld_document
+
+    if with_enrichment:
+        enriched = build_enriched_metadata(
+            collector,
+            schema,
+            fields,
         )
         return jsonld_document, enriched
     return jsonld_document, None
@@ -91,6 +212,7 @@ def run_extraction_with_progress(
     with_enrichment: bool,
     progress_callback: Optional[Callable[[str, str], None]] = None,
     schema_class: str = "SoftwareSourceCode",
+    fields: Optional[Iterable[str]] = None,
 ) -> tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
     """
     Run metadata extraction with optional progress callbacks.
@@ -108,12 +230,14 @@ def run_extraction_with_progress(
     )
 
     schema = _schema_registry.get(schema_name, schema_class)
+    fields = _resolve_fields(schema, fields)
 
     result = use_case.execute(
         repo_url=repo_url,
         schema=schema,
         access_token=access_token,
         progress_callback=progress_callback,
+        fields=fields,
     )
     jsonld_document = result.jsonld_document
 
@@ -121,6 +245,7 @@ def run_extraction_with_progress(
         enriched = build_enriched_metadata(
             collector,
             schema,
+            fields,
         )
         return jsonld_document, enriched
     return jsonld_document, None
@@ -135,58 +260,51 @@ def run_single_property_extraction(
 ) -> tuple[str, List[Dict[str, Any]]]:
     """
     Run extraction with enrichment and project down to a single property's
-    value, source, and confidence.
+    value, source, and confidence. Only the plugins extracting the property run.
 
     Returns:
         (extracted_at_iso, [ {profile, value, source, confidence}, ... ])
-    """
-    schema = _schema_registry.get(schema_name, schema_class)
 
-    jsonld_document, enriched = run_extraction(
-        repo_url=repo_url,
-        schema=schema,
-        access_token=access_token,
-        with_enrichment=True,
-        schema_class=schema_class,
-    )
+    Raises:
+        ValueError: if no profile of the schema has such a property.
+    """
+    if schema_name.upper() == "CODEMETA":
+        profiles = [("codemeta", schema_class)]
+    else:
+        # maSMP profiles – property may appear in SoftwareSourceCode and/or SoftwareApplication
+        profiles = [
+            (f"maSMP:{profile_class}", profile_class)
+            for profile_class in ("SoftwareSourceCode", "SoftwareApplication")
+        ]
+    profiles = [
+        (profile_key, profile_class)
+        for profile_key, profile_class in profiles
+        if property_name in _schema_registry.get(schema_name, profile_class).get_property_list()
+    ]
+    if not profiles:
+        raise ValueError(f"Unknown field(s) for schema {schema_name}: {property_name}")
 
-    extracted_at = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
     results: List[Dict[str, Any]] = []
-
-    enriched = enriched or {}
-
-    if schema == "CODEMETA":
-        value = jsonld_document.get(property_name)
-        profile_key = "codemeta"
-        profile_meta = enriched.get(profile_key, {})
-        record = profile_meta.get(property_name, {})
-        results.append(
-            {
-                "profile": profile_key,
-                "value": value,
-                "source": record.get("source"),
-                "confidence": record.get("confidence"),
-            }
+    for profile_key, profile_class in profiles:
+        jsonld_document, enriched = run_extraction(
+            repo_url=repo_url,
+            schema_name=schema_name,
+            access_token=access_token,
+            with_enrichment=True,
+            schema_class=profile_class,
+            fields=[property_name],
         )
-        return extracted_at, results
-
-    # maSMP profiles – property may appear in SoftwareSourceCode and/or SoftwareApplication
-    for profile_key in ("maSMP:SoftwareSourceCode", "maSMP:SoftwareApplication"):
-        profile_data = jsonld_document.get(profile_key)
-        if not isinstance(profile_data, dict):
-            continue
-        if property_name not in profile_data:
+        if property_name not in jsonld_document:
             continue
-        value = profile_data.get(property_name)
-        profile_meta = enriched.get(profile_key, {})
-        record = profile_meta.get(property_name, {})
+        record = (enriched or {}).get(property_name, {})
         results.append(
             {
                 "profile": profile_key,
-                "value": value,
+                "value": jsonld_document.get(property_name),
                 "source": record.get("source"),
                 "confidence": record.get("confidence"),
             }
         )
 
+    extracted_at = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
     return extracted_at, results
@@ -19,18 +19,23 @@ def extract_metadata(
     *,
     token: Optional[str] = None,
     with_enrichment: bool = False,
+    fields: Optional[List[str]] = None,
 ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
     """
     High-level wrapper to extract maSMP/CODEMETA metadata for a repository.
 
+    `fields` restricts the extraction to those schema properties (only
+    their plugins run).
+
     Returns:
         (jsonld_document, enriched_metadata or None)
     """
     return run_extraction(
         repo_url=repo_url,
-        schema=schema,
+        schema_name=schema,
         access_token=token,
         with_enrichment=with_enrichment,
+        fields=fields,
     )
 
 
@@ -53,7 +58,7 @@ def extract_property(
     """
     extracted_at, items = run_single_property_extraction(
         repo_url=repo_url,
-        schema=schema,
+        schema_name=schema,
         access_token=token,
         property_name=property_name,
     )
@@ -0,0 +1,144 @@
+"""
+Tests for AsyncExtractionPipelineRunner.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.layer_1.metadata_collector.metadata_collector import MetadataCollector
+from app.layer_2.use_cases.extract_metadata import ExtractMetadataUseCase
+from app.layer_3.steps.contracts import (
+    AsyncExtractionPipelineRunner,
+    ExtractionContext,
+    ExtractionPipeline,
+    ExtractionState,
+)
+
+
+class _Step:
+    def __init__(self, name: str, priority_level: int, action):
+        self.name = name
+        self.priority_level = priority_level
+        self._action = action
+
+    def extract(self, context, state):
+        self._action(state)
+        return state
+
+
+def _context() -> ExtractionContext:
+    return ExtractionContext(repo_url="https://github.com/o/r", domain="software", schema=None)
+
+
+def test_blocking_steps_do_not_block_the_event_loop():
+    def slow(state):
+        time.sleep(0.3)
+        state.metadata_collector.collect("test", "p", threading.current_thread().name)
+
+    pipeline = ExtractionPipeline(steps=(_Step("a", 100, slow), _Step("b", 100, slow)))
+
+    async def scenario():
+        runner = AsyncExtractionPipelineRunner(max_workers=2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        states = [ExtractionState(metadata_collector=MetadataCollector()) for _ in range(3)]
+        started = time.monotonic()
+        await asyncio.gather(*(runner.run_async(pipeline, _context(), state) for state in states))
+        elapsed = time.monotonic() - started
+        ticking.cancel()
+        return states, ticks, elapsed
+
+    states, ticks, elapsed = asyncio.run(scenario())
+
+    assert all(len(state.metadata_collector.get("p")) == 2 for state in states)
+    # three extractions of two 0.3s steps each overlap instead of taking 1.8s
+    assert elapsed < 1.2
+    # the loop kept running other coroutines in the meantime
+    assert ticks >= 10
+
+
+def test_priority_groups_keep_order_and_failures_do_not_abort():
+    order: list[str] = []
+
+    def record(token):
+        def action(state):
+            order.append(token)
+        return action
+
+    def fail(state):
+        raise RuntimeError("boom")
+
+    pipeline = ExtractionPipeline(
+        steps=(
+            _Step("high", 200, record("high")),
+            _Step("broken", 100, fail),
+            _Step("low", 100, record("low")),
+            _Step("last", 50, record("last")),
+        )
+    )
+    state = ExtractionState(metadata_collector=MetadataCollector())
+
+    result = asyncio.run(AsyncExtractionPipelineRunner(max_workers=4).run_async(pipeline, _context(), state))
+
+    assert result is state
+    assert order == ["high", "low", "last"]
+
+
+def test_state_returned_by_a_step_is_passed_to_later_groups():
+    replacement = ExtractionState(metadata_collector=MetadataCollector())
+    seen: list[ExtractionState] = []
+
+    class _Replacing(_Step):
+        def extract(self, context, state):
+            return replacement
+
+    pipeline = ExtractionPipeline(steps=(_Replacing("high", 200, None), _Step("low", 100, seen.append)))
+
+    result = asyncio.run(
+        AsyncExtractionPipelineRunner(max_workers=4).run_async(
+            pipeline, _context(), ExtractionState(metadata_collector=MetadataCollector())
+        )
+    )
+
+    assert result is replacement
+    assert seen == [replacement]
+
+
+def test_use_case_composes_the_pipeline_on_the_runner_executor():
+    threads: dict[str, str] = {}
+
+    class Composer:
+        def compose(self, context):
+            threads["compose"] = threading.current_thread().name
+            return ExtractionPipeline(steps=(_Step("step", 100, lambda state: threads.setdefault("step", threading.current_thread().name)),))
+
+    class Schema:
+        def get_schema_name(self):
+            return "maSMP"
+
+        def get_class_name(self):
+            return "SoftwareSourceCode"
+
+    class Builder:
+        def build_jsonld(self, metadata, schema):
+            return {}
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="shared-executor") as executor:
+        use_case = ExtractMetadataUseCase(
+            jsonld_builder=Builder(),
+            pipeline_composer=Composer(),
+            pipeline_runner=AsyncExtractionPipelineRunner(executor=executor),
+            extraction_metadata_collector=MetadataCollector(),
+        )
+        asyncio.run(use_case.execute_async("https://github.com/o/r", Schema()))
+
+    assert threads["compose"].startswith("shared-executor")
+    assert threads["step"].startswith("shared-executor")
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.layer_4.services import batch_service, metadata_service
+from app.main import app
+
+
+def _fake_extraction(monkeypatch, calls):
+    async def fake_run_extraction_async(
+        repo_url, schema_name, access_token=None, with_enrichment=False, schema_class="SoftwareSourceCode", fields=None
+    ):
+        calls.append((repo_url, schema_name, access_token, with_enrichment, fields))
+        await asyncio.sleep(0.01)
+        if "broken" in repo_url:
+            raise ValueError("Unsupported repository")
+        return {"name": repo_url.rsplit("/", 1)[-1]}, None
+
+    monkeypatch.setattr(metadata_service, "run_extraction_async", fake_run_extraction_async)
+    monkeypatch.setattr(batch_service, "batch_jobs", batch_service.BatchJobRegistry(max_concurrency=2))
+    monkeypatch.setattr("app.layer_4.endpoints.metadata.batch_jobs", batch_service.batch_jobs)
+
+
+def test_batch_job_streams_ndjson_results_and_reports_progress(monkeypatch):
+    calls = []
+    _fake_extraction(monkeypatch, calls)
+    urls = [
+        "https://github.com/org/one",
+        "https://github.com/org/broken",
+        "https://github.com/org/two",
+    ]
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/metadata/batch",
+            json={"repo_urls": urls, "schema": "CODEMETA", "access_token": "secret", "fields": ["name"]},
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["total"] == 3
+        assert job["schema"] == "CODEMETA"
+
+        stream = client.get(f"/api/metadata/batch/{job['job_id']}/results")
+        assert stream.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in stream.text.splitlines()]
+
+        status = client.get(f"/api/metadata/batch/{job['job_id']}").json()
+
+    assert sorted(record["code_url"] for record in records) == sorted(urls)
+    by_url = {record["code_url"]: record for record in records}
+    assert by_url["https://github.com/org/one"]["results"] == {"name": "one"}
+    assert by_url["https://github.com/org/broken"]["status"] == "error"
+    assert "Unsupported repository" in by_url["https://github.com/org/broken"]["error"]
+    assert status["status"] == "completed"
+    assert (status["completed"], status["succeeded"], status["failed"]) == (3, 2, 1)
+    assert {call[2] for call in calls} == {"secret"}
+    assert {tuple(call[4]) for call in calls} == {("name",)}
+
+
+def test_batch_results_as_sse_end_with_done_event(monkeypatch):
+    _fake_extraction(monkeypatch, [])
+
+    with TestClient(app) as client:
+        job = client.post("/api/metadata/batch", json={"repo_urls": ["https://github.com/org/one"]}).json()
+        stream = client.get(f"/api/metadata/batch/{job['job_id']}/results", params={"format": "sse"})
+
+    events = [block.split("\n")[0] for block in stream.text.strip().split("\n\n")]
+    assert events == ["event: result", "event: done"]
+
+
+def test_unknown_batch_job_is_404():
+    with TestClient(app) as client:
+        assert client.get("/api/metadata/batch/missing").status_code == 404
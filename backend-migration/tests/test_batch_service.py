@@ -0,0 +1,95 @@
+"""
+Tests for the batch extraction service behind `comet-rs batch`.
+"""
+import asyncio
+import threading
+
+from app.layer_4.services import batch_service, metadata_service
+from app.layer_4.services.batch_service import BatchCheckpoint, iter_batch_extraction, read_repo_urls
+
+
+def _fake_services(monkeypatch, failing=()):
+    calls: list[tuple] = []
+
+    def fake_run_extraction(*, repo_url, schema_name, access_token, with_enrichment, schema_class):
+        calls.append((repo_url, access_token))
+        if repo_url in failing:
+            raise ValueError("boom")
+        return {"name": repo_url.rsplit("/", 1)[-1]}, None
+
+    monkeypatch.setattr(metadata_service, "run_extraction", fake_run_extraction)
+    monkeypatch.setattr(metadata_service, "initialize", lambda: None)
+    return calls
+
+
+def test_read_repo_urls_skips_comments_blanks_and_duplicates():
+    lines = ["https://github.com/o/a\n", "\n", "# comment\n", "  https://github.com/o/b  \n", "https://github.com/o/a\n"]
+    assert read_repo_urls(lines) == ["https://github.com/o/a", "https://github.com/o/b"]
+
+
+def test_batch_yields_one_record_per_repository(monkeypatch):
+    calls = _fake_services(monkeypatch, failing={"https://github.com/o/bad"})
+    urls = [f"https://github.com/o/r{i}" for i in range(10)] + ["https://github.com/o/bad"]
+
+    records = list(iter_batch_extraction(urls, "maSMP", workers=3, access_token_for=lambda url: "t"))
+
+    by_url = {record["code_url"]: record for record in records}
+    assert set(by_url) == set(urls)
+    assert by_url["https://github.com/o/r3"]["results"] == {"name": "r3"}
+    assert by_url["https://github.com/o/bad"] == {**by_url["https://github.com/o/bad"], "status": "error", "error": "boom"}
+    assert {token for _, token in calls} == {"t"}
+
+
+def test_checkpoint_resumes_and_retries_failures(monkeypatch, tmp_path):
+    calls = _fake_services(monkeypatch, failing={"https://github.com/o/bad"})
+    checkpoint = BatchCheckpoint(tmp_path / "done.txt")
+    urls = ["https://github.com/o/a", "https://github.com/o/bad", "https://github.com/o/b"]
+
+    list(iter_batch_extraction(urls, "maSMP", workers=2, checkpoint=checkpoint))
+    assert checkpoint.load() == {"https://github.com/o/a", "https://github.com/o/b"}
+
+    calls.clear()
+    list(iter_batch_extraction(urls, "maSMP", workers=2, checkpoint=checkpoint))
+    assert [url for url, _ in calls] == ["https://github.com/o/bad"]
+
+
+def test_crash_before_a_record_is_consumed_does_not_checkpoint_it(monkeypatch, tmp_path):
+    _fake_services(monkeypatch)
+    checkpoint = BatchCheckpoint(tmp_path / "done.txt")
+
+    records = iter_batch_extraction(["https://github.com/o/a"], "maSMP", workers=1, checkpoint=checkpoint)
+    next(records)
+    records.close()
+
+    assert checkpoint.load() == set()
+
+
+def test_batch_job_probes_the_rate_limit_once_per_platform_off_the_event_loop(monkeypatch):
+    probed: list[str] = []
+    checks: list[str] = []
+
+    def rate_limit_probe(repo_url, access_token=None):
+        probed.append(repo_url)
+
+        def probe():
+            checks.append(threading.current_thread().name)
+            return 0.0
+
+        return probe
+
+    async def fake_run_extraction_async(repo_url, schema_name, access_token, with_enrichment, schema_class, fields):
+        return {"name": repo_url}, None
+
+    monkeypatch.setattr(batch_service, "rate_limit_probe", rate_limit_probe)
+    monkeypatch.setattr(metadata_service, "run_extraction_async", fake_run_extraction_async)
+    urls = ["https://github.com/o/a", "https://github.com/o/b", "https://gitlab.com/g/c"]
+
+    async def scenario():
+        job = batch_service.BatchJobRegistry(max_concurrency=1).submit(urls, "maSMP")
+        return [record async for record in job.iter_results()]
+
+    records = asyncio.run(scenario())
+
+    assert [record["status"] for record in records] == ["success"] * 3
+    assert probed == ["https://github.com/o/a", "https://gitlab.com/g/c"]
+    assert len(checks) == 3 and threading.main_thread().name not in checks
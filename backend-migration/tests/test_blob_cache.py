@@ -0,0 +1,92 @@
+"""
+Tests for the content-addressed blob cache behind GitPlatformClient.get_file.
+"""
+import base64
+import json
+
+import requests
+
+from app.layer_3.plugins.github.github_client import GitHubClient
+from app.layer_3.plugins.shared.blob_cache import MemoryBlobCache, SqliteBlobCache, configure_blob_cache, get_blob_cache
+from app.layer_3.plugins.shared.hashing import git_blob_sha
+from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
+
+LICENSE = b"MIT License\n\nCopyright (c) 2024\n"
+LICENSE_SHA = git_blob_sha(LICENSE)
+
+
+class _FakeGitHubClient(GitHubClient):
+    def __init__(self, context, state, routes):
+        super().__init__(context, state)
+        self.routes = routes
+        self.requested: list[str] = []
+
+    def _caching_get(self, url, params=None, fetch_function=None):
+        self.requested.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.routes[url]).encode("utf-8")
+        return response
+
+
+def _client(repo: str) -> _FakeGitHubClient:
+    api = f"https://api.github.com/repos/{repo}"
+    routes = {
+        api: {"default_branch": "main", "html_url": f"https://github.com/{repo}"},
+        f"{api}/git/trees/main": {
+            "truncated": False,
+            "tree": [{"path": "LICENSE", "type": "blob", "sha": LICENSE_SHA, "size": len(LICENSE)}],
+        },
+        f"{api}/contents/LICENSE": {
+            "name": "LICENSE",
+            "path": "LICENSE",
+            "type": "file",
+            "sha": LICENSE_SHA,
+            "encoding": "base64",
+            "content": base64.b64encode(LICENSE).decode("ascii"),
+        },
+    }
+    context = ExtractionContext(repo_url=f"https://github.com/{repo}", domain="software", schema=None)
+    return _FakeGitHubClient(context, ExtractionState(metadata_collector=None), routes)
+
+
+def test_identical_files_of_different_repositories_are_downloaded_once():
+    previous = get_blob_cache()
+    configure_blob_cache(MemoryBlobCache())
+    try:
+        upstream, fork = _client("o/r"), _client("fork/r")
+        for client in (upstream, fork):
+            client.list_contents()
+            assert client.get_file("LICENSE").get_content() == LICENSE.decode("utf-8")
+
+        assert "https://api.github.com/repos/o/r/contents/LICENSE" in upstream.requested
+        assert not any("/contents/" in url for url in fork.requested)
+        assert fork.get_file("LICENSE").get_html_url(fork) == "https://github.com/fork/r/blob/main/LICENSE"
+    finally:
+        configure_blob_cache(previous)
+
+
+def test_only_content_matching_its_sha_is_stored():
+    # what `git hash-object` reports for an empty file
+    assert git_blob_sha(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+    cache = MemoryBlobCache()
+    assert not cache.set(LICENSE_SHA, b"tampered")
+    assert cache.get(LICENSE_SHA) is None
+    assert cache.set(LICENSE_SHA, LICENSE)
+    assert cache.get(LICENSE_SHA) == LICENSE
+
+
+def test_memory_cache_evicts_least_recently_used_blobs():
+    blobs = [bytes([i]) * 10 for i in range(3)]
+    cache = MemoryBlobCache(max_bytes=20)
+    for blob in blobs[:2]:
+        cache.set(git_blob_sha(blob), blob)
+    cache.get(git_blob_sha(blobs[0]))
+    cache.set(git_blob_sha(blobs[2]), blobs[2])
+
+    assert [cache.get(git_blob_sha(blob)) is not None for blob in blobs] == [True, False, True]
+
+
+def test_sqlite_cache_is_shared_across_instances(tmp_path):
+    SqliteBlobCache(tmp_path / "blobs.sqlite").set(LICENSE_SHA, LICENSE)
+    assert SqliteBlobCache(tmp_path / "blobs.sqlite").get(LICENSE_SHA) == LICENSE
@@ -0,0 +1,72 @@
+"""
+Tests for the schema descriptors compiled by LinkMlSchemaRegistry at load time.
+"""
+from pathlib import Path
+
+import pytest
+from linkml_runtime import SchemaView
+
+from app.layer_1.schemas.compiled_schema import CompiledSchema
+from app.layer_3.schemas.linkml.linkml_schema import LinkMlSchema
+from app.layer_3.schemas.linkml.linkml_schema_registry import LinkMlSchemaRegistry
+
+SCHEMAS_DIR = Path(__file__).resolve().parents[1] / "schemas"
+
+
+@pytest.fixture(scope="module")
+def registry() -> LinkMlSchemaRegistry:
+    registry = LinkMlSchemaRegistry()
+    registry.load(SCHEMAS_DIR)
+    return registry
+
+
+def test_compiled_schema_answers_like_the_schema_view(registry):
+    view = SchemaView(str(SCHEMAS_DIR / "codemeta.yaml"))
+    class_name = next(iter(view.all_classes()))
+    live = LinkMlSchema(view, class_name)
+    compiled = registry.get(view.schema.name, class_name)
+
+    assert isinstance(compiled, CompiledSchema)
+    assert compiled.get_property_list() == live.get_property_list()
+    assert compiled.build_context() == live.build_context()
+    assert compiled.get_prefixes() == live.get_prefixes()
+    for prop in live.get_property_list():
+        assert compiled.get_uri(prop) == live.get_uri(prop)
+        assert compiled.get_categories_of(prop) == live.get_categories_of(prop)
+
+
+def test_compiled_schema_is_immutable(registry):
+    compiled = registry.get("maSMP", "SoftwareApplication")
+
+    context = compiled.build_context()
+    context["extra"] = "x"
+    assert "extra" not in compiled.build_context()
+    with pytest.raises(TypeError):
+        compiled.uris["name"] = "x"
+
+
+def test_snapshot_is_reused_until_a_schema_file_changes(tmp_path, monkeypatch):
+    schemas_dir = tmp_path / "schemas"
+    schemas_dir.mkdir()
+    (schemas_dir / "codemeta.yaml").write_bytes((SCHEMAS_DIR / "codemeta.yaml").read_bytes())
+    cache_dir = tmp_path / "cache"
+
+    first = LinkMlSchemaRegistry(cache_dir=cache_dir)
+    loaded = first.load(schemas_dir)
+    assert len(list(cache_dir.glob("schemas-*.json"))) == 1
+
+    def no_parsing(paths):
+        raise AssertionError("schemas were parsed although the snapshot is current")
+
+    monkeypatch.setattr(LinkMlSchemaRegistry, "_parse", staticmethod(no_parsing))
+    second = LinkMlSchemaRegistry(cache_dir=cache_dir)
+    assert second.load(schemas_dir) == loaded
+    assert second.list() == first.list()
+    for name, schema in first.schemas.items():
+        assert second.schemas[name].to_dict() == schema.to_dict()
+    monkeypatch.undo()
+
+    with open(schemas_dir / "codemeta.yaml", "a", encoding="utf-8") as f:
+        f.write("\n# changed\n")
+    LinkMlSchemaRegistry(cache_dir=cache_dir).load(schemas_dir)
+    assert len(list(cache_dir.glob("schemas-*.json"))) == 2
@@ -0,0 +1,145 @@
+"""
+Tests for field-selected extraction: only the plugins extracting the
+requested properties are composed into the pipeline.
+"""
+import pytest
+
+from app.layer_1.metadata_collector.metadata_collector import MetadataCollector
+from app.layer_2.contracts import ExtractionContext
+from app.layer_2.use_cases.extract_metadata import ExtractMetadataUseCase
+from app.layer_3.composers.plugin_pipeline_composer import PluginPipelineComposer
+from app.layer_3.steps.contracts.pipeline import ExtractionPipelineRunner
+from app.layer_4.services import metadata_service
+from app.layer_4.services.metadata_service import _resolve_fields
+
+
+class StubSchema:
+    PROPERTIES = {"name": "schema:name", "license": "schema:license", "citation": "schema:citation"}
+
+    def get_schema_name(self) -> str:
+        return "maSMP"
+
+    def get_class_name(self) -> str:
+        return "SoftwareSourceCode"
+
+    def get_property_list(self) -> list[str]:
+        return list(self.PROPERTIES)
+
+    def get_uri(self, property_name: str) -> str:
+        return self.PROPERTIES[property_name]
+
+
+class StubPlugin:
+    def __init__(self, name: str, uri: str, priority_level: int = 0):
+        self.name = name
+        self.uri = uri
+        self.priority_level = priority_level
+        self.runs = 0
+
+    def extract(self, context, state):
+        self.runs += 1
+        state.metadata_collector.collect(self.name, self.uri, f"{self.name}-value")
+        return state
+
+
+class StubPluginManager:
+    def __init__(self, plugins):
+        self.plugins = plugins
+
+    def select(self, key, context):
+        uri = context.schema.get_uri(key)
+        return {plugin for plugin in self.plugins if plugin.uri == uri}
+
+
+class StubBuilder:
+    def build_jsonld(self, metadata, schema) -> dict:
+        result = {"@context": {}}
+        for prop in schema.get_property_list():
+            record = metadata.get_most_confident(schema.get_uri(prop))
+            result[prop] = record.property_value if record else None
+        return result
+
+
+def _plugins():
+    return [
+        StubPlugin("platform.name", "schema:name", priority_level=1),
+        StubPlugin("license.files", "schema:license"),
+        StubPlugin("openalex.citation", "schema:citation"),
+    ]
+
+
+def test_composer_only_selects_plugins_of_requested_fields():
+    composer = PluginPipelineComposer()
+    composer.plugin_manager = StubPluginManager(_plugins())
+
+    full = composer.compose(ExtractionContext(repo_url="https://example.org/o/r", domain="software", schema=StubSchema()))
+    pruned = composer.compose(
+        ExtractionContext(repo_url="https://example.org/o/r", domain="software", schema=StubSchema(), fields=frozenset({"license"}))
+    )
+
+    assert full.steps[0].name == "platform.name"
+    assert {step.name for step in full.steps} == {"platform.name", "license.files", "openalex.citation"}
+    assert [step.name for step in pruned.steps] == ["license.files"]
+
+
+def test_field_selected_extraction_runs_and_returns_only_those_fields():
+    plugins = _plugins()
+    composer = PluginPipelineComposer()
+    composer.plugin_manager = StubPluginManager(plugins)
+    use_case = ExtractMetadataUseCase(
+        jsonld_builder=StubBuilder(),
+        pipeline_composer=composer,
+        pipeline_runner=ExtractionPipelineRunner(),
+        extraction_metadata_collector=MetadataCollector(),
+    )
+
+    result = use_case.execute(repo_url="https://example.org/o/r", schema=StubSchema(), fields={"license"})
+
+    assert result.jsonld_document == {"@context": {}, "license": "license.files-value"}
+    assert [plugin.runs for plugin in plugins] == [0, 1, 0]
+
+
+def test_resolve_fields_rejects_unknown_properties():
+    assert _resolve_fields(StubSchema(), None) is None
+    assert _resolve_fields(StubSchema(), [" license ", "name"]) == frozenset({"license", "name"})
+    with pytest.raises(ValueError, match="licence"):
+        _resolve_fields(StubSchema(), ["licence"])
+
+
+class StubProfileRegistry:
+    PROPERTIES = {"SoftwareSourceCode": ["license", "hasSourceCode"], "SoftwareApplication": ["license"]}
+
+    def get(self, schema_name, class_name):
+        registry = self
+
+        class Profile:
+            def get_property_list(self):
+                return registry.PROPERTIES[class_name]
+
+        return Profile()
+
+
+def test_single_property_extraction_returns_every_masmp_profile(monkeypatch):
+    runs = []
+
+    def run_extraction(repo_url, schema_name, access_token, with_enrichment, schema_class, fields):
+        runs.append((schema_class, fields))
+        return {fields[0]: f"{schema_class}-value"}, {fields[0]: {"source": "LICENSE", "confidence": 0.9}}
+
+    monkeypatch.setattr(metadata_service, "_schema_registry", StubProfileRegistry())
+    monkeypatch.setattr(metadata_service, "run_extraction", run_extraction)
+
+    _, items = metadata_service.run_single_property_extraction("https://example.org/o/r", "maSMP", None, "license")
+    assert [item["profile"] for item in items] == ["maSMP:SoftwareSourceCode", "maSMP:SoftwareApplication"]
+    assert items[1] == {
+        "profile": "maSMP:SoftwareApplication",
+        "value": "SoftwareApplication-value",
+        "source": "LICENSE",
+        "confidence": 0.9,
+    }
+    assert runs == [("SoftwareSourceCode", ["license"]), ("SoftwareApplication", ["license"])]
+
+    _, items = metadata_service.run_single_property_extraction("https://example.org/o/r", "maSMP", None, "hasSourceCode")
+    assert [item["profile"] for item in items] == ["maSMP:SoftwareSourceCode"]
+    with pytest.raises(ValueError, match="licence"):
+        metadata_service.run_single_property_extraction("https://example.org/o/r", "maSMP", None, "licence")
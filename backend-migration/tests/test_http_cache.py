@@ -0,0 +1,225 @@
+"""
+Tests for the persistent HTTP response cache behind CachingHttpClient.
+"""
+import dataclasses
+
+import pytest
+import requests
+
+from app.layer_3.plugins.shared.caching_http_client import CachedResponse, CachingHttpClient
+from app.layer_3.plugins.shared.http_cache import (
+    HttpCacheTtlPolicy,
+    SqliteHttpCacheBackend,
+    build_cache_key,
+    auth_scope,
+    configure_http_cache,
+)
+from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
+
+
+class _DummyClient(CachingHttpClient):
+    name = "tests.dummy.client"
+
+    def __init__(self, context, state, token=None):
+        super().__init__(context, state)
+        self.headers = {"Authorization": f"token {token}"} if token else {}
+
+    def _build_headers(self):
+        return {}
+
+
+def _make_response(url: str, body: bytes, status_code: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.url = url
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+def _new_client(token=None) -> _DummyClient:
+    context = ExtractionContext(repo_url="https://github.com/o/r", domain="software", schema=None)
+    return _DummyClient(context, ExtractionState(metadata_collector=None), token=token)
+
+
+def test_sqlite_backend_roundtrip(tmp_path):
+    backend = SqliteHttpCacheBackend(tmp_path / "http.sqlite")
+    entry = backend.build_entry("https://api.github.com/repos/o/r", 200, {"ETag": '"abc"'}, b'{"name": "r"}')
+    backend.set("k", entry)
+
+    loaded = backend.get("k")
+    assert loaded.content == b'{"name": "r"}'
+    assert loaded.headers == {"ETag": '"abc"'}
+    assert loaded.is_fresh()
+    assert backend.get("missing") is None
+
+
+def test_ttl_policy_classifies_endpoints():
+    policy = HttpCacheTtlPolicy(rules=((r"/contents/", 100),), default_ttl=5)
+    assert policy.ttl_for("https://api.github.com/repos/o/r/contents/README.md") == 100
+    assert policy.ttl_for("https://api.github.com/repos/o/r") == 5
+
+
+def test_reads_at_a_commit_sha_are_cached_longer_than_reads_at_a_branch():
+    policy = HttpCacheTtlPolicy()
+    sha = "0123456789abcdef0123456789abcdef01234567"
+    assert policy.ttl_for(f"https://api.github.com/repos/o/r/git/trees/{sha}?recursive=1") > policy.ttl_for(
+        "https://api.github.com/repos/o/r/git/trees/main?recursive=1"
+    )
+    assert policy.ttl_for(f"https://gitlab.com/api/v4/projects/1/repository/files/README.md?ref={sha}") > 24 * 3600
+    assert policy.ttl_for("https://api.github.com/repos/o/r/commits?per_page=1") == 0
+
+
+def test_lru_eviction_by_entry_count(tmp_path):
+    backend = SqliteHttpCacheBackend(tmp_path / "http.sqlite", max_entries=2)
+    for key in ("a", "b", "c"):
+        backend.set(key, backend.build_entry(f"https://x/{key}", 200, {}, b"1"))
+    backend.get("a")  # touch "a" so "b" becomes least recently used
+    backend.set("d", backend.build_entry("https://x/d", 200, {}, b"1"))
+    backend.evict()
+
+    remaining = {key for key in ("a", "b", "c", "d") if backend.get(key) is not None}
+    assert remaining == {"a", "d"}
+
+
+def test_cache_key_separates_auth_scopes():
+    url = "https://api.github.com/repos/o/r"
+    anonymous = build_cache_key("GET", url, None, auth_scope({}))
+    with_token = build_cache_key("GET", url, None, auth_scope({"Authorization": "token t"}))
+    assert anonymous != with_token
+    assert build_cache_key("GET", url, {"b": 1, "a": 2}, "s") == build_cache_key("GET", url, {"a": 2, "b": 1}, "s")
+
+
+def test_caching_get_is_served_from_persistent_cache_across_clients(tmp_path):
+    configure_http_cache(SqliteHttpCacheBackend(tmp_path / "http.sqlite"))
+    calls: list[str] = []
+
+    def fake_fetch(url, headers=None, params=None):
+        calls.append(url)
+        return _make_response(url, b'{"name": "r"}')
+
+    try:
+        url = "https://api.github.com/repos/o/r"
+        assert _new_client()._caching_get(url, fetch_function=fake_fetch).json() == {"name": "r"}
+        assert _new_client()._caching_get(url, fetch_function=fake_fetch).json() == {"name": "r"}
+        assert calls == [url]
+
+        # a different token is a different auth scope and must not reuse the entry
+        _new_client(token="secret")._caching_get(url, fetch_function=fake_fetch)
+        assert calls == [url, url]
+    finally:
+        configure_http_cache(None)
+
+
+def test_stale_entry_is_revalidated_and_304_served_from_store(tmp_path):
+    backend = SqliteHttpCacheBackend(tmp_path / "http.sqlite", ttl_policy=HttpCacheTtlPolicy(rules=(), default_ttl=-1))
+    configure_http_cache(backend)
+    seen: list[dict] = []
+
+    def fake_fetch(url, headers=None, params=None, etag=None, last_modified=None):
+        seen.append({"etag": etag, "last_modified": last_modified})
+        if etag == '"v1"':
+            response = _make_response(url, b"", status_code=304)
+            response.headers["ETag"] = '"v1"'
+            return response
+        response = _make_response(url, b'{"name": "r"}')
+        response.headers["ETag"] = '"v1"'
+        return response
+
+    try:
+        url = "https://api.github.com/repos/o/r"
+        assert _new_client()._caching_get(url, fetch_function=fake_fetch).json() == {"name": "r"}
+        # entries expire immediately (ttl -1), so the second client must revalidate
+        response = _new_client()._caching_get(url, fetch_function=fake_fetch)
+        assert response.status_code == 200
+        assert response.json() == {"name": "r"}
+        assert seen == [{"etag": None, "last_modified": None}, {"etag": '"v1"', "last_modified": None}]
+    finally:
+        configure_http_cache(None)
+
+
+def test_stale_entry_is_replaced_when_resource_changed(tmp_path):
+    backend = SqliteHttpCacheBackend(tmp_path / "http.sqlite", ttl_policy=HttpCacheTtlPolicy(rules=(), default_ttl=-1))
+    configure_http_cache(backend)
+    bodies = iter([b'{"v": 1}', b'{"v": 2}', b'{"v": 3}'])
+
+    def fake_fetch(url, headers=None, params=None, etag=None, last_modified=None):
+        response = _make_response(url, next(bodies))
+        response.headers["Last-Modified"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+        return response
+
+    try:
+        url = "https://api.github.com/repos/o/r/tags"
+        assert _new_client()._caching_get(url, fetch_function=fake_fetch).json() == {"v": 1}
+        assert _new_client()._caching_get(url, fetch_function=fake_fetch).json() == {"v": 2}
+    finally:
+        configure_http_cache(None)
+
+
+def test_caching_post_is_keyed_by_body(tmp_path):
+    configure_http_cache(SqliteHttpCacheBackend(tmp_path / "http.sqlite"))
+    bodies: list[dict] = []
+
+    def fake_fetch(url, headers=None, json=None):
+        bodies.append(json)
+        return _make_response(url, b'{"data": {}}')
+
+    try:
+        url = "https://api.github.com/graphql"
+        _new_client()._caching_post(url, {"query": "a"}, fetch_function=fake_fetch)
+        _new_client()._caching_post(url, {"query": "a"}, fetch_function=fake_fetch)
+        _new_client()._caching_post(url, {"query": "b"}, fetch_function=fake_fetch)
+        assert bodies == [{"query": "a"}, {"query": "b"}]
+    finally:
+        configure_http_cache(None)
+
+
+def test_graphql_errors_are_not_persisted(tmp_path):
+    configure_http_cache(SqliteHttpCacheBackend(tmp_path / "http.sqlite"))
+    bodies = iter([b'{"data": null, "errors": [{"type": "RATE_LIMITED"}]}', b'{"data": {"ok": true}}'])
+    calls: list[str] = []
+
+    def fake_fetch(url, headers=None, json=None):
+        calls.append(url)
+        return _make_response(url, next(bodies))
+
+    try:
+        url = "https://api.github.com/graphql"
+        client = _new_client()
+        assert client._caching_post(url, {"query": "a"}, fetch_function=fake_fetch).has_graphql_errors
+        # the failed response is reused by the same client, but a new one asks again
+        client._caching_post(url, {"query": "a"}, fetch_function=fake_fetch)
+        assert _new_client()._caching_post(url, {"query": "a"}, fetch_function=fake_fetch).json() == {"data": {"ok": True}}
+        assert _new_client()._caching_post(url, {"query": "a"}, fetch_function=fake_fetch).json() == {"data": {"ok": True}}
+        assert len(calls) == 2
+    finally:
+        configure_http_cache(None)
+
+
+def test_cached_responses_are_compact_and_decoded_once():
+    calls: list[str] = []
+
+    def fake_fetch(url, headers=None, params=None):
+        calls.append(url)
+        response = _make_response(url, b'{"name": "r"}' if url.endswith("/r") else b"# README")
+        response.headers["Content-Type"] = "application/json; charset=utf-8" if url.endswith("/r") else "text/plain"
+        response.headers["X-GitHub-Request-Id"] = "abc"
+        return response
+
+    client = _new_client()
+    url = "https://api.github.com/repos/o/r"
+    first = client._caching_get(url, fetch_function=fake_fetch)
+    second = client._caching_get(url, fetch_function=fake_fetch)
+
+    assert isinstance(first, CachedResponse) and second is first
+    assert first.json() is second.json()
+    assert first.body is None and first.json() == {"name": "r"}
+    assert set(first.headers) == {"Content-Type"}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.status_code = 404
+    with pytest.raises(TypeError):
+        first.headers["X-Next-Page"] = "2"
+
+    raw = client._caching_get("https://raw.githubusercontent.com/o/r/main/README.md", fetch_function=fake_fetch)
+    assert raw.content == b"# README" and raw.text == "# README"
+    assert len(calls) == 2
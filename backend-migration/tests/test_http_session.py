@@ -0,0 +1,39 @@
+"""
+Tests for the pooled HTTP session layer used by fetchFunction.
+"""
+from app.layer_3.plugins.shared import caching_http_client
+from app.layer_3.plugins.shared.http_session import HttpSessionPool, get_session
+
+
+class DummyResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise Exception("HTTP error")
+
+
+def test_session_pool_reuses_one_session_per_host():
+    pool = HttpSessionPool(pool_maxsize=4)
+    first = pool.session_for("https://api.github.com/repos/o/r")
+    assert pool.session_for("https://API.github.com/repos/o/r/tags") is first
+    assert pool.session_for("https://api.openalex.org/works") is not first
+    assert first.get_adapter("https://api.github.com")._pool_maxsize == 4
+    pool.close()
+
+
+def test_fetch_function_uses_shared_session(monkeypatch):
+    calls: list[str] = []
+    session = get_session("https://api.github.com")
+
+    def fake_get(url, headers=None, params=None, timeout=5):
+        calls.append(url)
+        return DummyResponse(200)
+
+    monkeypatch.setattr(session, "get", fake_get)
+
+    caching_http_client.fetchFunction("https://api.github.com/repos/o/r")
+    caching_http_client.fetchFunction("https://api.github.com/repos/o/r/tags")
+    assert calls == ["https://api.github.com/repos/o/r", "https://api.github.com/repos/o/r/tags"]
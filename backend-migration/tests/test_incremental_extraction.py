@@ -0,0 +1,158 @@
+"""
+Tests for incremental re-extraction: steps whose inputs did not change
+between two commits are restored from the result cache instead of re-run.
+"""
+import requests
+
+from app.layer_1.metadata_collector.metadata_collector import MetadataCollector
+from app.layer_2.use_cases.extract_metadata import ExtractMetadataUseCase
+from app.layer_3.plugins.shared.caching_http_client import CachingHttpClient
+from app.layer_3.plugins.shared.http_cache import SqliteHttpCacheBackend, configure_http_cache
+from app.layer_3.plugins.shared.result_cache import SqliteResultCache
+from app.layer_3.steps.contracts import ExtractionPipeline
+from app.layer_3.steps.contracts.pipeline import ExtractionPipelineRunner, ParallelExtractionPipelineRunner
+
+API = {"https://api.example.org/a": b"alpha", "https://api.example.org/b": b"beta"}
+
+
+class FakeApiClient(CachingHttpClient):
+    name = "test.fake_api"
+
+    def _build_headers(self) -> dict:
+        return {}
+
+    def _fetch(self, fetch_function, url: str, **kwargs) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = API[url]
+        response.url = url
+        return response
+
+
+class ReadStep:
+    """Collects the body of one API resource under `schema:<resource>`."""
+
+    def __init__(self, resource: str):
+        self.resource = resource
+        self.name = f"fake.read_{resource}"
+        self.runs = 0
+
+    def extract(self, context, state):
+        self.runs += 1
+        body = FakeApiClient.get_or_create(context, state)._caching_get(f"https://api.example.org/{self.resource}")
+        state.metadata_collector.collect("fake.api", f"schema:{self.resource}", body.text, 0.8)
+        return state
+
+
+class StubSchema:
+    def get_schema_name(self) -> str:
+        return "maSMP"
+
+    def get_class_name(self) -> str:
+        return "SoftwareSourceCode"
+
+
+class StubComposer:
+    def __init__(self, steps):
+        self.steps = steps
+
+    def compose(self, context) -> ExtractionPipeline:
+        return ExtractionPipeline(steps=tuple(self.steps))
+
+
+class StubBuilder:
+    def build_jsonld(self, metadata, schema) -> dict:
+        return {uri: metadata.get_most_confident(uri).property_value for uri in sorted(metadata.data)}
+
+
+def _extract(cache, steps):
+    collector = MetadataCollector()
+    use_case = ExtractMetadataUseCase(
+        jsonld_builder=StubBuilder(),
+        pipeline_composer=StubComposer(steps),
+        pipeline_runner=ExtractionPipelineRunner(),
+        extraction_metadata_collector=collector,
+        result_cache=cache,
+    )
+    return use_case.execute(repo_url="https://example.org/org/repo", schema=StubSchema()).jsonld_document, collector
+
+
+def test_only_steps_with_changed_inputs_run_on_a_new_commit(tmp_path, monkeypatch):
+    monkeypatch.setitem(API, "https://api.example.org/b", b"beta")
+    head = {"sha": "aaa"}
+    cache = SqliteResultCache(
+        tmp_path / "results.sqlite",
+        plugin_set_version=lambda: "plugins-v1",
+        revision_resolver=lambda context, state: head["sha"],
+    )
+    step_a, step_b = ReadStep("a"), ReadStep("b")
+
+    assert _extract(cache, [step_a, step_b])[0] == {"schema:a": "alpha", "schema:b": "beta"}
+
+    head["sha"] = "bbb"
+    API["https://api.example.org/b"] = b"beta-2"
+    document, collector = _extract(cache, [step_a, step_b])
+
+    assert document == {"schema:a": "alpha", "schema:b": "beta-2"}
+    assert (step_a.runs, step_b.runs) == (1, 2)
+    restored = collector.get_most_confident("schema:a")
+    assert (restored.source, restored.confidence, restored.step) == ("fake.api", 0.8, "fake.read_a")
+
+    # restored values keep their step, so they can be reused again on the next commit
+    head["sha"] = "ccc"
+    assert _extract(cache, [step_a, step_b])[0] == {"schema:a": "alpha", "schema:b": "beta-2"}
+    assert (step_a.runs, step_b.runs) == (1, 2)
+
+
+def test_request_inputs_are_not_fingerprinted_from_the_persistent_http_cache(tmp_path, monkeypatch):
+    monkeypatch.setitem(API, "https://api.example.org/b", b"beta")
+    configure_http_cache(SqliteHttpCacheBackend(tmp_path / "http.sqlite"))
+    head = {"sha": "aaa"}
+    cache = SqliteResultCache(
+        tmp_path / "results.sqlite",
+        plugin_set_version=lambda: "plugins-v1",
+        revision_resolver=lambda context, state: head["sha"],
+    )
+    step_a, step_b = ReadStep("a"), ReadStep("b")
+    try:
+        _extract(cache, [step_a, step_b])
+
+        # the persisted response for b is still fresh, but no longer current
+        head["sha"] = "bbb"
+        API["https://api.example.org/b"] = b"beta-2"
+        document, _ = _extract(cache, [step_a, step_b])
+    finally:
+        configure_http_cache(None)
+
+    assert document == {"schema:a": "alpha", "schema:b": "beta-2"}
+    assert (step_a.runs, step_b.runs) == (1, 2)
+
+
+def test_new_steps_run_and_unknown_lineage_runs_everything(tmp_path):
+    head = {"sha": "aaa"}
+    cache = SqliteResultCache(
+        tmp_path / "results.sqlite",
+        plugin_set_version=lambda: "plugins-v1",
+        revision_resolver=lambda context, state: head["sha"],
+    )
+    step_a, step_b = ReadStep("a"), ReadStep("b")
+
+    _extract(cache, [step_a])
+    head["sha"] = "bbb"
+    document, _ = _extract(cache, [step_a, step_b])
+
+    assert document == {"schema:a": "alpha", "schema:b": "beta"}
+    assert (step_a.runs, step_b.runs) == (1, 1)
+
+
+def test_parallel_runner_attributes_collected_values_to_their_step():
+    from app.layer_2.contracts import ExtractionContext, ExtractionState
+
+    collector = MetadataCollector()
+    state = ExtractionState(metadata_collector=collector, data={})
+    context = ExtractionContext(repo_url="https://example.org/org/repo", domain="software", schema=StubSchema(), platform="", access_token=None)
+
+    ParallelExtractionPipelineRunner().run(ExtractionPipeline(steps=(ReadStep("a"), ReadStep("b"))), context, state)
+
+    assert collector.get_most_confident("schema:a").step == "fake.read_a"
+    assert collector.get_most_confident("schema:b").step == "fake.read_b"
@@ -0,0 +1,40 @@
+"""
+Tests for the memoizing LicenseMatcher (scancode itself is replaced by a counter).
+"""
+from app.layer_3.plugins.shared.license_matcher import LicenseMatcher
+
+
+class _CountingMatcher(LicenseMatcher):
+    def __init__(self, max_entries: int = 1024):
+        super().__init__(max_entries=max_entries)
+        self.calls: list[str] = []
+
+    def _match_uncached(self, text):
+        self.calls.append(text)
+        return {
+            "detected_license_expression_spdx": "MIT",
+            "percentage_of_license_text": 100.0,
+            "matched_rules": ["mit.LICENSE"],
+        }
+
+
+def test_identical_texts_are_matched_once():
+    matcher = _CountingMatcher()
+
+    first = matcher.match("MIT License ...")
+    first["detected_license_expression_spdx"] = "changed by caller"
+    first["matched_rules"].append("changed by caller")
+    second = matcher.match("MIT License ...")
+
+    assert matcher.calls == ["MIT License ..."]
+    assert second["detected_license_expression_spdx"] == "MIT"
+    assert second["matched_rules"] == ["mit.LICENSE"]
+
+
+def test_results_are_evicted_least_recently_used():
+    matcher = _CountingMatcher(max_entries=2)
+    for text in ("a", "b", "a", "c", "a", "b"):
+        matcher.match(text)
+
+    assert matcher.calls == ["a", "b", "c", "b"]
+    assert matcher.cache_info() == {"entries": 2, "max_entries": 2}
@@ -0,0 +1,171 @@
+"""
+Tests for ParallelExtractionPipelineRunner and the thread-safety pieces it relies on.
+"""
+import threading
+import time
+
+import requests
+
+from app.layer_1.metadata_collector.metadata_collector import MetadataCollector
+from app.layer_3.plugins.github.github_client import GitHubClient, GitHubRepositoryFile
+from app.layer_3.plugins.shared.caching_http_client import CachingHttpClient
+from app.layer_3.steps.contracts import (
+    ExtractionContext,
+    ExtractionPipeline,
+    ExtractionState,
+    ParallelExtractionPipelineRunner,
+)
+
+
+class _Step:
+    def __init__(self, name: str, priority_level: int, action):
+        self.name = name
+        self.priority_level = priority_level
+        self._action = action
+
+    def extract(self, context, state):
+        self._action(state)
+        return state
+
+
+class _DummyClient(CachingHttpClient):
+    name = "tests.parallel.client"
+
+    def _build_headers(self):
+        return {}
+
+
+def _context() -> ExtractionContext:
+    return ExtractionContext(repo_url="https://github.com/o/r", domain="software", schema=None)
+
+
+def test_steps_of_one_priority_group_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_sibling(state):
+        barrier.wait()
+        state.metadata_collector.collect("test", "p", threading.current_thread().name)
+
+    pipeline = ExtractionPipeline(steps=(_Step("a", 100, wait_for_sibling), _Step("b", 100, wait_for_sibling)))
+    state = ExtractionState(metadata_collector=MetadataCollector())
+
+    ParallelExtractionPipelineRunner(max_workers=2).run(pipeline, _context(), state)
+
+    assert len(state.metadata_collector.get("p")) == 2
+
+
+def test_priority_groups_run_in_order_and_failures_do_not_abort():
+    order: list[str] = []
+
+    def record(token):
+        def action(state):
+            time.sleep(0.01 if token == "high-1" else 0)
+            order.append(token)
+        return action
+
+    def fail(state):
+        raise RuntimeError("boom")
+
+    pipeline = ExtractionPipeline(
+        steps=(
+            _Step("h1", 200, record("high-1")),
+            _Step("h2", 200, fail),
+            _Step("l1", 100, record("low")),
+        )
+    )
+    ParallelExtractionPipelineRunner(max_workers=4).run(
+        pipeline, _context(), ExtractionState(metadata_collector=MetadataCollector())
+    )
+
+    assert order == ["high-1", "low"]
+
+
+def test_runs_share_one_pool_and_pass_on_returned_state():
+    threads: set[str] = set()
+    replacement = ExtractionState(metadata_collector=MetadataCollector())
+
+    class _Replacing(_Step):
+        def extract(self, context, state):
+            threads.add(threading.current_thread().name)
+            return replacement
+
+    def record(state):
+        threads.add(threading.current_thread().name)
+
+    seen: list[ExtractionState] = []
+    pipeline = ExtractionPipeline(
+        steps=(
+            _Step("h1", 200, record),
+            _Replacing("h2", 200, None),
+            _Step("l1", 100, seen.append),
+        )
+    )
+    runner = ParallelExtractionPipelineRunner(max_workers=2)
+    for _ in range(3):
+        result = runner.run(pipeline, _context(), ExtractionState(metadata_collector=MetadataCollector()))
+        assert result is replacement
+
+    assert seen == [replacement] * 3
+    assert len(threads) <= 2
+
+
+def test_concurrent_identical_requests_are_fetched_once():
+    client = _DummyClient(_context(), ExtractionState(metadata_collector=MetadataCollector()))
+    calls: list[str] = []
+
+    def slow_fetch(url, headers=None, params=None):
+        calls.append(url)
+        time.sleep(0.05)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"{}"
+        return response
+
+    threads = [
+        threading.Thread(target=client._caching_get, args=("https://api.github.com/repos/o/r",), kwargs={"fetch_function": slow_fetch})
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["https://api.github.com/repos/o/r"]
+
+
+def test_concurrent_get_file_calls_fetch_the_file_once():
+    fetched: list[str] = []
+
+    class _SlowFileClient(GitHubClient):
+        def get_snapshot(self):
+            return None
+
+        def _cached_blob_file(self, path):
+            return None
+
+        def _fetch_file(self, path, ref=None):
+            fetched.append(path)
+            time.sleep(0.05)
+            return GitHubRepositoryFile({"path": path, "type": "file", "content": "hello"})
+
+    client = _SlowFileClient(_context(), ExtractionState(metadata_collector=MetadataCollector()))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get_file("README.md"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetched == ["README.md"]
+    assert len({id(file) for file in results}) == 1
+
+
+def test_collector_get_returns_a_snapshot():
+    collector = MetadataCollector()
+    collector.collect("a", "p", 1)
+
+    records = collector.get("p")
+    collector.collect("b", "p", 2)
+
+    assert [record.property_value for record in records] == [1]
+    assert len(collector.get("p")) == 2
@@ -0,0 +1,117 @@
+"""
+Tests for memoized pipeline plans in PluginPipelineComposer.
+"""
+import pytest
+
+from app.layer_2.contracts import ExtractionContext, canonical_platform
+from app.layer_2.extraction_plugin import ExtractionPlugin
+from app.layer_2.extraction_plugin_manager import ExtractionPluginManager
+from app.layer_3.composers.plugin_pipeline_composer import PluginPipelineComposer
+
+
+class CountingSchema:
+    PROPERTIES = {"name": "schema:name", "license": "schema:license"}
+
+    def __init__(self):
+        self.uri_lookups = 0
+
+    def get_schema_name(self) -> str:
+        return "maSMP"
+
+    def get_class_name(self) -> str:
+        return "SoftwareSourceCode"
+
+    def get_property_list(self) -> list[str]:
+        return list(self.PROPERTIES)
+
+    def get_uri(self, property_name: str) -> str:
+        self.uri_lookups += 1
+        return self.PROPERTIES[property_name]
+
+
+class GitHubNamePlugin(ExtractionPlugin):
+    name = "test.github_name"
+    extracts = {"schema:name"}
+    platforms = {"github.com"}
+
+    def extract(self, context, state):
+        return state
+
+
+class GitLabNamePlugin(ExtractionPlugin):
+    name = "test.gitlab_name"
+    extracts = {"schema:name"}
+    platforms = {"gitlab.com"}
+
+    def extract(self, context, state):
+        return state
+
+
+class GitHubLicensePlugin(ExtractionPlugin):
+    name = "test.github_license"
+    extracts = {"schema:license"}
+    platforms = {"github.com"}
+
+    def extract(self, context, state):
+        return state
+
+
+def _composer(*plugin_classes) -> PluginPipelineComposer:
+    manager = ExtractionPluginManager()
+    for plugin_class in plugin_classes:
+        manager._register(plugin_class)
+    composer = PluginPipelineComposer()
+    composer.plugin_manager = manager
+    return composer
+
+
+def _context(repo_url: str, schema) -> ExtractionContext:
+    return ExtractionContext(repo_url=repo_url, domain="software", schema=schema, platform=canonical_platform(repo_url))
+
+
+def test_plans_are_built_once_per_schema_and_platform():
+    composer = _composer(GitHubNamePlugin, GitLabNamePlugin)
+    schema = CountingSchema()
+
+    first = composer.compose(_context("https://github.com/a/b", schema))
+    lookups = schema.uri_lookups
+    second = composer.compose(_context("https://github.com/c/d", schema))
+    gitlab = composer.compose(_context("https://gitlab.com/e/f", schema))
+
+    assert [step.name for step in first.steps] == [step.name for step in second.steps] == ["test.github_name"]
+    assert [step.name for step in gitlab.steps] == ["test.gitlab_name"]
+    # the second GitHub repository reused the plan, GitLab needed its own
+    assert schema.uri_lookups == 2 * lookups
+
+
+def test_registering_a_plugin_invalidates_plans():
+    composer = _composer(GitHubNamePlugin)
+    schema = CountingSchema()
+
+    assert [step.name for step in composer.compose(_context("https://github.com/a/b", schema)).steps] == ["test.github_name"]
+    composer.get_plugin_manager()._register(GitHubLicensePlugin)
+    steps = composer.compose(_context("https://github.com/a/b", schema)).steps
+
+    assert {step.name for step in steps} == {"test.github_name", "test.github_license"}
+
+
+@pytest.mark.parametrize(
+    "repo_url, platform",
+    [
+        ("https://github.com/a/b", "github.com"),
+        ("https://www.GitHub.com/a/b.git", "github.com"),
+        ("gitlab.com/a/b", "gitlab.com"),
+        ("https://git.example.org:8443/a/b", "git.example.org"),
+        ("file:///srv/repos/b", None),
+    ],
+)
+def test_canonical_platform(repo_url, platform):
+    assert canonical_platform(repo_url) == platform
+
+
+def test_selection_matches_the_platform_not_a_substring_of_the_url():
+    composer = _composer(GitHubNamePlugin, GitLabNamePlugin)
+
+    steps = composer.compose(_context("https://gitlab.com/github.com/mirror", CountingSchema())).steps
+    assert [step.name for step in steps] == ["test.gitlab_name"]
+    assert composer.compose(_context("https://github.example.org/a/b", CountingSchema())).steps == []
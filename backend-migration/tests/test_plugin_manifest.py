@@ -0,0 +1,104 @@
+"""
+Tests for manifest-based, lazy plugin discovery.
+"""
+import importlib
+import sys
+import textwrap
+
+import pytest
+
+import app.layer_3.plugins
+from app.layer_2.contracts import ExtractionContext
+from app.layer_2.extraction_plugin_manager import ExtractionPluginManager
+
+PLUGIN_MODULE = textwrap.dedent(
+    """
+    from app.layer_2.extraction_plugin import ExtractionPlugin
+
+    class LicensePlugin(ExtractionPlugin):
+        name = "fake.license"
+        version = "1.0.0"
+        extracts = {"https://schema.org/license"}
+        platforms = {"github.com"}
+
+        def extract(self, context, state):
+            return state
+    """
+)
+
+
+class StubSchema:
+    def get_uri(self, property_name: str) -> str:
+        return f"https://schema.org/{property_name}"
+
+
+@pytest.fixture
+def plugin_package(tmp_path, monkeypatch):
+    package_dir = tmp_path / "fake_plugins"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "license_plugin.py").write_text(PLUGIN_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module("fake_plugins")
+    for name in [name for name in sys.modules if name.startswith("fake_plugins")]:
+        del sys.modules[name]
+
+
+def _forget_plugin_modules():
+    sys.modules.pop("fake_plugins.license_plugin", None)
+
+
+def test_manifest_discovery_imports_plugins_only_when_selected(plugin_package):
+    ExtractionPluginManager().write_manifest(plugin_package)
+    _forget_plugin_modules()
+
+    manager = ExtractionPluginManager()
+    manager.discover(plugin_package)
+    assert "fake_plugins.license_plugin" not in sys.modules
+    assert manager.metadata_providers == {"https://schema.org/license": {"fake.license"}}
+
+    gitlab = ExtractionContext(repo_url="https://gitlab.com/a/b", domain="software", schema=StubSchema(), platform="gitlab.com")
+    with pytest.raises(Warning):
+        manager.select("license", gitlab)
+    assert "fake_plugins.license_plugin" not in sys.modules
+
+    github = ExtractionContext(repo_url="https://github.com/a/b", domain="software", schema=StubSchema(), platform="github.com")
+    (plugin,) = manager.select("license", github)
+    assert plugin.name == "fake.license"
+    assert "fake_plugins.license_plugin" in sys.modules
+
+
+def test_outdated_manifest_falls_back_to_importing_everything(plugin_package):
+    manager = ExtractionPluginManager()
+    manager.write_manifest(plugin_package)
+    fingerprint = manager.fingerprint()
+    with open(plugin_package.__path__[0] + "/license_plugin.py", "a") as f:
+        f.write("\n# changed\n")
+    _forget_plugin_modules()
+
+    rediscovered = ExtractionPluginManager()
+    rediscovered.discover(plugin_package)
+
+    assert rediscovered.read_manifest(plugin_package) is None
+    assert "fake_plugins.license_plugin" in sys.modules
+    assert rediscovered.fingerprint() == fingerprint
+
+
+def test_manifest_ignores_edits_to_modules_without_plugins(plugin_package):
+    helpers = plugin_package.__path__[0] + "/helpers.py"
+    with open(helpers, "w") as f:
+        f.write("TIMEOUT = 10\n")
+    ExtractionPluginManager().write_manifest(plugin_package)
+    with open(helpers, "a") as f:
+        f.write("RETRIES = 3\n")
+
+    assert ExtractionPluginManager().read_manifest(plugin_package) is not None
+
+    with open(plugin_package.__path__[0] + "/other_helpers.py", "w") as f:
+        f.write("")
+    assert ExtractionPluginManager().read_manifest(plugin_package) is None
+
+
+def test_shipped_manifest_is_current():
+    # regenerate with: comet-rs plugin_manifest
+    assert ExtractionPluginManager().read_manifest(app.layer_3.plugins) is not None
@@ -0,0 +1,116 @@
+"""
+Tests for the rate-limit-aware request scheduler used by fetchFunction.
+"""
+import time
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from app.layer_3.plugins.shared import caching_http_client
+from app.layer_3.plugins.shared.caching_http_client import RateLimitError, fetchFunction
+from app.layer_3.plugins.shared.rate_limiter import (
+    RateLimiter,
+    configure_rate_limiter,
+    get_rate_limiter,
+    parse_rate_limit_headers,
+)
+
+URL = "https://api.github.com/repos/o/r"
+TOKEN = {"Authorization": "token abc"}
+
+
+def _response(status_code: int, headers: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = URL
+    response._content = b"{}"
+    return response
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiter():
+    configure_rate_limiter(pace_below=0.2, max_wait=900)
+    yield
+    configure_rate_limiter(pace_below=0.2, max_wait=900)
+
+
+def test_parses_github_and_gitlab_headers():
+    now = 1_700_000_000.0
+    assert parse_rate_limit_headers(
+        {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "12", "X-RateLimit-Reset": "1700000600"}, now
+    ) == (5000, 12, 1_700_000_600.0)
+    # delta-seconds reset (IETF draft)
+    assert parse_rate_limit_headers({"RateLimit-Limit": "60", "RateLimit-Remaining": "3", "RateLimit-Reset": "30"}, now) == (
+        60, 3, now + 30
+    )
+
+
+def test_requests_pass_freely_while_budget_is_high():
+    limiter = RateLimiter(pace_below=0.2)
+    reset = str(int(time.time()) + 3600)
+    limiter.update(URL, TOKEN, _response(200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": reset}))
+    assert limiter.reserve(URL, TOKEN) == 0
+    assert limiter.reserve(URL, TOKEN) == 0
+    assert limiter.budgets()[0].remaining == 3998
+
+
+def test_low_budget_is_spread_over_the_reset_window():
+    limiter = RateLimiter(pace_below=0.2)
+    reset = str(int(time.time()) + 100)
+    limiter.update(URL, TOKEN, _response(200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "10", "X-RateLimit-Reset": reset}))
+    waits = [limiter.reserve(URL, TOKEN) for _ in range(3)]
+    assert waits[0] == pytest.approx(0, abs=0.5)
+    assert waits[1] == pytest.approx(10, abs=1.5)
+    assert waits[2] > waits[1]
+
+
+def test_budgets_are_kept_per_token_and_resource():
+    limiter = RateLimiter()
+    reset = str(int(time.time()) + 60)
+    limiter.update(URL, TOKEN, _response(200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}))
+    assert limiter.reserve(URL, TOKEN) > 50
+    assert limiter.reserve(URL, {"Authorization": "token other"}) == 0
+    assert limiter.reserve("https://api.github.com/graphql", TOKEN) == 0
+    assert limiter.wait_seconds("github.com") > 50
+    assert limiter.wait_seconds("gitlab.com") == 0
+
+
+def test_fetch_function_waits_for_retry_after_and_retries(monkeypatch):
+    session = requests.Session()
+    responses = [_response(429, {"Retry-After": "2"}), _response(200, {"X-RateLimit-Remaining": "99", "X-RateLimit-Limit": "100"})]
+    sleeps = []
+    monkeypatch.setattr(session, "get", lambda url, **kwargs: responses.pop(0))
+    monkeypatch.setattr(caching_http_client, "sleep", sleeps.append)
+
+    response = fetchFunction(URL, headers=TOKEN, session=session)
+
+    assert response.status_code == 200
+    assert len(sleeps) == 1 and 1 <= sleeps[0] <= 2
+
+
+def test_fetch_function_raises_when_reset_is_too_far(monkeypatch):
+    configure_rate_limiter(pace_below=0.2, max_wait=60)
+    reset = str(int(time.time()) + 3600)
+    get_rate_limiter().update(URL, TOKEN, _response(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}))
+    session = requests.Session()
+    monkeypatch.setattr(session, "get", lambda url, **kwargs: pytest.fail("request should not be sent"))
+
+    with pytest.raises(RateLimitError) as exc_info:
+        fetchFunction(URL, headers=TOKEN, session=session)
+    assert exc_info.value.wait_seconds > 3000
+
+
+def test_ordinary_forbidden_is_not_retried(monkeypatch):
+    session = requests.Session()
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return _response(403, {"X-RateLimit-Remaining": "4000", "X-RateLimit-Limit": "5000"})
+
+    monkeypatch.setattr(session, "get", fake_get)
+    with pytest.raises(requests.exceptions.HTTPError):
+        fetchFunction(URL, headers=TOKEN, session=session)
+    assert len(calls) == 1
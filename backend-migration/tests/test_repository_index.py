@@ -0,0 +1,61 @@
+"""
+Tests for the classified RepositoryIndex used for candidate discovery.
+"""
+from app.layer_3.plugins.shared import repository_index
+from app.layer_3.plugins.shared.repository_index import RepositoryIndex, classify
+
+
+class _Entry:
+    def __init__(self, path: str, is_dir: bool = False):
+        self.path = path
+        self.name = path.rpartition("/")[2]
+        self.is_dir = is_dir
+
+
+def _index() -> RepositoryIndex:
+    return RepositoryIndex([
+        _Entry("README.md"),
+        _Entry("LICENSE"),
+        _Entry("CITATION.cff"),
+        _Entry("codemeta.json"),
+        _Entry("refs.bib"),
+        _Entry("docs", is_dir=True),
+        _Entry("docs/README.rst"),
+        _Entry("src", is_dir=True),
+        _Entry("src/App.csproj"),
+        _Entry("src/requirements.txt"),
+        _Entry("CONTRIBUTING.md"),
+        _Entry("mkdocs.yml"),
+    ])
+
+
+def test_entries_are_classified_by_category():
+    index = _index()
+
+    assert [e.path for e in index.by_category(repository_index.README)] == ["README.md", "docs/README.rst"]
+    assert [e.path for e in index.by_category(repository_index.LICENSE)] == ["LICENSE"]
+    assert [e.path for e in index.by_category(repository_index.CITATION)] == ["CITATION.cff"]
+    assert [e.path for e in index.by_category(repository_index.BIBTEX)] == ["refs.bib"]
+    assert [e.path for e in index.by_category(repository_index.CODEMETA)] == ["codemeta.json"]
+    assert [e.path for e in index.by_category(repository_index.DEVELOPER_DOCS)] == ["CONTRIBUTING.md"]
+    assert [e.path for e in index.by_category(repository_index.DOCS)] == ["docs", "mkdocs.yml"]
+
+
+def test_dependency_manifests_match_by_name_and_extension_pattern():
+    index = _index()
+
+    assert [e.path for e in index.by_category(repository_index.DEPENDENCY)] == ["src/App.csproj", "src/requirements.txt"]
+
+
+def test_lookups_by_name_and_extension_return_files_only():
+    index = _index()
+
+    assert [e.path for e in index.by_name("Codemeta.JSON")] == ["codemeta.json"]
+    assert [e.path for e in index.by_extension("bib")] == ["refs.bib"]
+    assert index.by_name("docs") == []
+    assert index.get("src/App.csproj").name == "App.csproj"
+
+
+def test_directories_only_classify_as_docs():
+    assert classify("README", is_dir=True) == []
+    assert classify("doc", is_dir=True) == [repository_index.DOCS]
@@ -0,0 +1,241 @@
+"""
+Tests for local repository snapshots (archives and shallow clones); no network.
+"""
+import io
+import subprocess
+import tarfile
+import zipfile
+
+import pytest
+
+from app.layer_3.plugins.github.github_client import GitHubClient
+from app.layer_3.plugins.gitlab.gitlab_client import GitLabClient
+from app.layer_3.plugins.shared import repository_snapshot
+from app.layer_3.plugins.shared.git_platform_client import FileNotFoundOnPlatformError
+from app.layer_3.plugins.shared.repository_snapshot import (
+    SnapshotError,
+    clone_snapshot,
+    download_archive_snapshot,
+    open_archive_snapshot,
+)
+from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
+
+FILES = {
+    "README.md": "# demo\n",
+    "LICENSE": "MIT License\n",
+    "docs/index.md": "docs\n",
+}
+
+
+def _write_tree(root):
+    for path, content in FILES.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+def _paths(snapshot):
+    return {(entry.path, entry.is_dir) for entry in snapshot.entries()}
+
+
+EXPECTED = {("README.md", False), ("LICENSE", False), ("docs", True), ("docs/index.md", False)}
+
+
+def test_tarball_snapshot_strips_top_level_directory(tmp_path):
+    _write_tree(tmp_path / "demo-main")
+    archive = tmp_path / "demo.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(tmp_path / "demo-main", arcname="demo-main")
+
+    snapshot = open_archive_snapshot(archive)
+    try:
+        assert _paths(snapshot) == EXPECTED
+        assert snapshot.read_bytes("docs/index.md") == b"docs\n"
+        assert snapshot.read_bytes("missing.txt") is None
+    finally:
+        snapshot.close()
+
+
+def test_zip_snapshot_reads_members_in_place(tmp_path):
+    archive = tmp_path / "demo.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for path, content in FILES.items():
+            zf.writestr(f"demo-main/{path}", content)
+
+    snapshot = open_archive_snapshot(archive)
+    try:
+        assert _paths(snapshot) == EXPECTED
+        assert snapshot.read_bytes("LICENSE") == b"MIT License\n"
+    finally:
+        snapshot.close()
+
+
+def _add_member(tar, name, content=b"", **fields):
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    for field, value in fields.items():
+        setattr(info, field, value)
+    tar.addfile(info, io.BytesIO(content))
+
+
+def test_tarball_without_data_filter_skips_links_and_rejects_escaping_paths(tmp_path, monkeypatch):
+    monkeypatch.delattr(tarfile, "data_filter", raising=False)
+    archive = tmp_path / "links.tar"
+    with tarfile.open(archive, "w") as tar:
+        _add_member(tar, "demo-main/README.md", b"# demo\n")
+        _add_member(tar, "demo-main/passwd", type=tarfile.SYMTYPE, linkname="/etc/passwd")
+        _add_member(tar, "demo-main/hard", type=tarfile.LNKTYPE, linkname="demo-main/README.md")
+
+    snapshot = open_archive_snapshot(archive)
+    try:
+        assert _paths(snapshot) == {("README.md", False)}
+    finally:
+        snapshot.close()
+
+    for name in ("../evil.txt", "/tmp/evil.txt", "demo-main/../../evil.txt"):
+        with tarfile.open(archive, "w") as tar:
+            _add_member(tar, name, b"evil")
+        with pytest.raises(SnapshotError):
+            open_archive_snapshot(archive)
+    assert not (tmp_path.parent / "evil.txt").exists()
+
+
+def test_archives_over_the_size_limit_are_refused(tmp_path, monkeypatch):
+    repository_snapshot.configure_repository_snapshots(None, max_archive_bytes=1024)
+    try:
+        large = b"x" * 2048
+        zip_archive = tmp_path / "large.zip"
+        with zipfile.ZipFile(zip_archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("demo-main/data.txt", large)
+        tar_archive = tmp_path / "large.tar.gz"
+        with tarfile.open(tar_archive, "w:gz") as tar:
+            _add_member(tar, "demo-main/data.txt", large)
+        # both compress far below the limit; the uncompressed member sizes count
+        assert zip_archive.stat().st_size < 1024 and tar_archive.stat().st_size < 1024
+        for archive in (zip_archive, tar_archive):
+            with pytest.raises(SnapshotError):
+                open_archive_snapshot(archive)
+
+        chunks = []
+
+        class _Response:
+            headers = {}
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def raise_for_status(self):
+                pass
+
+            def iter_content(self, chunk_size):
+                for _ in range(100):
+                    chunks.append(512)
+                    yield b"x" * 512
+
+        class _Session:
+            def get(self, url, **kwargs):
+                return _Response()
+
+        monkeypatch.setattr(repository_snapshot, "get_session", lambda url: _Session())
+        with pytest.raises(SnapshotError):
+            download_archive_snapshot("https://example.org/archive.zip")
+        assert len(chunks) == 3
+    finally:
+        repository_snapshot.configure_repository_snapshots(None)
+
+
+def _git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def bare_repository(tmp_path):
+    work = tmp_path / "work"
+    work.mkdir()
+    _write_tree(work)
+    _git("init", "--quiet", "--initial-branch=main", cwd=work)
+    _git("add", ".", cwd=work)
+    _git("-c", "user.name=t", "-c", "user.email=t@example.org", "commit", "--quiet", "-m", "init", cwd=work)
+    bare = tmp_path / "mirrors" / "o" / "r.git"
+    bare.parent.mkdir(parents=True)
+    _git("clone", "--quiet", "--bare", str(work), str(bare), cwd=tmp_path)
+    return bare
+
+
+def test_clone_snapshot_of_local_bare_repository(bare_repository):
+    snapshot = clone_snapshot(str(bare_repository))
+    try:
+        assert _paths(snapshot) == EXPECTED
+        assert snapshot.read_bytes(".git/config") is None
+    finally:
+        snapshot.close()
+
+
+def test_clone_snapshot_at_a_commit_sha_ignores_later_pushes(bare_repository):
+    head = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=bare_repository, check=True, capture_output=True, text=True
+    ).stdout.strip()
+    work = bare_repository.parent.parent.parent / "work"
+    (work / "NEWS.md").write_text("later\n")
+    _git("add", ".", cwd=work)
+    _git("-c", "user.name=t", "-c", "user.email=t@example.org", "commit", "--quiet", "-m", "later", cwd=work)
+    _git("push", "--quiet", str(bare_repository), "main", cwd=work)
+    latest = clone_snapshot(str(bare_repository))
+    try:
+        assert ("NEWS.md", False) in _paths(latest)
+    finally:
+        latest.close()
+
+    snapshot = clone_snapshot(str(bare_repository), ref=head)
+    try:
+        assert _paths(snapshot) == EXPECTED
+    finally:
+        snapshot.close()
+
+
+def test_archive_urls_are_pinned_to_the_given_revision():
+    sha = "a" * 40
+    context = ExtractionContext(repo_url="https://gitlab.com/g/p", domain="software", schema=None)
+    gitlab = GitLabClient(context, ExtractionState(metadata_collector=None))
+    github = GitHubClient(
+        ExtractionContext(repo_url="https://github.com/o/r", domain="software", schema=None),
+        ExtractionState(metadata_collector=None),
+    )
+
+    assert github.get_archive_url(sha) == f"https://github.com/o/r/archive/{sha}.zip"
+    assert gitlab.get_archive_url(sha) == f"https://gitlab.com/api/v4/projects/g%2Fp/repository/archive.zip?sha={sha}"
+
+
+class _OfflineGitHubClient(GitHubClient):
+    def get_repository(self):
+        return {"default_branch": "main", "html_url": "https://github.com/o/r"}
+
+    def _caching_get(self, url, params=None, fetch_function=None):
+        raise AssertionError(f"unexpected API call: {url}")
+
+
+def test_client_serves_tree_and_files_from_mirror_clone(bare_repository):
+    repository_snapshot.configure_repository_snapshots(
+        repository_snapshot.CLONE, mirror_dir=str(bare_repository.parent.parent)
+    )
+    try:
+        context = ExtractionContext(repo_url="https://github.com/o/r", domain="software", schema=None)
+        client = _OfflineGitHubClient(context, ExtractionState(metadata_collector=None))
+
+        assert [f.get_content() for f in client.get_readme_candidate_files()] == ["# demo\n"]
+        assert [f.path for f in client.get_license_candidate_files()] == ["LICENSE"]
+        assert client.get_file("docs/index.md").get_html_url(client) == "https://github.com/o/r/blob/main/docs/index.md"
+        with pytest.raises(FileNotFoundOnPlatformError):
+            client.get_file("missing.txt")
+
+        # the clone is removed when the extraction finishes
+        root = client.get_snapshot().root
+        assert root.is_dir()
+        client.state.close()
+        assert not root.exists()
+        assert client.get_snapshot() is None
+    finally:
+        repository_snapshot.configure_repository_snapshots(None)
@@ -0,0 +1,298 @@
+"""
+Tests for the bulk repository tree listing behind GitPlatformClient.list_contents.
+"""
+import base64
+import threading
+
+import requests
+
+from app.layer_1.metadata_collector.metadata_collector import MetadataCollector
+from app.layer_3.plugins.github.collection import GitHubSoftwareRequirementExtractor
+from app.layer_3.plugins.github.github_client import GitHubClient
+from app.layer_3.plugins.shared.git_platform_client import RepositoryFile
+from app.layer_3.plugins.gitlab.gitlab_client import GitLabClient
+from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
+
+
+def _response(payload, headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = requests.compat.json.dumps(payload).encode("utf-8")
+    response.headers.update(headers or {})
+    return response
+
+
+class _FakeGitHubClient(GitHubClient):
+    def __init__(self, context, state, routes):
+        super().__init__(context, state)
+        self.routes = routes
+        self.requested: list[str] = []
+
+    def _caching_get(self, url, params=None, fetch_function=None):
+        self.requested.append(url)
+        return _response(self.routes[url])
+
+
+class _FakeGitLabClient(GitLabClient):
+    def __init__(self, context, state, pages):
+        super().__init__(context, state)
+        self.pages = pages
+        self.requested: list[dict] = []
+
+    def get_default_branch(self):
+        return "main"
+
+    def get_head_commit_sha(self):
+        return None
+
+    def _caching_get(self, url, params=None, fetch_function=None):
+        self.requested.append(dict(params or {}))
+        page = params.get("page", 1)
+        next_page = str(page + 1) if page < len(self.pages) else ""
+        return _response(self.pages[page - 1], {"X-Next-Page": next_page})
+
+
+API = "https://api.github.com/repos/o/r"
+REPOSITORY = {"default_branch": "main", "html_url": "https://github.com/o/r"}
+TREE = {
+    "truncated": False,
+    "tree": [
+        {"path": "README.md", "type": "blob"},
+        {"path": "docs", "type": "tree"},
+        {"path": "docs/index.md", "type": "blob"},
+        {"path": "docs/api", "type": "tree"},
+        {"path": "docs/api/LICENSE", "type": "blob"},
+    ],
+}
+
+
+def _github(routes) -> _FakeGitHubClient:
+    context = ExtractionContext(repo_url="https://github.com/o/r", domain="software", schema=None)
+    return _FakeGitHubClient(context, ExtractionState(metadata_collector=None), routes)
+
+
+def test_github_tree_is_fetched_once_and_filtered_by_depth():
+    client = _github({API: REPOSITORY, f"{API}/git/trees/main": TREE})
+
+    assert [entry.path for entry in client.list_contents()] == ["README.md", "docs", "docs/index.md", "docs/api"]
+    assert [entry.path for entry in client.list_contents(depth=3)][-1] == "docs/api/LICENSE"
+    assert [entry.name for entry in client.list_contents("docs", depth=1)] == ["index.md", "api"]
+    assert client.requested.count(f"{API}/git/trees/main") == 1
+    assert not any("/contents" in url for url in client.requested)
+
+    docs = client.list_contents(depth=1)[1]
+    assert docs.get_html_url(client) == "https://github.com/o/r/tree/main/docs"
+    assert client.get_tree_entry("docs/api/LICENSE").path == "docs/api/LICENSE"
+    assert client.get_tree_entry("docs/missing.md") is None
+
+
+def test_truncated_github_tree_falls_back_to_directory_walk():
+    client = _github({
+        API: REPOSITORY,
+        f"{API}/git/trees/main": {"truncated": True, "tree": []},
+        f"{API}/contents/": [
+            {"name": "README.md", "path": "README.md", "type": "file"},
+            {"name": "docs", "path": "docs", "type": "dir"},
+        ],
+        f"{API}/contents/docs": [{"name": "index.md", "path": "docs/index.md", "type": "file"}],
+    })
+
+    assert [entry.path for entry in client.list_contents()] == ["README.md", "docs", "docs/index.md"]
+
+
+def test_gitlab_tree_follows_pagination():
+    context = ExtractionContext(repo_url="https://gitlab.com/g/p", domain="software", schema=None)
+    client = _FakeGitLabClient(
+        context,
+        ExtractionState(metadata_collector=None),
+        pages=[
+            [{"name": "src", "path": "src", "type": "tree"}],
+            [{"name": "setup.py", "path": "src/setup.py", "type": "blob"}],
+        ],
+    )
+
+    assert [entry.path for entry in client.list_contents()] == ["src", "src/setup.py"]
+    assert [params["page"] for params in client.requested] == [1, 2]
+
+
+def test_gitlab_graphql_endpoint_follows_the_api_base_url():
+    class _SelfHostedGitLabClient(_FakeGitLabClient):
+        def _get_api_base_url(self):
+            return "https://git.example.org/api/v4"
+
+    context = ExtractionContext(repo_url="https://gitlab.com/g/p", domain="software", schema=None)
+    client = _SelfHostedGitLabClient(context, ExtractionState(metadata_collector=None), [])
+    posted: list[str] = []
+
+    def fake_post(url, json_body, fetch_function=None):
+        posted.append(url)
+        return _response({"data": {"project": {"repository": {"blobs": {"nodes": []}}}}})
+
+    client._caching_post = fake_post
+    client._fetch_files(["README.md"])
+
+    assert posted == ["https://git.example.org/api/graphql"]
+
+
+def test_anonymous_github_batch_reads_raw_files_and_records_missing_ones():
+    client = _github({
+        API: REPOSITORY,
+        "https://raw.githubusercontent.com/o/r/main/README.md": "hello",
+    })
+
+    def fake_get(url, params=None, fetch_function=None):
+        client.requested.append(url)
+        if url not in client.routes:
+            error = requests.exceptions.HTTPError("404")
+            error.response = requests.Response()
+            error.response.status_code = 404
+            raise error
+        if url.startswith("https://raw.githubusercontent.com/"):
+            response = requests.Response()
+            response.status_code = 200
+            response._content = client.routes[url].encode("utf-8")
+            return response
+        return _response(client.routes[url])
+
+    client._caching_get = fake_get
+    files = client.get_multiple_files(["README.md", "LICENSE"])
+
+    assert [file.get_content() for file in files] == ["hello"]
+    assert files[0].get_html_url(client) == "https://github.com/o/r/blob/main/README.md"
+    assert not any("/contents/" in url for url in client.requested)
+
+
+def test_anonymous_github_batch_fetches_raw_files_concurrently():
+    client = _github({API: REPOSITORY})
+    both_in_flight = threading.Barrier(2, timeout=5)
+
+    def fake_get(url, params=None, fetch_function=None):
+        if not url.startswith("https://raw.githubusercontent.com/"):
+            return _response(client.routes[url])
+        both_in_flight.wait()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = url.rsplit("/", 1)[-1].encode("utf-8")
+        return response
+
+    client._caching_get = fake_get
+    files = client.get_multiple_files(["README.md", "LICENSE"])
+
+    assert [file.get_content() for file in files] == ["README.md", "LICENSE"]
+
+
+def test_authenticated_github_batch_uses_one_graphql_query():
+    context = ExtractionContext(repo_url="https://github.com/o/r", domain="software", schema=None, access_token="t")
+    sha = "b" * 40
+    client = _FakeGitHubClient(context, ExtractionState(metadata_collector=None), {API: REPOSITORY, f"{API}/commits": [{"sha": sha}]})
+    bodies: list[dict] = []
+
+    def fake_post(url, json_body, fetch_function=None):
+        bodies.append(json_body)
+        return _response({"data": {"repository": {
+            "f0": {"oid": "a1", "byteSize": 5, "isBinary": False, "isTruncated": False, "text": "hello"},
+            "f1": None,
+            "f2": {"oid": "b2", "byteSize": 2, "isBinary": False, "isTruncated": False, "text": "{}"},
+        }}})
+
+    client._caching_post = fake_post
+    files = client.get_multiple_files(["README.md", "LICENSE", "codemeta.json"])
+
+    assert [file.path for file in files] == ["README.md", "codemeta.json"]
+    assert len(bodies) == 1
+    assert f'"{sha}:codemeta.json"' in bodies[0]["query"]
+    assert not any("/contents/" in url for url in client.requested)
+
+
+def test_files_are_decoded_once_and_oversized_ones_are_not_downloaded(monkeypatch):
+    monkeypatch.setattr(RepositoryFile, "max_bytes", 100)
+    readme = "# r\n" * 10
+    client = _github({
+        API: REPOSITORY,
+        f"{API}/git/trees/main": {
+            "truncated": False,
+            "tree": [
+                {"path": "README.md", "type": "blob", "size": len(readme)},
+                {"path": "LICENSES.txt", "type": "blob", "size": 5_000_000},
+            ],
+        },
+        f"{API}/contents/README.md": {
+            "name": "README.md",
+            "path": "README.md",
+            "type": "file",
+            "size": len(readme),
+            "encoding": "base64",
+            "content": base64.b64encode(readme.encode("utf-8")).decode("ascii"),
+        },
+    })
+    client.list_contents()
+
+    file = client.get_file("README.md")
+    assert file.get_content() == readme
+    assert file.get_content() is file.get_content()
+    assert file.get_bytes() == readme.encode("utf-8")
+
+    bundle = client.get_file("LICENSES.txt")
+    assert bundle.is_oversized()
+    assert bundle.get_content() is None and bundle.get_bytes() is None
+    assert f"{API}/contents/LICENSES.txt" not in client.requested
+
+    # a size only known from the payload still caps decoding
+    unreported = type(file)({"path": "big.md", "type": "file", "content": "x" * 101})
+    assert unreported.get_content() is None
+
+
+def test_large_files_are_served_without_a_configured_limit():
+    assert RepositoryFile.max_bytes is None
+    large = "x" * 5_000_000
+    client = _github({
+        API: REPOSITORY,
+        f"{API}/git/trees/main": {
+            "truncated": False,
+            "tree": [{"path": "LICENSE", "type": "blob", "size": len(large)}],
+        },
+        f"{API}/contents/LICENSE": {
+            "name": "LICENSE",
+            "path": "LICENSE",
+            "type": "file",
+            "size": len(large),
+            "content": large,
+        },
+    })
+    client.list_contents()
+
+    file = client.get_file("LICENSE")
+    assert not file.is_oversized()
+    assert file.get_content() == large
+
+
+def test_tree_and_files_are_read_at_the_head_commit():
+    sha = "a" * 40
+    client = _github({
+        API: REPOSITORY,
+        f"{API}/commits": [{"sha": sha}],
+        f"{API}/git/trees/{sha}": TREE,
+        f"https://raw.githubusercontent.com/o/r/{sha}/README.md": "hello",
+        f"https://raw.githubusercontent.com/o/r/{sha}/docs/index.md": "docs",
+    })
+
+    assert [entry.path for entry in client.list_contents(depth=1)] == ["README.md", "docs"]
+    client.prefetch_files(["README.md", "docs/index.md"])
+    assert f"https://raw.githubusercontent.com/o/r/{sha}/README.md" in client.requested
+    assert f"{API}/git/trees/main" not in client.requested
+    # the page links still point at the branch
+    assert client.list_contents(depth=1)[1].get_html_url(client) == "https://github.com/o/r/tree/main/docs"
+
+
+def test_requirement_links_come_from_the_tree_without_reading_the_files():
+    tree = {"truncated": False, "tree": [{"path": "README.md", "type": "blob"}, {"path": "poetry.lock", "type": "blob"}]}
+    client = _github({API: REPOSITORY, f"{API}/git/trees/main": tree})
+    state = ExtractionState(metadata_collector=MetadataCollector())
+    step = GitHubSoftwareRequirementExtractor()
+    step.get_client = lambda context, state: client
+
+    step.extract(client.context, state)
+
+    found = state.metadata_collector.get_most_confident("https://schema.org/softwareRequirements").property_value
+    assert found == ["https://github.com/o/r/blob/main/poetry.lock"]
+    assert not any("/contents" in url or "raw.githubusercontent.com" in url for url in client.requested)
@@ -0,0 +1,115 @@
+"""
+Tests for the commit-keyed whole-extraction result cache.
+"""
+from app.layer_1.metadata_collector.metadata_collector import MetadataCollector, MetadataProperty
+from app.layer_2.use_cases.extract_metadata import ExtractMetadataUseCase
+from app.layer_3.plugins.shared.result_cache import (
+    SqliteResultCache,
+    canonical_repo_url,
+    dump_collected,
+    load_collected,
+)
+from app.layer_3.steps.contracts import ExtractionPipeline
+
+
+class StubSchema:
+    def __init__(self, name: str = "maSMP"):
+        self.name = name
+
+    def get_schema_name(self) -> str:
+        return self.name
+
+    def get_class_name(self) -> str:
+        return "SoftwareSourceCode"
+
+
+class StubComposer:
+    def compose(self, context) -> ExtractionPipeline:
+        return ExtractionPipeline(steps=())
+
+
+class CountingRunner:
+    def __init__(self):
+        self.runs = 0
+
+    def run(self, pipeline, context, state):
+        self.runs += 1
+        state.metadata_collector.collect("github.api", "schema:name", f"run-{self.runs}", 0.9)
+        return state
+
+
+class StubBuilder:
+    def build_jsonld(self, metadata, schema) -> dict:
+        return {"name": metadata.get_most_confident("schema:name").property_value}
+
+
+def _extract(cache, runner, repo_url="https://github.com/Org/Repo", schema=None):
+    collector = MetadataCollector()
+    use_case = ExtractMetadataUseCase(
+        jsonld_builder=StubBuilder(),
+        pipeline_composer=StubComposer(),
+        pipeline_runner=runner,
+        extraction_metadata_collector=collector,
+        result_cache=cache,
+    )
+    result = use_case.execute(repo_url=repo_url, schema=schema or StubSchema())
+    return result.jsonld_document, collector
+
+
+def test_repeat_extraction_of_same_commit_is_served_from_cache(tmp_path):
+    head = {"sha": "aaa"}
+    cache = SqliteResultCache(
+        tmp_path / "results.sqlite",
+        plugin_set_version=lambda: "plugins-v1",
+        revision_resolver=lambda context, state: head["sha"],
+    )
+    runner = CountingRunner()
+
+    first, _ = _extract(cache, runner)
+    second, collector = _extract(cache, runner, repo_url="https://github.com/org/repo.git/")
+
+    assert first == second == {"name": "run-1"}
+    assert runner.runs == 1
+    record = collector.get_most_confident("schema:name")
+    assert (record.source, record.confidence) == ("github.api", 0.9)
+
+    head["sha"] = "bbb"
+    assert _extract(cache, runner)[0] == {"name": "run-2"}
+    assert _extract(cache, runner, schema=StubSchema("CODEMETA"))[0] == {"name": "run-3"}
+    assert runner.runs == 3
+
+
+def test_plugin_set_change_or_unknown_head_bypasses_cache(tmp_path):
+    version = {"plugins": "v1"}
+    head = {"sha": "aaa"}
+    cache = SqliteResultCache(
+        tmp_path / "results.sqlite",
+        plugin_set_version=lambda: version["plugins"],
+        revision_resolver=lambda context, state: head["sha"],
+    )
+    runner = CountingRunner()
+
+    _extract(cache, runner)
+    version["plugins"] = "v2"
+    _extract(cache, runner)
+    head["sha"] = None
+    _extract(cache, runner)
+    _extract(cache, runner)
+
+    assert runner.runs == 4
+
+
+def test_collected_metadata_is_stored_as_json():
+    collector = MetadataCollector()
+    collector.add(MetadataProperty("CFF File", "schema:author", [{"@type": "Person", "givenName": "Ada"}], 0.85, "cff.author"))
+    collector.add(MetadataProperty("github.api", "schema:name", "repo", 0.9))
+
+    text = dump_collected(collector.data)
+
+    assert text.startswith("[{")
+    assert load_collected(text) == [record for records in collector.data.values() for record in records]
+
+
+def test_canonical_repo_url():
+    assert canonical_repo_url("https://www.GitHub.com/Org/Repo.git/") == "github.com/org/repo"
+    assert canonical_repo_url("http://gitlab.com/group/sub/project") == "gitlab.com/group/sub/project"
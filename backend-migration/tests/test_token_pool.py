@@ -0,0 +1,121 @@
+"""
+Tests for the shared access-token pools used by the platform clients.
+"""
+import time
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from app.layer_3.plugins.github.github_client import GitHubClient
+from app.layer_3.plugins.gitlab.gitlab_client import GitLabClient
+from app.layer_3.plugins.platform_clients import rate_limit_wait
+from app.layer_3.plugins.shared.caching_http_client import RateLimitError
+from app.layer_3.plugins.shared.rate_limiter import configure_rate_limiter, get_rate_limiter
+from app.layer_3.plugins.shared.token_pool import TokenPool, configure_token_pools
+from app.layer_3.steps.contracts import ExtractionContext, ExtractionState
+
+API = "https://api.github.com/repos/o/r"
+
+
+def _headers(token: str) -> dict:
+    return {"Authorization": f"token {token}"}
+
+
+def _budget(token: str, remaining: int, reset_in: int = 3600) -> None:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time()) + reset_in),
+    })
+    get_rate_limiter().update(API, _headers(token), response)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    configure_rate_limiter(pace_below=0.2, max_wait=900)
+    yield
+    configure_token_pools({})
+    configure_rate_limiter(pace_below=0.2, max_wait=900)
+
+
+def _client(cls, repo_url: str, access_token: str | None = None):
+    context = ExtractionContext(repo_url=repo_url, domain="software", schema=None, access_token=access_token)
+    return cls(context, ExtractionState(metadata_collector=None))
+
+
+def test_pool_ranks_tokens_by_remaining_budget():
+    pool = TokenPool("github", ["a", "b", "c", "a", ""])
+    _budget("a", 10)
+    _budget("b", 4000)
+    _budget("c", 0)
+
+    assert pool.tokens == ["a", "b", "c"]
+    assert pool.rank(API, _headers) == ["b", "a", "c"]
+
+
+def test_client_rotates_to_next_token_when_rate_limited():
+    configure_token_pools({"github": ["a", "b"]})
+    _budget("a", 4000)
+    _budget("b", 3000)
+    client = _client(GitHubClient, "https://github.com/o/r")
+    sent = []
+
+    def fake_fetch(url, headers=None, max_wait=None, **kwargs):
+        sent.append((headers["Authorization"], max_wait))
+        if headers["Authorization"] == "token a":
+            raise RateLimitError("exhausted", 600)
+        return "ok"
+
+    assert client._fetch(fake_fetch, API) == "ok"
+    assert sent == [("token a", 0), ("token b", None)]
+    assert client._cache_scope() == "pool:github"
+    assert client.has_credentials
+
+
+def test_client_waits_for_the_pool_token_that_resets_first():
+    configure_token_pools({"github": ["a", "b", "c"]})
+    _budget("a", 4000)
+    _budget("b", 0, reset_in=60)
+    _budget("c", 0)
+    client = _client(GitHubClient, "https://github.com/o/r")
+    sent = []
+
+    def fake_fetch(url, headers=None, max_wait=None, **kwargs):
+        sent.append((headers["Authorization"], max_wait))
+        if headers["Authorization"] == "token a":
+            raise RateLimitError("exhausted", 600)
+        return "ok"
+
+    # b and c are exhausted: b resets first, so it is the one to wait for, not the last ranked
+    assert client._fetch(fake_fetch, API) == "ok"
+    assert sent == [("token a", 0), ("token b", None)]
+
+
+def test_rate_limit_wait_looks_at_the_credentials_the_extraction_would_use():
+    configure_token_pools({"github": ["a", "b"]})
+    _budget("a", 0)
+    _budget("b", 4000)
+
+    # the host as a whole has an exhausted budget, but the pool still has a usable token
+    assert get_rate_limiter().wait_seconds("github.com") > 3000
+    assert rate_limit_wait("https://github.com/o/r") == 0
+    # a user's own token never falls back to the pool
+    assert rate_limit_wait("https://github.com/o/r", access_token="a") > 3000
+
+    _budget("b", 0)
+    assert rate_limit_wait("https://github.com/o/r") > 3000
+    assert rate_limit_wait("https://gitlab.com/g/p") == 0
+
+
+def test_user_token_is_kept_out_of_the_pool():
+    configure_token_pools({"github": ["a"], "gitlab": ["g"]})
+    client = _client(GitHubClient, "https://github.com/o/r", access_token="mine")
+
+    assert client.token_pool is None
+    assert client._cache_scope() not in ("anonymous", "pool:github")
+
+    gitlab = _client(GitLabClient, "https://gitlab.com/g/p")
+    assert gitlab._pooled_headers("g")["Authorization"] == "Bearer g"